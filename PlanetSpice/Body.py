@@ -0,0 +1,876 @@
+import numpy as np
+import spiceypy as sp
+import os
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from .utc2et import utc2et
+from .et2dateut import et2dateut
+from .DayStartET import GetET
+from . import Globals
+from . import KernelManager as KM
+from .Sun.IAU_SUN import J2000toIAU_SUN,CarringtonLon,HCItoJ2000Matrix,IAU_SUNMatrices
+from .Sun.Transform import RotationMatrices
+from .SPK import SPKPos
+from .ResultCache import CachedPos
+from .Tools.RotateVectors import RotateVectors
+from .Tools.ListDates import ListDates
+from .Tools.ContUT import ContUT
+from .Tools.FindCrossings import FindCrossings
+from .Tools.Archive import Archive
+from .Tools.MapRecarray import MapRecarray,Decimate
+from .Tools.Manifest import Manifest,KernelKey,Pending,Complete
+
+#PyFileIO and RecarrayTools (which import scipy) are imported by the
+#functions which use them, to keep importing this module quick
+
+#kernels shared by all of the bodies
+lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
+spk_kernel = Globals.SpicePath + '/bodies/de432s.bsp'
+pck_kernel = Globals.SpicePath + '/bodies/pck00010.tpc'
+hci_kernel = Globals.SpicePath + '/frames/tk/sunframes.tk'
+
+#a common dtype used for storing position
+dtype = [	('Date','int32'),
+			('ut','float32'),
+			('utc','float64'),
+			('xHCI','float64'),
+			('yHCI','float64'),
+			('zHCI','float64'),
+			('xIAU_SUN','float64'),
+			('yIAU_SUN','float64'),
+			('zIAU_SUN','float64'),
+			('Rsun','float64'),
+			('LatHCI','float32'),
+			('LonHCI','float32'),
+			('LatIAU_SUN','float32'),
+			('LonIAU_SUN','float32')]
+
+#carrington rot dtype
+dtypecarr = [	('Date','int32'),
+				('ut','float32'),
+				('utc','float64')]
+
+AU = 1.496e8
+
+#names of the SPICE frames used for each coordinate system
+Frames = {	'HCI' : 'HCI',
+			'HAE' : 'ECLIPDATE',
+			'J2000' : 'J2000'}
+
+
+def SunSpeed(Target,et):
+	'''
+	Speed (km/s) of a target relative to the Sun, from the velocity part
+	of its state vector. The kernels should already be loaded.
+
+	Inputs
+	======
+	Target : str
+		Name of the target.
+	et : float64
+		Ephemeris time(s).
+
+	Returns
+	=======
+	v : float64
+		Speed (km/s).
+
+	'''
+	st,lt = sp.spkezr(Target,np.array(et,dtype='float64').flatten(),'J2000','NONE','SUN')
+	st = np.array(st).reshape((-1,6))
+	return np.sqrt(np.sum(st[:,3:]**2,axis=1))
+
+def Aberration(V,Vsw=400.0):
+	'''
+	Aberration angle (degrees) of the solar wind as seen by a body
+	moving at speed V.
+
+	Inputs
+	======
+	V : float
+		Speed(s) of the body (km/s), shape (n,).
+	Vsw : float
+		Solar wind speed(s) (km/s), either a scalar, or an array whose
+		first dimension matches V (e.g. a time series, or (n,m) for m
+		different speeds at each time).
+
+	Returns
+	=======
+	angle : float64
+		Aberration angle(s) in degrees, with the broadcast shape of V
+		and Vsw.
+
+	'''
+	V = np.array(V,dtype='float64')
+	Vsw = np.array(Vsw,dtype='float64')
+	if Vsw.ndim > 1:
+		V = V.reshape(V.shape + (1,)*(Vsw.ndim - V.ndim))
+	return np.arctan2(V,Vsw)*180.0/np.pi
+
+
+class Body(object):
+	'''
+	Positions of a solar system body relative to the Sun, along with
+	the routines which save and read them. Each planet module (e.g.
+	Mercury/Pos.py) is a thin wrapper around one of these, so any new
+	body can be added using RegisterBody.
+
+	'''
+	def __init__(self,Name,NAIF=None,SPK=None,Kernels=None):
+		'''
+		Inputs
+		======
+		Name : str
+			Name of the body, which is also used to name the output
+			directory, e.g. 'Mercury'.
+		NAIF : str
+			Name or ID code used by SPICE for the body, defaults to
+			Name in upper case.
+		SPK : str
+			The SPK file containing the body, defaults to de432s.bsp.
+		Kernels : list
+			All of the kernels needed, defaults to the LSK, the SPK,
+			the PCK and the HCI frame kernel.
+
+		'''
+		self.Name = Name
+		self.NAIF = Name.upper() if NAIF is None else str(NAIF)
+		self.SPK = spk_kernel if SPK is None else SPK
+		if Kernels is None:
+			Kernels = [lsk_path,self.SPK,pck_kernel,hci_kernel]
+		self.Kernels = Kernels
+
+	def _Use(self):
+		return KM.Use(self.Kernels)
+
+	def _OutPath(self):
+		return Globals.OutputPath + self.Name + '/'
+
+	def _PosET(self,et,Frame='HCI',Native=False):
+		'''
+		Positions (km) relative to the Sun at an array of ephemeris
+		times, with the kernels already loaded.
+
+		Returns
+		=======
+		pos : float64
+			Positions, shape (3,n).
+
+		'''
+		if Frame == 'IAU_SUN':
+			#get the J2000 positions and rotate them into IAU_SUN
+			pos,lt = sp.spkpos(self.NAIF,et,'J2000','NONE','SUN')
+			pos = np.array(pos)
+			return np.array(J2000toIAU_SUN(et,pos.T[0],pos.T[1],pos.T[2],pck_kernel))
+		if Native and Frame in ['HCI','J2000']:
+			#evaluate the SPK directly and rotate from J2000 if needed
+			pos = SPKPos(self.NAIF,et,'SUN',self.SPK)
+			if Frame == 'J2000':
+				return pos.T.copy()
+			return np.array(RotateVectors(HCItoJ2000Matrix().T,pos.T[0],pos.T[1],pos.T[2]))
+		pos,lt = sp.spkpos(self.NAIF,et,Frames.get(Frame,Frame),'NONE','SUN')
+		return np.array(pos).T.copy()
+
+	def PosET(self,et,Frame='HCI',Native=False):
+		'''
+		Position relative to the Sun at a set of ephemeris times.
+
+		Inputs
+		======
+		et : float64
+			Ephemeris time(s).
+		Frame : str
+			'HCI', 'HAE', 'IAU_SUN', 'J2000' or the name of any SPICE
+			frame.
+		Native : bool
+			If True, use the NumPy SPK reader for 'HCI' and 'J2000'.
+
+		Returns
+		=======
+		x : float64
+		y : float64
+		z : float64
+			Position (km).
+
+		'''
+		et = np.array(et,dtype='float64').flatten()
+		with self._Use():
+			pos = self._PosET(et,Frame,Native)
+		return (pos[0],pos[1],pos[2])
+
+	def Pos(self,Date,ut=None,Frame='HCI',Native=False,Format=None):
+		'''
+		Position relative to the Sun at a set of dates and times.
+
+		Inputs
+		======
+		Date : int
+			Date(s) in format yyyymmdd, or times in any of the other
+			forms accepted by GetET (see DayStartET.py), e.g.
+			numpy.datetime64, or ephemeris times with Format='et'.
+		ut : float
+			Time(s) in hours from the start of the day.
+		Frame : str
+			'HCI', 'HAE', 'IAU_SUN', 'J2000' or the name of any SPICE
+			frame.
+		Native : bool
+			If True, use the NumPy SPK reader for 'HCI' and 'J2000'.
+		Format : str
+			Form of the times in Date if they are not dates in format
+			yyyymmdd, e.g. 'et' or 'unix' (see GetET).
+
+		Returns
+		=======
+		x : float64
+		y : float64
+		z : float64
+			Position (km).
+
+		'''
+		return self.PosET(GetET(Date,ut,Format),Frame,Native)
+
+	def PosHCI(self,Date,ut=None,Native=False,Cache=False,Format=None):
+		'''
+		HCI position at set times. If Native=True then the positions are
+		evaluated directly from the SPK file using NumPy (see SPK.py)
+		instead of using spkpos. If Cache=True then the result is stored
+		on disk and reused by later calls with the same times and kernels
+		(see ResultCache.py).
+
+		'''
+		if Cache:
+			return CachedPos(self.PosHCI,Date,ut,self.NAIF,'HCI',self.Kernels,Native=Native,Format=Format)
+		return self.Pos(Date,ut,'HCI',Native,Format)
+
+	def PosHAE(self,Date,ut=None,Format=None):
+		'''
+		HAE position at set times
+
+		'''
+		return self.Pos(Date,ut,'HAE',Format=Format)
+
+	def PosIAU_SUN(self,Date,ut=None,Cache=False,Format=None):
+		'''
+		Position in IAU_SUN coordinates, where Z is along the Sun's
+		rotational axis, X and Y rotate with the Sun. If Cache=True
+		then the result is stored on disk and reused by later calls with
+		the same times and kernels (see ResultCache.py).
+
+		'''
+		if Cache:
+			return CachedPos(self.PosIAU_SUN,Date,ut,self.NAIF,'IAU_SUN',self.Kernels,Format=Format)
+		return self.Pos(Date,ut,'IAU_SUN',Format=Format)
+
+	def Speed(self,Date,ut=None,Format=None):
+		'''
+		Orbital speed (km/s) relative to the Sun.
+
+		Inputs
+		======
+		Date : int
+			Date(s) in format yyyymmdd, or times in any of the other
+			forms accepted by GetET.
+		ut : float
+			Time(s) in hours from the start of the day, defaults to
+			12.0 when Date is in yyyymmdd format.
+		Format : str
+			Form of the times in Date if they are not dates in format
+			yyyymmdd, e.g. 'et' or 'unix' (see GetET).
+
+		Returns
+		=======
+		v : float64
+			Speed (km/s).
+
+		'''
+		et = GetET(Date,ut,Format,DefaultUT=12.0)
+		with self._Use():
+			v = SunSpeed(self.NAIF,et)
+		return v
+
+	def SaveSpeed(self,Date0=19500101,Date1=20500101):
+		'''
+		Save the orbital speed at 12:00 on every date between Date0 and
+		Date1.
+
+		'''
+		Dates = ListDates(Date0,Date1)
+		s = self.Speed(Dates)
+
+		sdtype = [('Date','int32'),('utc','float64'),('v','float32')]
+		data = np.recarray(Dates.size,dtype=sdtype)
+		data.Date = Dates
+		data.utc = ContUT(data.Date,np.zeros(data.size))
+		data.v = s
+
+		outpath = self._OutPath()
+		if not os.path.isdir(outpath):
+			os.system('mkdir -pv '+outpath)
+		fname = outpath + self.Name + 'Speed.dat'
+		import PyFileIO as pf
+		pf.WriteASCIIData(fname,data)
+
+	def AberrationAngle(self,Date,Vsw=400.0,*,ut=None,Format=None):
+		'''
+		Aberration angle (degrees) of the solar wind due to the orbital
+		motion.
+
+		Inputs
+		======
+		Date : int
+			Date(s) in format yyyymmdd, or times in any of the other
+			forms accepted by GetET.
+		Vsw : float
+			Solar wind speed(s) (km/s), either a scalar or an array
+			which broadcasts against the dates (see Aberration).
+		ut : float
+			Time(s) in hours from the start of the day (keyword only),
+			defaults to 12.0 when Date is in yyyymmdd format.
+		Format : str
+			Form of the times in Date if they are not dates in format
+			yyyymmdd, e.g. 'et' or 'unix' (see GetET).
+
+		Returns
+		=======
+		angle : float64
+			Aberration angle(s) in degrees.
+
+		'''
+		return Aberration(self.Speed(Date,ut,Format),Vsw)
+
+	def _CarringtonLon(self,et):
+		'''
+		Carrington longitude (radians) at an array of ephemeris times, the
+		kernels should already be loaded.
+
+		'''
+		pos,lt = sp.spkpos(self.NAIF,et,'J2000','NONE','SUN')
+		pos = np.array(pos)
+		return CarringtonLon(et,pos.T[0],pos.T[1],pos.T[2],pck_kernel)
+
+	def CarringtonLongitude(self,Date,ut=None,Format=None):
+		'''
+		Carrington longitude (radians) at set times.
+
+		'''
+		et = GetET(Date,ut,Format)
+		with self._Use():
+			lon = self._CarringtonLon(et)
+		return lon
+
+	def SaveCarringtonRotations(self,Date0=19500101,Date1=20500101):
+		'''
+		Create a list of times when the body is at a solar longitude of
+		0, defining the start of a Carrington rotation.
+
+		'''
+		#name the file to save the data in
+		outpath = self._OutPath()
+		if not os.path.isdir(outpath):
+			os.system('mkdir -pv '+outpath)
+		outfile = outpath + '0long.dat'
+
+		#list the dates between date0 and date1
+		dates = ListDates(Date0,Date1)
+		nd = dates.size
+		nt = nd*24
+
+		#find the times when the longitude goes from +ve to -ve, sampling
+		#every hour
+		et0 = utc2et(dates[0],0.0)
+		with self._Use():
+			ets = FindCrossings(self._CarringtonLon,et0,et0 + (nt-1)*3600.0,3600.0,Direction=-1,Wrap=2*np.pi)
+
+		#convert to dates and times and store them in a file
+		date,ut,utc = et2dateut(ets)
+		np.savetxt(outfile,np.array([date,ut,utc]).T,fmt=['%08d','%f','%f'])
+
+	def ReadCarringtonRotations(self):
+		'''
+		Read the list of Carrington rotations.
+
+		'''
+		fname = self._OutPath() + '0long.dat'
+		import PyFileIO as pf
+		return pf.ReadASCIIData(fname,Header=False,dtype=dtypecarr)
+
+	def PosRecarray(self,Date,ut):
+		'''
+		Calculate the HCI and IAU_SUN positions and store them in a
+		recarray using dtype.
+
+		'''
+		et = GetET(Date,ut)
+		Date,ut = np.broadcast_arrays(np.array(Date).flatten(),np.array(ut).flatten())
+
+		#calculate the postions
+		with self._Use():
+			x,y,z = self._PosET(et,'HCI')
+			x2,y2,z2 = self._PosET(et,'IAU_SUN')
+
+		#create the output array
+		data = np.recarray(et.size,dtype=dtype)
+
+		#fill it
+		data.Date = Date
+		data.ut = ut
+		data.utc = ContUT(data.Date,data.ut)
+
+		data.xHCI = x/AU
+		data.yHCI = y/AU
+		data.zHCI = z/AU
+		data.xIAU_SUN = x2/AU
+		data.yIAU_SUN = y2/AU
+		data.zIAU_SUN = z2/AU
+
+		#calculate some things
+		data.Rsun = np.sqrt(x**2 + y**2 + z**2)/AU
+		xyHCI = np.sqrt(data.xHCI**2 + data.yHCI**2)
+		xyIAU_SUN = np.sqrt(data.xIAU_SUN**2 + data.yIAU_SUN**2)
+		data.LatHCI = np.arctan2(data.zHCI,xyHCI)*180.0/np.pi
+		data.LonHCI = np.arctan2(data.yHCI,data.xHCI)*180.0/np.pi
+		data.LatIAU_SUN = np.arctan2(data.zIAU_SUN,xyIAU_SUN)*180.0/np.pi
+		data.LonIAU_SUN = np.arctan2(data.yIAU_SUN,data.xIAU_SUN)*180.0/np.pi
+
+		return data
+
+	def _Archive(self):
+		'''
+		The archive containing the saved positions (see Tools/Archive.py).
+
+		'''
+		return Archive(self._OutPath() + self.Name + 'Pos',dtype,24)
+
+	def _SaveDates(self,Dates):
+		'''
+		Calculate the positions for a list of dates and store them in the
+		archive.
+
+		'''
+		ut = np.arange(24.0)
+		data = self.PosRecarray(np.repeat(Dates,24),np.tile(ut,Dates.size))
+		self._Archive().Write(data)
+
+	def SavePos(self,Date0=19500101,Date1=20500101,Workers=1,ChunkDays=100,
+				Force=False):
+		'''
+		Save the position for every date between date0 and date1 in a
+		columnar archive, with one file per field per year in
+		<Name>/<Name>Pos/yyyy/ (see Tools/Archive.py).
+
+		The dates which have been saved are recorded in
+		<Name>/<Name>Pos/manifest.npz along with a hash of the kernels
+		used, so only dates which are missing, were interrupted or were
+		saved with different kernels are calculated (see
+		Tools/Manifest.py).
+
+		Inputs
+		======
+		Date0 : int
+			Start date, format yyyymmdd.
+		Date1 : int
+			End date, format yyyymmdd.
+		Workers : int
+			Number of processes to use. The dates are split into chunks
+			which are shared between the processes, each of which loads
+			the kernels once. The files produced are identical whatever
+			the number of workers.
+		ChunkDays : int
+			Number of dates in each chunk.
+		Force : bool
+			If True, save every date even if it is already up to date.
+
+		'''
+		archive = self._Archive()
+		manifest = Manifest(archive.Path + '/manifest.npz')
+		key = KernelKey(KM.KernelList([self.Kernels]))
+
+		Dates = ListDates(Date0,Date1)
+		if not Force:
+			Dates = manifest.Todo(Dates,key)
+		if Dates.size == 0:
+			print('All dates are up to date')
+			return
+		chunks = [Dates[i:i+ChunkDays] for i in range(0,Dates.size,ChunkDays)]
+
+		#create the yearly files before any workers write to them
+		archive.Create(Dates//10000)
+		manifest.Mark(Dates,key,Pending)
+
+		if Workers > 1:
+			with ProcessPoolExecutor(Workers,initializer=_InitWorker,initargs=(self.Kernels,)) as ex:
+				for c,_ in zip(chunks,ex.map(_SaveChunk,[self]*len(chunks),chunks)):
+					manifest.Mark(c,key,Complete)
+					print('Saved dates {:08d} to {:08d}'.format(c[0],c[-1]))
+		else:
+			KM.Pin(self.Kernels)
+			try:
+				for c in chunks:
+					self._SaveDates(c)
+					manifest.Mark(c,key,Complete)
+					print('Saved dates {:08d} to {:08d}'.format(c[0],c[-1]))
+			finally:
+				KM.Unpin(self.Kernels)
+
+	def _LegacyDates(self,Date0=None,Date1=None):
+		'''
+		Dates of the per-day position files (<Name>Pos/yyyymmdd.bin)
+		written by older versions of SavePos, which are not in the
+		archive.
+
+		'''
+		archive = self._Archive()
+		if not os.path.isdir(archive.Path):
+			return np.zeros(0,dtype='int32')
+		Dates = np.array([f[:8] for f in os.listdir(archive.Path) if len(f) == 12 and f.endswith('.bin') and f[:8].isdigit()],dtype='int32')
+		if not Date0 is None:
+			Dates = Dates[(Dates >= Date0) & (Dates <= Date1)]
+		if Dates.size == 0:
+			return Dates
+		return np.sort(np.setdiff1d(Dates,archive.Dates()))
+
+	def _ReadLegacy(self,Date,Fields=None):
+		'''
+		Read one of the per-day position files written by older
+		versions of SavePos.
+
+		'''
+		m = MapRecarray(self._Archive().Path + '/{:08d}.bin'.format(Date),dtype)
+		return m.Slice(0,m.size,Fields)
+
+	def MigratePos(self,Remove=False):
+		'''
+		Copy the per-day position files (<Name>Pos/yyyymmdd.bin) written
+		by older versions of SavePos into the archive, and mark those
+		dates as saved with the current kernels in the manifest. Dates
+		which are already in the archive are not copied.
+
+		Inputs
+		======
+		Remove : bool
+			If True, delete the per-day files afterwards (including any
+			for dates which were already in the archive).
+
+		'''
+		archive = self._Archive()
+		manifest = Manifest(archive.Path + '/manifest.npz')
+		key = KernelKey(KM.KernelList([self.Kernels]))
+
+		Dates = self._LegacyDates()
+		for i in range(0,Dates.size,100):
+			d = Dates[i:i+100]
+			archive.Write(np.concatenate([self._ReadLegacy(x) for x in d]).view(np.recarray))
+			manifest.Mark(d,key,Complete)
+			print('Copied dates {:08d} to {:08d}'.format(d[0],d[-1]))
+
+		if Remove and os.path.isdir(archive.Path):
+			for f in os.listdir(archive.Path):
+				if len(f) == 12 and f.endswith('.bin') and f[:8].isdigit():
+					os.remove(archive.Path + '/' + f)
+
+	def ReadPosDate(self,Date):
+		'''
+		Read the positions saved for a single date.
+
+		'''
+		return self.ReadPos(Date,Date)
+
+	def ReadPos(self,Date0,Date1,Fields=None):
+		'''
+		Read the positions saved for a range of dates. Any dates which
+		are not in the archive are read from the per-day files written
+		by older versions of SavePos, if they exist (see MigratePos).
+
+		Inputs
+		======
+		Date0 : int
+			Start date, format yyyymmdd.
+		Date1 : int
+			End date (inclusive), format yyyymmdd.
+		Fields : list
+			Names of the fields to read, defaults to all of them.
+
+		Returns
+		=======
+		data : numpy.recarray
+			Positions (see dtype).
+
+		'''
+		archive = self._Archive()
+		legacy = self._LegacyDates(Date0,Date1)
+		if legacy.size == 0:
+			return archive.Read(Date0,Date1,Fields)
+
+		#merge the old files in date order
+		data = [archive.Read(Date0,Date1,Fields)]
+		Dates = [archive.Read(Date0,Date1,['Date']).Date]
+		for d in legacy:
+			data.append(self._ReadLegacy(d,Fields))
+			Dates.append(np.zeros(data[-1].size,dtype='int32') + d)
+		srt = np.argsort(np.concatenate(Dates),kind='stable')
+		return np.concatenate(data)[srt].view(np.recarray)
+
+	def CombinePos(self,Date0=19500101,Date1=20500101):
+		'''
+		Combine the archived positions into a single file.
+
+		'''
+		data = self.ReadPos(Date0,Date1)
+		import RecarrayTools as RT
+		RT.SaveRecarray(data,self._CombinedName(False))
+
+	def _CombinedName(self,Small):
+		'''
+		Name of the combined position file, Small is either a bool (True
+		for one position per day) or the time step in hours of a reduced
+		resolution file.
+
+		'''
+		if isinstance(Small,(bool,np.bool_)):
+			Small = 24.0 if Small else 1.0
+		if Small == 1.0:
+			return self._OutPath() + self.Name + 'Pos.bin'
+		if Small == 24.0:
+			return self._OutPath() + self.Name + 'PosSmall.bin'
+		return self._OutPath() + self.Name + 'Pos{:g}h.bin'.format(Small)
+
+	def MapCombinedPos(self,Small=True):
+		'''
+		Memory-map the combined position file (see Tools/MapRecarray.py).
+
+		'''
+		return MapRecarray(self._CombinedName(Small),dtype)
+
+	def ReadCombinedPos(self,Small=True,Date0=None,Date1=None,Fields=None,
+						Copy=True):
+		'''
+		Read the combined position file, or part of it. The file is
+		memory-mapped, the rows between Date0 and Date1 are found using a
+		binary search of the utc field and only the fields requested are
+		read.
+
+		Inputs
+		======
+		Small : bool or float
+			If True, read the file with one position per day, if False
+			read the full resolution file, or the time step in hours of
+			a file made by CombinePosSmall.
+		Date0 : int
+			Start date, format yyyymmdd, defaults to the start of the file.
+		Date1 : int
+			End date (inclusive), format yyyymmdd, defaults to the end of
+			the file.
+		Fields : list
+			Names of the fields to read, defaults to all of them.
+		Copy : bool
+			If True, return a recarray, otherwise a dict of read-only
+			views of the memory-mapped fields.
+
+		Returns
+		=======
+		data : numpy.recarray or dict
+			Positions (see dtype).
+
+		'''
+		m = self.MapCombinedPos(Small)
+		i0 = 0
+		i1 = m.size
+		if not Date0 is None:
+			i0,_ = m.Find(ContUT(np.array([Date0]),np.array([0.0]))[0],np.inf)
+		if not Date1 is None:
+			i1,_ = m.Find(ContUT(np.array([Date1]),np.array([24.0]))[0],np.inf)
+		return m.Slice(i0,max(i0,i1),Fields,Copy)
+
+	def CombinePosSmall(self,Step=24.0,Offset=0.0):
+		'''
+		Save a reduced resolution version of the combined position file,
+		by default with one position per day. The rows are read from the
+		memory-mapped full resolution file in chunks (see
+		Tools/MapRecarray.py), so it is never loaded into memory all at
+		once.
+
+		Inputs
+		======
+		Step : float or list
+			Time step(s) in hours of the output files, e.g. 24.0 for daily
+			positions (<Name>PosSmall.bin) or 648.0 for 27 days
+			(<Name>Pos648h.bin). These can be read using
+			ReadCombinedPos(Small=Step).
+		Offset : float
+			The positions kept are those where utc - Offset is a multiple
+			of Step, utc being hours since 1950-01-01.
+
+		'''
+		src = self.MapCombinedPos(False)
+		for s in np.atleast_1d(Step):
+			Decimate(src,self._CombinedName(np.float64(s)),np.float64(s),'utc',Offset)
+
+
+def _InitWorker(Kernels):
+	'''
+	Load the kernels once in each worker process.
+
+	'''
+	KM.Pin(Kernels)
+
+def _SaveChunk(body,Dates):
+	'''
+	Save the positions of a chunk of dates in a worker process.
+
+	'''
+	body._SaveDates(Dates)
+
+
+#every body which has been registered
+Bodies = {}
+
+def RegisterBody(Name,NAIF=None,SPK=None,Kernels=None):
+	'''
+	Create a Body object and register it (and its kernels, as a kernel
+	set for Session).
+
+	Inputs
+	======
+	Name : str
+		Name of the body, e.g. 'Jupiter'.
+	NAIF : str
+		Name or ID code used by SPICE for the body, defaults to Name in
+		upper case, e.g. '5' for the Jupiter barycenter in de432s.bsp.
+	SPK : str
+		The SPK file containing the body, defaults to de432s.bsp.
+	Kernels : list
+		All of the kernels needed, defaults to the LSK, the SPK, the PCK
+		and the HCI frame kernel.
+
+	Returns
+	=======
+	body : Body
+		The new Body object.
+
+	'''
+	body = Body(Name,NAIF,SPK,Kernels)
+	Bodies[Name] = body
+	KM.RegisterSet(Name,body.Kernels)
+	return body
+
+def GetBody(Name):
+	'''
+	Return a registered Body object. The built-in planets are
+	registered when their subpackages are first imported.
+
+	'''
+	if not Name in Bodies and Name in ['Mercury','Venus','Earth','Mars']:
+		importlib.import_module('.' + Name,__package__)
+	return Bodies[Name]
+
+def _J2000toFrame(Frame,et,Step):
+	'''
+	Matrices rotating J2000 to a frame, either shape (3,3) for inertial
+	frames or (n,3,3).
+
+	'''
+	if Frame == 'J2000':
+		return np.identity(3)
+	if Frame == 'HCI':
+		return HCItoJ2000Matrix().T
+	if Frame == 'IAU_SUN':
+		return IAU_SUNMatrices(et,pck_kernel)
+	return RotationMatrices('J2000',Frames.get(Frame,Frame),et,Step)
+
+def BatchPos(Bodies,Frames,Date=None,ut=None,et=None,Native=False,
+				Recarray=False,Step=None,Format=None):
+	'''
+	Positions of several bodies in several frames on one time grid. The
+	ephemeris times are calculated once, each body's position is
+	calculated once in J2000 and each frame's rotation matrices are
+	calculated once per epoch.
+
+	Inputs
+	======
+	Bodies : list
+		Names of registered bodies, e.g. ['Mercury','Venus'].
+	Frames : list
+		Frames, any of 'HCI', 'HAE', 'IAU_SUN', 'J2000' or the names of
+		other SPICE frames.
+	Date : int
+		Date(s) in format yyyymmdd, or times in any of the other forms
+		accepted by GetET.
+	ut : float
+		Time(s) in hours from the start of the day.
+	et : float64
+		Ephemeris time(s), can be used instead of Date and ut.
+	Native : bool
+		If True, use the NumPy SPK reader to get the J2000 positions.
+	Recarray : bool
+		If True, return a recarray instead of an array.
+	Step : float
+		If set, the rotation matrices for dynamic frames such as HAE
+		are only calculated every Step seconds and are interpolated in
+		between (see Sun.Transform.RotationMatrices), e.g. 864000.0 for
+		10 days. By default they are calculated exactly for every unique
+		epoch.
+	Format : str
+		Form of the times in Date if they are not dates in format
+		yyyymmdd, e.g. 'unix' (see GetET).
+
+	Returns
+	=======
+	pos : float64
+		Positions (km), shape (nbody,nframe,n,3); or if Recarray=True,
+		a recarray with the fields Date, ut, utc and x, y, z for each
+		body and frame, e.g. xHCI_Mercury.
+
+	'''
+	if isinstance(Bodies,str):
+		Bodies = [Bodies]
+	if isinstance(Frames,str):
+		Frames = [Frames]
+	bodies = [GetBody(b) for b in Bodies]
+	if et is None:
+		et = GetET(Date,ut,Format)
+	else:
+		et = np.array(et,dtype='float64').flatten()
+	nb = len(bodies)
+	nf = len(Frames)
+	n = et.size
+
+	kernels = []
+	for b in bodies:
+		kernels = kernels + [k for k in b.Kernels if not k in kernels]
+	with KM.Use(kernels):
+		#J2000 positions of each body
+		j2000 = np.zeros((nb,n,3))
+		for i,b in enumerate(bodies):
+			if Native:
+				j2000[i] = SPKPos(b.NAIF,et,'SUN',b.SPK)
+			else:
+				pos,lt = sp.spkpos(b.NAIF,et,'J2000','NONE','SUN')
+				j2000[i] = pos
+
+		#rotate into each frame
+		out = np.zeros((nb,nf,n,3))
+		for j,f in enumerate(Frames):
+			rot = _J2000toFrame(f,et,Step)
+			if rot.ndim == 2:
+				out[:,j] = j2000 @ rot.T
+			else:
+				out[:,j] = np.einsum('nij,bnj->bni',rot,j2000)
+
+	if not Recarray:
+		return out
+
+	#copy into a recarray
+	rdtype = [('Date','int32'),('ut','float32'),('utc','float64')]
+	for b in Bodies:
+		for f in Frames:
+			rdtype += [(c+f+'_'+b,'float64') for c in 'xyz']
+	data = np.recarray(n,dtype=rdtype)
+	Date,ut,utc = et2dateut(et)
+	data.Date = Date
+	data.ut = ut
+	data.utc = utc
+	for i,b in enumerate(Bodies):
+		for j,f in enumerate(Frames):
+			for k,c in enumerate('xyz'):
+				data[c+f+'_'+b] = out[i,j,:,k]
+	return data
@@ -0,0 +1,231 @@
+import numpy as np
+import threading
+from . import TimeScales
+from .Tools.CivilDays import DateToDays,DaysToDate
+from .et2dateut import et2dateut
+
+#days between 1970-01-01 and 2000-01-01
+_days1970 = 10957
+
+#nanoseconds in a day
+_nsday = 86400*10**9
+
+#the largest number of days that the table will cover
+MaxDays = 200*366
+
+#table of ETs at the start of each day, for the days from _day0, and
+#of the rate at which TDB - UTC drifts during each day (the periodic
+#part of TDB - TDT changes by up to 30 microseconds in a day)
+_day0 = 0
+_table = np.zeros((0,2),dtype='float64')
+_lock = threading.Lock()
+
+def _Convert(days):
+	'''
+	Calculate the ET at the start of each day (days since 2000-01-01)
+	and the rate of drift, dET/dTAI - 1, through the day. Within a day
+	ET = ET0 + s*(1 + rate) to better than 1e-7 s, where s is the
+	number of seconds since the start of the day.
+
+	'''
+	out = np.zeros((days.size,2),dtype='float64')
+	tai0 = TimeScales.UTCtoTAI(DaysToDate(days),np.zeros(days.size),TimeScales.lsk_path)
+	tai1 = TimeScales.UTCtoTAI(DaysToDate(days + 1),np.zeros(days.size),TimeScales.lsk_path)
+	et0 = TimeScales.TAItoET(tai0,TimeScales.lsk_path)
+	et1 = TimeScales.TAItoET(tai1,TimeScales.lsk_path)
+	out[:,0] = et0
+	out[:,1] = (et1 - et0)/(tai1 - tai0) - 1.0
+	return out
+
+def _Extend(d0,d1):
+	'''
+	Make sure that the table covers the days d0 to d1 (days since 
+	2000-01-01).
+	
+	'''
+	global _day0,_table
+	
+	#new range of the table
+	if _table.shape[0] > 0:
+		n0 = min(d0,_day0)
+		n1 = max(d1 + 1,_day0 + _table.shape[0])
+	else:
+		n0 = d0
+		n1 = d1 + 1
+	
+	#start again if the table would become too big
+	if n1 - n0 > MaxDays:
+		n0 = d0
+		n1 = d1 + 1
+		_table = np.zeros((0,2),dtype='float64')
+	
+	#fill in the new days
+	days = np.arange(n0,n1)
+	new = np.zeros((days.size,2),dtype='float64')
+	old = (days >= _day0) & (days < _day0 + _table.shape[0])
+	new[old] = _table[days[old] - _day0]
+	if not old.all():
+		new[~old] = _Convert(days[~old])
+	
+	_day0 = n0
+	_table = new
+
+def _DayStartETDays(days):
+	'''
+	Ephemeris times at the start of each day, for days since 2000-01-01,
+	and the rate of drift through each day (see _Convert).
+
+	'''
+	if days.size == 0:
+		return np.zeros((0,2),dtype='float64')
+	d0 = days.min()
+	d1 = days.max()
+	with _lock:
+		if d1 - d0 >= MaxDays:
+			#too many days to keep, just convert them
+			return _Convert(days)
+		if _table.shape[0] == 0 or d0 < _day0 or d1 >= _day0 + _table.shape[0]:
+			_Extend(d0,d1)
+		return _table[days - _day0]
+
+def _DaysToET(days,sec):
+	'''
+	Ephemeris times for days since 2000-01-01 and seconds since the
+	start of each day.
+
+	'''
+	t = _DayStartETDays(days)
+	return t[:,0] + sec + sec*t[:,1]
+
+def DayStartET(Date):
+	'''
+	Return the ephemeris time at the start of each date. The values are
+	stored in a table covering a continuous range of days (up to 
+	MaxDays long), so that each day only needs converting once per 
+	process.
+	
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd
+		
+	Returns
+	=======
+	et : float64
+		Array of ephemeris times at 00:00 UTC on each date.
+	
+	'''
+	return _DayStartETDays(DateToDays(np.array(Date).flatten()))[:,0]
+
+def Datetime64toET(t):
+	'''
+	Convert numpy.datetime64 (UTC) times to ephemeris times. The times
+	are split into whole days and the time of day using integer
+	arithmetic, so no precision is lost before adding the time of day
+	to the ephemeris time at the start of the day.
+	
+	Inputs
+	======
+	t : numpy.datetime64
+		Time(s), in any unit.
+		
+	Returns
+	=======
+	et : float64
+		Array of ephemeris times.
+	
+	'''
+	ns = np.array(t,dtype='datetime64[ns]').flatten().view('int64')
+	days = ns//_nsday
+	sec = (ns - days*_nsday)*1e-9
+	return _DaysToET(days - _days1970,sec)
+
+def UnixtoET(t):
+	'''
+	Convert Unix times (seconds since 1970-01-01 00:00 UTC, ignoring
+	leap seconds) to ephemeris times.
+	
+	Inputs
+	======
+	t : float
+		Unix time(s).
+		
+	Returns
+	=======
+	et : float64
+		Array of ephemeris times.
+	
+	'''
+	t = np.array(t,dtype='float64').flatten()
+	days = np.floor(t/86400.0)
+	return _DaysToET(np.int64(days) - _days1970,t - days*86400.0)
+
+def GetET(Date,ut=None,Format=None,DefaultUT=None):
+	'''
+	Get the ephemeris times for dates and times, where either may be 
+	a scalar. Times can also be given in other forms, using Format to
+	say which:
+	
+		GetET(t) : t is numpy.datetime64
+		GetET(t,Format='et') : t is ephemeris time
+		GetET(t,Format='unix') : t is Unix time (s since 1970-01-01 UTC)
+		GetET(t,Format='datetime64') : t is numpy.datetime64
+	
+	so any function which passes its Date, ut and Format arguments on 
+	to GetET accepts these too, e.g. PosHCI(t,Format='unix'). Dates in
+	format yyyymmdd must always come with ut, so that they can't be 
+	mistaken for times in another form.
+	
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd, or times in the form given by 
+		Format.
+	ut : float
+		Time(s) in hours from beginning of the day.
+	Format : str
+		None for Date and ut (or numpy.datetime64 times), otherwise
+		'et', 'unix' or 'datetime64'.
+	DefaultUT : float
+		If set, the time (hours) used for dates in format yyyymmdd
+		which are given without ut, instead of raising an error.
+		
+	Returns
+	=======
+	et : float64
+		Array of ephemeris times.
+	
+	'''
+	if Format is None and ut is None:
+		kind = np.asarray(Date).dtype.kind
+		if kind == 'M':
+			Format = 'datetime64'
+		elif kind in 'iu' and not DefaultUT is None:
+			ut = DefaultUT
+		else:
+			raise ValueError("ut must be given with dates in format yyyymmdd, use Format='et' or Format='unix' for other times")
+	
+	if not Format is None:
+		if not ut is None:
+			raise ValueError('ut can only be given with dates in format yyyymmdd')
+		Format = Format.lower()
+		if Format == 'et':
+			return np.array(Date,dtype='float64').flatten()
+		if Format == 'unix':
+			return UnixtoET(Date)
+		if Format == 'datetime64':
+			return Datetime64toET(Date)
+		raise ValueError('Unknown time format: '+Format)
+
+	Date,ut = np.broadcast_arrays(np.array(Date).flatten(),np.array(ut,dtype='float64').flatten())
+	return _DaysToET(DateToDays(Date),ut*3600.0)
+
+def GetDate(Date,ut=None,Format=None):
+	'''
+	Get the dates (yyyymmdd) for times given in any of the forms
+	accepted by GetET, e.g. to choose kernels which cover them.
+	
+	'''
+	if Format is None and (not ut is None or np.asarray(Date).dtype.kind in 'iu'):
+		return Date
+	return et2dateut(GetET(Date,ut,Format))[0]
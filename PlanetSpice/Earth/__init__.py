@@ -1,2 +1,2 @@
-from .Pos import PosHCI,PosHAE,ReadCarringtonRotations,SaveCarringtonRotations,CarringtonLongitude,PosIAU_SUN,SavePos,ReadPos,ReadPosDate,CombinePos,ReadCombinedPos,CombinePosSmall
+from .Pos import PosHCI,PosHAE,ReadCarringtonRotations,SaveCarringtonRotations,CarringtonLongitude,PosIAU_SUN,SavePos,ReadPos,ReadPosDate,MigratePos,CombinePos,ReadCombinedPos,CombinePosSmall,Speed,SaveSpeed,AberrationAngle
 from .Orbit import OrbitHAE,OrbitHCI
@@ -0,0 +1,312 @@
+import numpy as np
+from .utc2et import utc2et
+from .et2dateut import et2dateut
+from .Tools.FindCrossings import FindBrackets,RefineRoots
+from . import Mercury
+from . import Venus
+from . import Earth
+from . import Mars
+
+#events are stored in the same way as the Carrington rotations
+dtype = [	('Date','int32'),
+			('ut','float32'),
+			('utc','float64')]
+
+#the planets which can be searched
+Planets = {	'Mercury' : Mercury,
+			'Venus' : Venus,
+			'Earth' : Earth,
+			'Mars' : Mars}
+
+#radius of Venus (km)
+Rv = 6051.8
+
+
+def _ETFunc(Func):
+	'''
+	Wrap a function of (Date,ut) so that it can be called with
+	ephemeris times instead.
+
+	'''
+	def F(et):
+		Date,ut,utc = et2dateut(et)
+		return Func(Date,ut)
+	return F
+
+def _Derivative(Func,h):
+	'''
+	Return a function which estimates the time derivative of Func using
+	central differences, evaluating Func only once per call.
+
+	'''
+	def F(et):
+		n = np.size(et)
+		f = Func(np.append(et + h,et - h))
+		return (f[:n] - f[n:])/(2*h)
+	return F
+
+def _Scan(Func,t0,t1,Step,Level,Direction,Wrap,Subdivide,Tol,MaxIter):
+	'''
+	Coarse-to-fine search for the times where Func crosses Level.
+
+	The function is first sampled every Step seconds, then each pair of
+	steps either side of a turning point in the sampled values (where
+	a pair of crossings could be hidden within a single step) is
+	sampled again with a step of Step/Subdivide. The bracketed crossings
+	are refined together using RefineRoots.
+
+	'''
+	#coarse sampling
+	n = np.int64(np.floor((t1 - t0)/Step)) + 1
+	t = t0 + np.arange(n,dtype='float64')*Step
+	f = Func(t) - Level
+	use = FindBrackets(f,Direction,Wrap)
+	ta = [t[use]]
+	tb = [t[use+1]]
+	fa = [f[use]]
+	fb = [f[use+1]]
+
+	#fine sampling around the turning points
+	if Subdivide > 1 and n > 2:
+		df = np.diff(f)
+		if not Wrap is None:
+			df[np.abs(df) >= Wrap/2.0] = 0.0
+		i = np.where(df[:-1]*df[1:] <= 0)[0] + 1
+		if i.size > 0:
+			ns = 2*Subdivide + 1
+			ts = t[i-1][:,None] + np.arange(ns)*(Step/Subdivide)
+			fs = (Func(ts.flatten()) - Level).reshape(ts.shape)
+
+			#pad the rows so that brackets never span two rows
+			fs = np.concatenate((fs,np.zeros((i.size,1))),axis=1).flatten()
+			ts = np.concatenate((ts,np.zeros((i.size,1))),axis=1).flatten()
+			use = FindBrackets(fs,Direction,Wrap)
+			use = use[(use % (ns + 1)) < ns - 1]
+			ta.append(ts[use])
+			tb.append(ts[use+1])
+			fa.append(fs[use])
+			fb.append(fs[use+1])
+
+	ta = np.concatenate(ta)
+	tb = np.concatenate(tb)
+	fa = np.concatenate(fa)
+	fb = np.concatenate(fb)
+
+	#refine and remove the crossings found by both passes
+	ets = np.sort(RefineRoots(Func,ta,tb,fa,fb,Level,Tol,MaxIter))
+	if ets.size > 1:
+		keep = np.append(True,np.diff(ets) > 10*Tol)
+		ets = ets[keep]
+	return ets
+
+def FindEvents(Func,Date0,Date1,Condition='crossing',Level=0.0,
+				Direction=0,Step=3600.0,Subdivide=10,Wrap=None,
+				DerivStep=60.0,Tol=1e-3,MaxIter=50,ET=False):
+	'''
+	Search for geometric events between two dates.
+
+	Inputs
+	======
+	Func : callable
+		Function of either (Date,ut) or, if ET=True, a single array of
+		ephemeris times, which returns a scalar quantity for each time
+		(e.g. a distance or longitude). It should accept arrays.
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date (inclusive), format yyyymmdd.
+	Condition : str
+		'crossing' : where Func crosses Level.
+		'threshold' : where Func moves above (Direction=1) or below
+			(Direction=-1) Level.
+		'min' : local minima of Func.
+		'max' : local maxima of Func.
+	Level : float
+		The level to search for with 'crossing' and 'threshold'.
+	Direction : int
+		-1 : only where Func goes from above Level to below it
+		1 : only where Func goes from below Level to above it
+		0 : both
+	Step : float
+		Coarse sampling step in seconds - this should be shorter than
+		the time between neighbouring events.
+	Subdivide : int
+		Number of sub-steps used around turning points of the coarse
+		samples.
+	Wrap : float
+		Period of Func if it is an angle (e.g. 2*np.pi).
+	DerivStep : float
+		Step (s) used to estimate the derivative when searching for
+		extrema.
+	Tol : float
+		Tolerance of the event times in seconds.
+	MaxIter : int
+		Maximum number of refinement iterations.
+	ET : bool
+		If True then Func accepts ephemeris times.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	if not ET:
+		Func = _ETFunc(Func)
+
+	#time range to search
+	et0 = utc2et(Date0,0.0)
+	et1 = utc2et(Date1,24.0)
+
+	#the extrema are crossings of zero by the derivative
+	if Condition in ['min','max']:
+		Func = _Derivative(Func,DerivStep)
+		Level = 0.0
+		Direction = 1 if Condition == 'min' else -1
+		Wrap = None
+	elif Condition == 'threshold':
+		if Direction == 0:
+			raise ValueError("Direction must be 1 or -1 for Condition='threshold'")
+	elif Condition != 'crossing':
+		raise ValueError('Unknown Condition: '+Condition)
+
+	ets = _Scan(Func,et0,et1,Step,Level,Direction,Wrap,Subdivide,Tol,MaxIter)
+
+	#convert to dates and times
+	out = np.recarray(ets.size,dtype=dtype)
+	out.Date,out.ut,out.utc = et2dateut(ets)
+	return out
+
+def _Rsun(Body):
+	'''
+	Distance from the Sun (km) of a planet.
+
+	'''
+	PosHCI = Planets[Body].PosHCI
+	def F(et):
+		x,y,z = PosHCI(et,Format='et')
+		return np.sqrt(x**2 + y**2 + z**2)
+	return F
+
+def Perihelia(Body,Date0=19500101,Date1=20500101):
+	'''
+	List the times when a planet is at perihelion.
+
+	Inputs
+	======
+	Body : str
+		'Mercury', 'Venus', 'Earth' or 'Mars'
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	return FindEvents(_Rsun(Body),Date0,Date1,'min',Step=5*86400.0,ET=True)
+
+def Aphelia(Body,Date0=19500101,Date1=20500101):
+	'''
+	List the times when a planet is at aphelion.
+
+	Inputs
+	======
+	Body : str
+		'Mercury', 'Venus', 'Earth' or 'Mars'
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	return FindEvents(_Rsun(Body),Date0,Date1,'max',Step=5*86400.0,ET=True)
+
+def Conjunctions(Body,Date0=19500101,Date1=20500101,Superior=False):
+	'''
+	List the times when a planet and the Earth have the same
+	heliocentric (HCI) longitude, i.e. inferior conjunctions of Mercury
+	and Venus, or oppositions of Mars.
+
+	Inputs
+	======
+	Body : str
+		'Mercury', 'Venus' or 'Mars'
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+	Superior : bool
+		If True, then list the times when the planet is on the opposite
+		side of the Sun to the Earth instead.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	PosHCI = Planets[Body].PosHCI
+	offset = np.pi if Superior else 0.0
+	def F(et):
+		xp,yp,zp = PosHCI(et,Format='et')
+		xe,ye,ze = Earth.PosHCI(et,Format='et')
+		dlon = np.arctan2(yp,xp) - np.arctan2(ye,xe) - offset
+		return (dlon + np.pi) % (2*np.pi) - np.pi
+	return FindEvents(F,Date0,Date1,'crossing',Step=86400.0,Wrap=2*np.pi,ET=True)
+
+def MessengerPeriapsis(Date0=20110318,Date1=20150430):
+	'''
+	List the times of MESSENGER periapsis at Mercury.
+
+	Inputs
+	======
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	def F(et):
+		x,y,z = Mercury.Messenger.PosMSM(et,Format='et')
+		return np.sqrt(x**2 + y**2 + (z + 478.0)**2)
+	return FindEvents(F,Date0,Date1,'min',Step=1800.0,DerivStep=10.0,ET=True)
+
+def VEXEclipses(Date0=20060411,Date1=20141128):
+	'''
+	List the times when Venus Express entered the shadow of Venus
+	(a cylindrical shadow is assumed).
+
+	Inputs
+	======
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+
+	Returns
+	=======
+	out : numpy.recarray
+		Times of each event with the fields Date, ut and utc.
+
+	'''
+	def F(et):
+		x,y,z = Venus.VEX.PosVSO(et,Format='et')
+		rho = np.sqrt(y**2 + z**2)
+
+		#distance from the edge of the shadow, continuous at x = 0
+		return np.where(x < 0,rho,np.sqrt(x**2 + rho**2)) - Rv
+	return FindEvents(F,Date0,Date1,'threshold',Direction=-1,Step=600.0,ET=True)
@@ -1,5 +1,30 @@
-import os 
-SpicePath = os.getenv('SPICE_KERNEL_PATH')+'/'
-OutputPath = os.getenv('SPICE_OUTPUT_PATH')+'/'
+import os
 ModulePath = os.path.dirname(__file__)+'/'
 ModuleData = os.path.dirname(__file__)+'/__data/'
+
+#environment variables used for each path
+_EnvVars = {	'SpicePath' : 'SPICE_KERNEL_PATH',
+				'OutputPath' : 'SPICE_OUTPUT_PATH'}
+
+def _GetPath(Name):
+	'''
+	Read a path from its environment variable.
+
+	'''
+	var = _EnvVars[Name]
+	path = os.getenv(var)
+	if path is None:
+		raise EnvironmentError('The environment variable {:s} is not set - it should contain the path to the {:s}'.format(var,'SPICE kernels' if Name == 'SpicePath' else 'output directory'))
+	return path + '/'
+
+def __getattr__(Name):
+	'''
+	SpicePath, OutputPath and CachePath are read from the environment
+	when they are used, rather than when the module is imported.
+
+	'''
+	if Name in _EnvVars:
+		return _GetPath(Name)
+	if Name == 'CachePath':
+		return _GetPath('OutputPath') + 'Cache/'
+	raise AttributeError('module {:s} has no attribute {:s}'.format(__name__,Name))
@@ -0,0 +1,379 @@
+import numpy as np
+import spiceypy as sp
+import os
+import threading
+import importlib
+import contextlib
+from collections import OrderedDict
+from .Tools.KernelContents import KernelsOverlap
+
+
+def KernelList(kernels):
+	'''
+	Flatten a mixture of kernel names, lists and arrays of kernel names
+	into a single list of normalised paths.
+
+	'''
+	out = []
+	for k in kernels:
+		if isinstance(k,str):
+			out.append(os.path.normpath(k))
+		else:
+			out.extend(KernelList(np.array(k).flatten().tolist()))
+	return out
+
+
+def _Unique(kernels):
+	'''
+	Remove repeated kernels from a list, keeping the last of each as
+	that is the one which would take priority.
+
+	'''
+	return list(dict.fromkeys(kernels[::-1]))[::-1]
+
+
+class KernelManager(object):
+	'''
+	Keeps track of which SPICE kernels are furnished within this process.
+
+	Each kernel file is furnished once, the first time that it is
+	requested, and a reference count is kept for each caller which is
+	using it. When the reference count drops to zero the kernel is not
+	unloaded straight away, it is moved onto a least-recently-used list
+	of unused kernels which are only unloaded when there are more than
+	MaxUnused of them, or when the total size of all loaded kernels
+	exceeds MaxBytes. Kernels can also be pinned, in which case they
+	will remain loaded until they are unpinned.
+
+	SPICE gives priority to the most recently furnished kernel where
+	two kernels provide the same data, so kernels which stay loaded
+	could override the ones being asked for. Whenever kernels are
+	requested, any of them which are below another loaded kernel
+	providing some of the same data (SPK/CK/PCK segments for the same
+	body and times, or the same text kernel variables) are furnished
+	again, so the kernels in use always take priority. Pinned kernels
+	are left where they are.
+
+	'''
+	def __init__(self,MaxUnused=16,MaxBytes=2*1024**3):
+		'''
+		Inputs
+		======
+		MaxUnused : int
+			Maximum number of kernels with no references to keep
+			loaded.
+		MaxBytes : int
+			Total size (in bytes) of loaded kernels above which unused
+			kernels will be unloaded.
+
+		'''
+		self.MaxUnused = MaxUnused
+		self.MaxBytes = MaxBytes
+
+		#reference and pin counts for each loaded kernel
+		self._refs = {}
+		self._pins = {}
+
+		#file sizes of everything loaded
+		self._sizes = {}
+
+		#unused kernels, oldest first
+		self._unused = OrderedDict()
+
+		self._lock = threading.RLock()
+
+	def _Load(self,k):
+		'''
+		Furnish a single kernel if it isn't already loaded.
+
+		'''
+		if not k in self._sizes:
+			sp.furnsh(k)
+			if os.path.isfile(k):
+				self._sizes[k] = os.path.getsize(k)
+			else:
+				self._sizes[k] = 0
+			self._refs[k] = 0
+			self._pins[k] = 0
+
+	def _Raise(self,kernels):
+		'''
+		Make sure that the requested kernels take priority over any
+		other loaded kernels which provide the same data, furnishing them
+		again if they don't. Pinned kernels are never furnished again.
+
+		'''
+		for i,k in enumerate(kernels):
+			if not k in self._sizes or self._pins[k] > 0:
+				continue
+			#kernels requested after this one are allowed above it
+			later = set(kernels[i+1:])
+			loaded = list(self._sizes.keys())
+			above = loaded[loaded.index(k)+1:]
+			if any([not a in later and KernelsOverlap(k,a) for a in above]):
+				sp.unload(k)
+				sp.furnsh(k)
+				#keep the load order in self._sizes
+				self._sizes[k] = self._sizes.pop(k)
+
+	def _Drop(self,k):
+		'''
+		Unload a single kernel and forget about it.
+
+		'''
+		sp.unload(k)
+		self._sizes.pop(k,None)
+		self._refs.pop(k,None)
+		self._pins.pop(k,None)
+		self._unused.pop(k,None)
+
+	def _Release(self,k):
+		'''
+		Move a kernel to the end of the unused list if nothing is using
+		it any more.
+
+		'''
+		if self._refs[k] <= 0 and self._pins[k] <= 0:
+			self._refs[k] = 0
+			self._unused.pop(k,None)
+			self._unused[k] = self._sizes[k]
+
+	def _Enforce(self):
+		'''
+		Unload the least recently used kernels until we are within the
+		budget.
+
+		'''
+		nbytes = np.sum(list(self._sizes.values()))
+		while len(self._unused) > 0 and ((len(self._unused) > self.MaxUnused) or (nbytes > self.MaxBytes)):
+			k,size = self._unused.popitem(last=False)
+			self._Drop(k)
+			nbytes -= size
+
+	def Furnsh(self,*kernels):
+		'''
+		Make sure that kernels are loaded and increment their reference
+		counts. Every call to Furnsh should be matched by a call to
+		Unload with the same kernels.
+
+		Inputs
+		======
+		kernels : str or list of str
+			Kernel file names.
+
+		'''
+		with self._lock:
+			kernels = _Unique(KernelList(kernels))
+			self._Raise(kernels)
+			for k in kernels:
+				self._Load(k)
+				self._refs[k] += 1
+				self._unused.pop(k,None)
+
+	def Unload(self,*kernels):
+		'''
+		Decrement the reference counts of kernels - they will remain
+		loaded until they are evicted to keep within the budget.
+
+		Inputs
+		======
+		kernels : str or list of str
+			Kernel file names.
+
+		'''
+		with self._lock:
+			for k in KernelList(kernels):
+				if k in self._refs:
+					self._refs[k] -= 1
+					self._Release(k)
+			self._Enforce()
+
+	@contextlib.contextmanager
+	def Use(self,*kernels):
+		'''
+		Furnish kernels for the duration of a with block, unloading them
+		at the end even if an exception is raised, e.g.:
+
+			with KM.Use(lsk_path,spk_kernel):
+				x = sp.spkpos(...)
+
+		Inputs
+		======
+		kernels : str or list of str
+			Kernel file names.
+
+		'''
+		self.Furnsh(*kernels)
+		try:
+			yield
+		finally:
+			self.Unload(*kernels)
+
+	def Pin(self,*kernels):
+		'''
+		Load kernels and keep them loaded until they are unpinned.
+
+		Inputs
+		======
+		kernels : str or list of str
+			Kernel file names.
+
+		'''
+		with self._lock:
+			kernels = _Unique(KernelList(kernels))
+			self._Raise(kernels)
+			for k in kernels:
+				self._Load(k)
+				self._pins[k] += 1
+				self._unused.pop(k,None)
+
+	def Unpin(self,*kernels):
+		'''
+		Remove the pin from kernels loaded using Pin.
+
+		Inputs
+		======
+		kernels : str or list of str
+			Kernel file names.
+
+		'''
+		with self._lock:
+			for k in KernelList(kernels):
+				if k in self._pins:
+					self._pins[k] -= 1
+					self._Release(k)
+			self._Enforce()
+
+	def IsLoaded(self,kernel):
+		'''
+		Check whether a kernel is currently furnished by the manager.
+
+		'''
+		return os.path.normpath(kernel) in self._sizes
+
+	def Loaded(self):
+		'''
+		Return a list of the kernels currently loaded.
+
+		'''
+		with self._lock:
+			return list(self._sizes.keys())
+
+	def SetBudget(self,MaxUnused=None,MaxBytes=None):
+		'''
+		Change the limits on the unused kernels kept loaded.
+
+		Inputs
+		======
+		MaxUnused : int
+			Maximum number of kernels with no references to keep
+			loaded.
+		MaxBytes : int
+			Total size (in bytes) of loaded kernels above which unused
+			kernels will be unloaded.
+
+		'''
+		with self._lock:
+			if not MaxUnused is None:
+				self.MaxUnused = MaxUnused
+			if not MaxBytes is None:
+				self.MaxBytes = MaxBytes
+			self._Enforce()
+
+	def Evict(self):
+		'''
+		Unload all of the kernels which are not currently in use.
+
+		'''
+		with self._lock:
+			for k in list(self._unused.keys()):
+				self._Drop(k)
+
+	def Clear(self):
+		'''
+		Unload everything that has been loaded by the manager,
+		regardless of reference counts and pins.
+
+		'''
+		with self._lock:
+			for k in list(self._sizes.keys()):
+				self._Drop(k)
+
+
+#the process-wide kernel manager used by all of the modules
+Manager = KernelManager()
+
+Furnsh = Manager.Furnsh
+Unload = Manager.Unload
+Use = Manager.Use
+Pin = Manager.Pin
+Unpin = Manager.Unpin
+IsLoaded = Manager.IsLoaded
+Loaded = Manager.Loaded
+SetBudget = Manager.SetBudget
+Evict = Manager.Evict
+Clear = Manager.Clear
+
+
+#named sets of kernels used by each module
+KernelSets = {}
+
+#modules which register the built-in kernel sets when they are imported
+_SetModules = {	'Sun' : '.Sun',
+				'Mercury' : '.Mercury',
+				'Venus' : '.Venus',
+				'Earth' : '.Earth',
+				'Mars' : '.Mars',
+				'Messenger' : '.Mercury.Messenger',
+				'Bepi' : '.Mercury.Bepi',
+				'VEX' : '.Venus.VEX'}
+
+def HasSet(Name):
+	'''
+	Check whether a kernel set exists, importing the module which
+	registers it if it is one of the built-in sets.
+
+	'''
+	if not Name in KernelSets and Name in _SetModules:
+		importlib.import_module(_SetModules[Name],__package__)
+	return Name in KernelSets
+
+def RegisterSet(Name,Kernels):
+	'''
+	Register a named set of kernels which can be pinned for a session.
+
+	Inputs
+	======
+	Name : str
+		Name of the kernel set, e.g. 'Mercury'.
+	Kernels : list or callable
+		Either a list of kernel file names or a function which accepts
+		a Date (or None) and returns a list of kernel file names, for
+		sets which depend upon the dates being used.
+
+	'''
+	KernelSets[Name] = Kernels
+
+def GetSet(Name,Date=None):
+	'''
+	Return the list of kernels in a named set.
+
+	Inputs
+	======
+	Name : str
+		Name of the kernel set.
+	Date : int
+		Date(s) in format yyyymmdd, only used by sets which depend upon
+		the date.
+
+	Returns
+	=======
+	kernels : list
+		Kernel file names.
+
+	'''
+	HasSet(Name)
+	k = KernelSets[Name]
+	if callable(k):
+		k = k(Date)
+	return KernelList([k])
@@ -0,0 +1,98 @@
+import numpy as np
+import os
+from . import Globals
+from .Tools.ReadTextKernel import ReadTextKernel
+from .Tools.CivilDays import DateToDays
+from .Tools.FileHash import FileHash
+
+_months = {'JAN':1,'FEB':2,'MAR':3,'APR':4,'MAY':5,'JUN':6,
+			'JUL':7,'AUG':8,'SEP':9,'OCT':10,'NOV':11,'DEC':12}
+
+#LSK contents which have already been read, keyed by the file hash
+_lsk = {}
+
+def _ParseDate(s):
+	'''
+	Convert a text kernel date such as '@1972-JAN-1' to yyyymmdd.
+	
+	'''
+	yr,mn,dy = s.lstrip('@').split('-')[:3]
+	if mn.upper()[:3] in _months:
+		mn = _months[mn.upper()[:3]]
+	return np.int32(yr)*10000 + np.int32(mn)*100 + np.int32(dy[:2])
+
+def _CacheName(h):
+	'''
+	Name of the file used to store the contents of an LSK with hash h,
+	or None if there is no output path to store it in.
+	
+	'''
+	try:
+		return Globals.CachePath + 'LSK/{:s}.npz'.format(h)
+	except EnvironmentError:
+		return None
+
+def ReadLSK(fname):
+	'''
+	Read the leap seconds and the constants used to convert between 
+	TDT and TDB from a leap seconds kernel. 
+	
+	The contents are kept in memory and are also stored in a small 
+	.npz file (named using the SHA1 hash of the kernel) in 
+	Globals.CachePath, so the text kernel is only parsed once. If
+	SPICE_OUTPUT_PATH is not set then only the copy in memory is kept.
+	
+	Inputs
+	======
+	fname : str
+		Name of the LSK file.
+		
+	Returns
+	=======
+	lsk : dict
+		Contains the following:
+		'DELTA_T_A' : TDT - TAI (s)
+		'K','EB','M' : constants for the periodic TDB - TDT term
+		'LeapDates' : dates (yyyymmdd) that each value of TAI - UTC
+			begins
+		'LeapDays' : the same dates as days since 2000-01-01
+		'DeltaAT' : TAI - UTC (s) for each date in 'LeapDates'
+	
+	'''
+	h = FileHash(fname)
+	if h in _lsk:
+		return _lsk[h]
+		
+	cname = _CacheName(h)
+	if not cname is None and os.path.isfile(cname):
+		#read the cached version
+		with np.load(cname) as f:
+			lsk = {k:f[k] for k in f.files}
+	else:
+		#parse the kernel
+		tk = ReadTextKernel(fname)
+		dat = tk['DELTET/DELTA_AT']
+		lsk = {	'DELTA_T_A' : np.float64(tk['DELTET/DELTA_T_A'][0]),
+				'K' : np.float64(tk['DELTET/K'][0]),
+				'EB' : np.float64(tk['DELTET/EB'][0]),
+				'M' : np.array(tk['DELTET/M'],dtype='float64'),
+				'LeapDates' : np.array([_ParseDate(d) for d in dat[1::2]],dtype='int32'),
+				'DeltaAT' : np.array(dat[0::2],dtype='float64')}
+		lsk['LeapDays'] = DateToDays(lsk['LeapDates'])
+		
+		#save it for next time (via a temporary file so that other 
+		#processes never see a partial file)
+		if not cname is None:
+			try:
+				if not os.path.isdir(os.path.dirname(cname)):
+					os.makedirs(os.path.dirname(cname))
+				tmp = cname + '.{:d}.tmp'.format(os.getpid())
+				f = open(tmp,'wb')
+				np.savez(f,**lsk)
+				f.close()
+				os.replace(tmp,cname)
+			except OSError:
+				pass
+	
+	_lsk[h] = lsk
+	return lsk
@@ -1,9 +1,12 @@
 import numpy as np
 import spiceypy as sp
-from ...utc2et import utc2et
+from ...DayStartET import GetET
+from ...Surrogate import SurrogatePos
+from ...Body import SunSpeed,Aberration
 from scipy.interpolate import InterpolatedUnivariateSpline
 import os
 from ... import Globals
+from ... import KernelManager as KM
 import RecarrayTools as RT
 import DateTimeTools as TT
 from ...Tools.ContUT import ContUT
@@ -17,6 +20,7 @@ de430_kernel = Globals.SpicePath + '/bepi/misc/kernels/spk/de430.bsp'
 de432s_kernel = Globals.SpicePath + '/bepi/misc/kernels/spk/de432s.bsp'
 hci_kernel = Globals.SpicePath + '/frames/tk/sunframes.tk'
 mso_kernel = Globals.SpicePath + '/frames/tk/MercuryMSO.tk'
+KM.RegisterSet('Bepi',[lsk_path,sclk_kernel,de430_kernel,mpo_kernel,mmo_kernel,pck_kernel,mso_kernel])
 
 #position dtype
 dtype = [	('Date','int32'),
@@ -32,104 +36,56 @@ dtype = [	('Date','int32'),
 #2025-01-02T12:13:52.03200004 - 2027-03-19T10:59:30.59520000 (MMO)
 
 #I will use 20250328 - 20270318
-def MPOPosMSM(Date,ut):
+def MPOPosMSM(Date,ut=None,Surrogate=False,Format=None):
 	'''
-	Position of MPO in MSM coords
+	Position of MPO in MSM coords. If Surrogate=True then the positions
+	are evaluated from cached Chebyshev fits to the trajectory (see 
+	Surrogate.py), which is much faster for dense time series.
 	
 	'''
+	if Surrogate:
+		et = GetET(Date,ut,Format)
+		pos = SurrogatePos('MPO',et,'MERCURYMSO','MERCURY',[lsk_path,sclk_kernel,de430_kernel,mpo_kernel,pck_kernel,mso_kernel])
+		return (pos.T[0],pos.T[1],pos.T[2]-478.0)
 	
-	#create the output arrays
-	if np.size(np.shape(ut)) == 0:
-		ut = np.array([ut])
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
-		
+	
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(sclk_kernel)
-	sp.furnsh(de430_kernel)
-	sp.furnsh(mpo_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get positions
-	pos,lt = sp.spkpos('MPO',et,'MERCURYMSO','NONE','MERCURY')
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]-478.0			
-	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(sclk_kernel)
-	sp.unload(de430_kernel)
-	sp.unload(mpo_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
+	with KM.Use(lsk_path,sclk_kernel,de430_kernel,mpo_kernel,pck_kernel,mso_kernel):
+		#get positions
+		pos,lt = sp.spkpos('MPO',et,'MERCURYMSO','NONE','MERCURY')
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]-478.0
 
 	return (x,y,z)
 	
 	
-def MMOPosMSM(Date,ut):
+def MMOPosMSM(Date,ut=None,Surrogate=False,Format=None):
 	'''
-	Position of MMO in MSM coords
+	Position of MMO in MSM coords. If Surrogate=True then the positions
+	are evaluated from cached Chebyshev fits to the trajectory (see 
+	Surrogate.py), which is much faster for dense time series.
 	
 	'''
+	if Surrogate:
+		et = GetET(Date,ut,Format)
+		pos = SurrogatePos('MMO',et,'MERCURYMSO','MERCURY',[lsk_path,sclk_kernel,de430_kernel,mmo_kernel,pck_kernel,mso_kernel])
+		return (pos.T[0],pos.T[1],pos.T[2]-478.0)
 	
-	#create the output arrays
-	if np.size(np.shape(ut)) == 0:
-		ut = np.array([ut])
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
-		
+	
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(sclk_kernel)
-	sp.furnsh(de430_kernel)
-	sp.furnsh(mpo_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get positions
-	pos,lt = sp.spkpos('MMO',et,'MERCURYMSO','NONE','MERCURY')
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]-478.0			
-	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(sclk_kernel)
-	sp.unload(de430_kernel)
-	sp.unload(mpo_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
+	with KM.Use(lsk_path,sclk_kernel,de430_kernel,mmo_kernel,pck_kernel,mso_kernel):
+		#get positions
+		pos,lt = sp.spkpos('MMO',et,'MERCURYMSO','NONE','MERCURY')
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]-478.0
 
 	return (x,y,z)
 	
@@ -225,3 +181,36 @@ def SavePosSec(sc,StartDate=20250328,StopDate=20270318):
 		Date = TT.PlusDay(Date)
 		
 	print('')
+
+
+def Speed(sc,Date,ut=None,Format=None):
+	'''
+	Speed of MMO/MPO relative to the Sun (km/s), from its state vector.
+	If ut is not given then the speed at 12:00 on each date is used.
+	
+	'''
+	if sc.upper() == 'MMO':
+		sc_kernel = mmo_kernel
+	elif sc.upper() == 'MPO':
+		sc_kernel = mpo_kernel
+	else:
+		raise ValueError('Unknown spacecraft: {:s}, use \'MMO\' or \'MPO\''.format(sc))
+	
+	#get the ephemeris times
+	et = GetET(Date,ut,Format,DefaultUT=12.0)
+	
+	#load kernels
+	with KM.Use(lsk_path,de430_kernel,sc_kernel):
+		v = SunSpeed(sc.upper(),et)
+	
+	return v
+	
+def AberrationAngle(sc,Date,Vsw=400.0,*,ut=None,Format=None):
+	'''
+	Aberration angle (degrees) of the solar wind due to the motion of
+	MMO/MPO relative to the Sun. Vsw can be an array which broadcasts 
+	against the times (see Body.Aberration), ut and Format can only
+	be given as keywords.
+	
+	'''
+	return Aberration(Speed(sc,Date,ut,Format),Vsw)
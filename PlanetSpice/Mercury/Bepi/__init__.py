@@ -1 +1 @@
-from .BepiPos import MMOPosMSM,MPOPosMSM,ReadPos,SavePosMin,SavePosSec
+from .BepiPos import MMOPosMSM,MPOPosMSM,ReadPos,SavePosMin,SavePosSec,Speed,AberrationAngle
@@ -1,13 +1,19 @@
 import numpy as np
 import spiceypy as sp
-from ...utc2et import utc2et
+from ...DayStartET import GetET,GetDate
+from ...Surrogate import SurrogatePos
+from ...ResultCache import CachedPos
+from ...Body import SunSpeed,Aberration
+from ...Sun.Transform import RotationMatrices
 from scipy.interpolate import InterpolatedUnivariateSpline
 import os
-import DateTimeTools as TT
 from ...Tools.FileSearch import FileSearch
 from ...Tools.ContUT import ContUT
 from ... import Globals
+from ... import KernelManager as KM
+from ...Sun.IAU_SUN import CarringtonLon
 from ...Tools.ListDates import ListDates
+from ...Tools.Manifest import Manifest,KernelKey,Complete
 import RecarrayTools as RT
 
 lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
@@ -24,6 +30,46 @@ fk_kernel = Globals.SpicePath + '/messenger/fk/msgr_v231.tf'
 ck_path = Globals.SpicePath + '/messenger/ck/'
 
 
+def ListCK(Date):
+	'''
+	List the latest version of the MESSENGER CK kernels for each month
+	covered by Date.
+	
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd
+		
+	Returns
+	=======
+	ck_kernel : list
+		CK kernel file names
+	
+	'''
+	ck = 'msgr_{:04d}_v*.bc'
+	
+	yymm = (Date//100) % 10000
+	uyymm = np.unique(yymm)
+	nck = np.size(uyymm)
+	ck_kernel = []
+	for i in range(0,nck):
+		files = FileSearch(ck_path,ck.format(uyymm[i]))
+		if files.size > 0:
+			ck_kernel.append(ck_path+files[-1])
+	return ck_kernel
+
+def _KernelSet(Date=None):
+	'''
+	Kernels used by this module, including the CK kernels for Date.
+	
+	'''
+	kernels = [lsk_path,spk_kernel,spk_kernel2,sclk_kernel,pck_kernel,hci_kernel,mso_kernel,ik_kernel,fk_kernel]
+	if not Date is None:
+		kernels = kernels + ListCK(np.array(Date))
+	return kernels
+
+KM.RegisterSet('Messenger',_KernelSet)
+
 	#position dtype
 dtype = [	('Date','int32'),
 			('ut','float32'),
@@ -35,7 +81,7 @@ dtype = [	('Date','int32'),
 	
 
 
-def MET(Date,ut):
+def MET(Date,ut=None,Format=None):
 	'''
 	This might return Mission Elapsed Time, but who knows if it actually
 	works!
@@ -43,34 +89,20 @@ def MET(Date,ut):
 	'''
 	
 	
-	ut = np.array([ut]).flatten()
-	n = ut.size
-	if np.size(Date) == 1:
-		Date = np.array([Date]*n)
-	else:
-		Date = np.array([Date]).flatten()
-
-	et = np.zeros((n,),dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+	n = et.size
 	
-	sp.furnsh(lsk_path)
-	sp.furnsh(sclk_kernel)
-
-
-	ud = np.unique(Date)
-	for i in range(0,ud.size):
-		use = np.where(Date == ud[i])[0]
-		tmp = utc2et(ud[i],0.0)
-		et[use] = tmp + ut[use]*3600.0
-
-	met = np.zeros(n,dtype='float64')
-	for i in range(0,n):
-		met[i] = sp.sce2t(-236,et[i])
+	with KM.Use(lsk_path,sclk_kernel):
+		met = np.zeros(n,dtype='float64')
+		for i in range(0,n):
+			met[i] = sp.sce2t(-236,et[i])
 	
 	return met/1e6
 	
 				
 
-def OrientationMSO(Date,ut,Verbose=False):
+def OrientationMSO(Date,ut=None,Verbose=False,Format=None):
 	'''
 	This should return the direction in which MESSENGER is oriented
 	
@@ -78,389 +110,190 @@ def OrientationMSO(Date,ut,Verbose=False):
 	
 	'''
 	
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+	n = et.size
 	x = np.zeros(n,dtype='float64')
 	y = np.zeros(n,dtype='float64')
 	z = np.zeros(n,dtype='float64')
 	
 	#find the ck kernels
-	ck = 'msgr_{:04d}_v*.bc'
-	
-	yymm = (Date//100) % 10000
-	uyymm = np.unique(yymm)
-	nck = np.size(uyymm)
-	ck_kernel = []
-	for i in range(0,nck):
-		files = FileSearch(ck_path,ck.format(uyymm[i]))
-		if files.size > 0:
-			ck_kernel.append(ck_path+files[-1])
-	nck = np.size(ck_kernel)
+	ck_kernel = ListCK(GetDate(Date,ut,Format))
 	
 
 	#load all the kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(sclk_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	sp.furnsh(ik_kernel)
-	sp.furnsh(fk_kernel)
-	for i in range(0,nck):
-		sp.furnsh(ck_kernel[i])
-
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get the positions
-	if Verbose:
-		for i in range(0,n):
-			print('\rVector {0} of {1}'.format(i+1,n),end='')
-			pos,lt = sp.spkpos('MERCURY',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
-			x[i] = pos[0]
-			y[i] = pos[1]
-			z[i] = pos[2]
-		print()
-	else:
-		for i in range(0,n):
-			pos,lt = sp.spkpos('MERCURY',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
-			x[i] = pos[0]
-			y[i] = pos[1]
-			z[i] = pos[2]	
-	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(sclk_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
-	sp.unload(ik_kernel)
-	sp.unload(fk_kernel)
-	for i in range(0,nck):
-		sp.unload(ck_kernel[i])
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,sclk_kernel,pck_kernel,mso_kernel,ik_kernel,fk_kernel,ck_kernel):
+		#get the positions
+		if Verbose:
+			for i in range(0,n):
+				print('\rVector {0} of {1}'.format(i+1,n),end='')
+				pos,lt = sp.spkpos('MERCURY',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
+				x[i] = pos[0]
+				y[i] = pos[1]
+				z[i] = pos[2]
+			print()
+		else:
+			for i in range(0,n):
+				pos,lt = sp.spkpos('MERCURY',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
+				x[i] = pos[0]
+				y[i] = pos[1]
+				z[i] = pos[2]
 
 	return (x,y,z)
 
-def NSOrientationMSO(Date,ut):
+def NSOrientationMSO(Date,ut=None,Format=None):
 	'''
 	Get the orientation of MESSENGER NS?
 	'''
 
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
 	
 	
-	ck = 'msgr_{:04d}_v*.bc'
-	
-	yymm = (Date//100) % 10000
-	uyymm = np.unique(yymm)
-	nck = np.size(uyymm)
-	ck_kernel = []
-	for i in range(0,nck):
-		files = FileSearch(ck_path,ck.format(uyymm[i]))
-		if files.size > 0:
-			ck_kernel.append(ck_path+files[-1])
-	nck = np.size(ck_kernel)
+	ck_kernel = ListCK(GetDate(Date,ut,Format))
 	
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(sclk_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	sp.furnsh(ik_kernel)
-	sp.furnsh(fk_kernel)
-	for i in range(0,nck):
-		sp.furnsh(ck_kernel[i])
-
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-
-	#calculate positions
-	m = sp.pxform('MERCURYMSO','MSGR_GRNS_NS',et)
-
-		
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(sclk_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
-	sp.unload(ik_kernel)
-	sp.unload(fk_kernel)
-	for i in range(0,nck):
-		sp.unload(ck_kernel[i])
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,sclk_kernel,pck_kernel,mso_kernel,ik_kernel,fk_kernel,ck_kernel):
+		#calculate positions
+		m = RotationMatrices('MERCURYMSO','MSGR_GRNS_NS',et)
 
 	return m
 
-def OrientationSUN(date,ut):
+def OrientationSUN(Date,ut=None,Format=None):
 
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+	n = et.size
 	x = np.zeros(n,dtype='float64')
 	y = np.zeros(n,dtype='float64')
 	z = np.zeros(n,dtype='float64')
 	
 	
-	ck = 'msgr_{:04d}_v*.bc'
-	
-	yymm = (Date//100) % 10000
-	uyymm = np.unique(yymm)
-	nck = np.size(uyymm)
-	ck_kernel = []
-	for i in range(0,nck):
-		files = FileSearch(ck_path,ck.format(uyymm[i]))
-		if files.size > 0:
-			ck_kernel.append(ck_path+files[-1])
-	nck = np.size(ck_kernel)
+	ck_kernel = ListCK(GetDate(Date,ut,Format))
 	
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(sclk_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	sp.furnsh(ik_kernel)
-	sp.furnsh(fk_kernel)
-	for i in range(0,nck):
-		sp.furnsh(ck_kernel[i])
-
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-
-			
-	#m = sp.pxform('J2000','MSGR_SPACECRAFT',et[0])
-	for i in range(0,n):
-		pos,lt=sp.spkpos('SUN',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
-		x[i]=pos[0]
-		y[i]=pos[1]
-		z[i]=pos[2]
-		
-		
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(sclk_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
-	sp.unload(ik_kernel)
-	sp.unload(fk_kernel)
-	for i in range(0,nck):
-		sp.unload(ck_kernel[i])
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,sclk_kernel,pck_kernel,mso_kernel,ik_kernel,fk_kernel,ck_kernel):
+		#m = sp.pxform('J2000','MSGR_SPACECRAFT',et[0])
+		for i in range(0,n):
+			pos,lt=sp.spkpos('SUN',et[i],'MSGR_SPACECRAFT','NONE','MESSENGER')
+			x[i]=pos[0]
+			y[i]=pos[1]
+			z[i]=pos[2]
 
 	return (x,y,z)
 
 
-def PosMSM(Date,ut):
+def PosMSM(Date,ut=None,Surrogate=False,Cache=False,Format=None):
 	'''
-	Messenger position in MSM coords (km)
+	Messenger position in MSM coords (km). If Surrogate=True then the 
+	positions are evaluated from cached Chebyshev fits to the 
+	trajectory (see Surrogate.py), which is much faster for dense time
+	series. If Cache=True then the result is stored on disk and reused
+	by later calls with the same times and kernels (see 
+	ResultCache.py).
 	
 	'''
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	if Cache:
+		return CachedPos(PosMSM,Date,ut,'MESSENGER','MERCURYMSO',[lsk_path,spk_kernel,spk_kernel2,pck_kernel,mso_kernel],Surrogate=Surrogate,Format=Format)
+	if Surrogate:
+		et = GetET(Date,ut,Format)
+		pos = SurrogatePos('MESSENGER',et,'MERCURYMSO','MERCURY',[lsk_path,spk_kernel,spk_kernel2,pck_kernel,mso_kernel])
+		return (pos.T[0],pos.T[1],pos.T[2]-478.0)
+		
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
 		
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(mso_kernel)	
-	
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	for i in range(0,n):
-		pos,lt = sp.spkpos('MESSENGER',et[i],'MERCURYMSO','NONE','MERCURY')
-		x[i] = pos[0]
-		y[i] = pos[1]
-		z[i] = pos[2]-478.0		
-	
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(pck_kernel)
-	sp.unload(mso_kernel)
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,pck_kernel,mso_kernel):
+		#get the positions for each date/time
+		pos,lt = sp.spkpos('MESSENGER',et,'MERCURYMSO','NONE','MERCURY')
+		pos = np.array(pos)
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]-478.0
 
 	return (x,y,z)
 
 
-def PosHCI(Date,ut):
+def PosHCI(Date,ut=None,Format=None):
 	'''
 	Messenger position in HCI coords (km)
 	
 	'''	
 
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
 		
 		
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(hci_kernel)	
-	
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get the positions for each date/time
-	pos,lt = sp.spkpos('MESSENGER',et,'HCI','NONE','SUN')
-	pos = np.array(pos)
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]	
-
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(pck_kernel)
-	sp.unload(hci_kernel)
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,pck_kernel,hci_kernel):
+		#get the positions for each date/time
+		pos,lt = sp.spkpos('MESSENGER',et,'HCI','NONE','SUN')
+		pos = np.array(pos)
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]
 
 	return (x,y,z)
 
-def CarringtonLongitude(Date,ut):
+def CarringtonLongitude(Date,ut=None,Format=None):
 	'''
 	Get MESSENGER's Carrington longitude
 	
 	'''
 
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	lon=np.zeros(n,dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
 
 		
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(pck_kernel)
-	
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	pos,lt = sp.spkpos('MESSENGER',et,'IAU_SUN','NONE','SUN')
-	pos = np.array(pos)
-	lon = np.arctan2(pos.T[1],pos.T[0])*180/np.pi
-
-	
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(pck_kernel)
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,pck_kernel):
+		pos,lt = sp.spkpos('MESSENGER',et,'J2000','NONE','SUN')
+		pos = np.array(pos)
+		lon = CarringtonLon(et,pos.T[0],pos.T[1],pos.T[2],pck_kernel)*180/np.pi
 
 	return (lon)
 
 	
 
-def PosHAE(date,ut):
+def PosHAE(Date,ut=None,Format=None):
 	'''
 	Messenger position in HAE coords (km)
 	
 	'''	
 
-	n = np.size(ut)
-
-	if np.size(ut) == 1:
-		ut = np.array([ut])
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
 		
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(spk_kernel2)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(hci_kernel)	
-	
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	
-	pos,lt = sp.spkpos('MESSENGER',et,'ECLIPDATE','NONE','SUN')
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]		
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(spk_kernel2)
-	sp.unload(pck_kernel)
-	sp.unload(hci_kernel)
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2,pck_kernel,hci_kernel):
+		pos,lt = sp.spkpos('MESSENGER',et,'ECLIPDATE','NONE','SUN')
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]
 
 	return (x,y,z)
 
-def HAELon(Date,ut):
+def HAELon(Date,ut=None,Format=None):
 	'''
 	Messenger lingitude in HCI coords
 	
 	'''	
 
-	x,y,z = MessengerPosHAE(Date,ut)
+	x,y,z = PosHAE(Date,ut,Format=Format)
 	return np.arctan2(y,x)*180.0/np.pi
 
 
-def SaveMinutePos():
+def SaveMinutePos(Force=False):
+	'''
+	Save the MESSENGER position at 1 minute resolution for each day
+	of the mission. The days which have been saved are recorded in
+	MinutePos/manifest.npz along with a hash of the kernels used, so
+	only days which are missing or were saved using different kernels
+	are calculated (see Tools/Manifest.py).
+	
+	Inputs
+	======
+	Force : bool
+		If True, save every day even if it is already up to date.
+	
+	'''
 	path = Globals.OutputPath + 'Mercury/MESSENGER/MinutePos/'
 	if not os.path.isdir(path):
 		os.system('mkdir -pv '+path)
@@ -472,6 +305,12 @@ def SaveMinutePos():
 	
 	Dates = np.concatenate((Dates0,Dates1,Dates2,Dates3))
 	
+	kernels = [lsk_path,spk_kernel,spk_kernel2,pck_kernel,mso_kernel]
+	manifest = Manifest(path + 'manifest.npz')
+	key = KernelKey(kernels)
+	if not Force:
+		Dates = manifest.Todo(Dates,key)
+	
 	ut = np.arange(1440.0)/60.0
 	for Date in Dates:
 		print('Date: {:d}'.format(Date))
@@ -486,7 +325,10 @@ def SaveMinutePos():
 		data.y = y/2440.0
 		data.z = z/2440.0
 		
-		RT.SaveRecarray(data,fname)
+		tmp = fname + '.{:d}.tmp'.format(os.getpid())
+		RT.SaveRecarray(data,tmp)
+		os.replace(tmp,fname)
+		manifest.Mark(Date,key,Complete)
 		
 def ReadMinutePos(Date):
 	path = Globals.OutputPath + 'Mercury/MESSENGER/MinutePos/'
@@ -520,3 +362,28 @@ def CombineMinutePos(Half=True):
 		data = data[ind]
 	
 	RT.SaveRecarray(data,fname)
+
+
+def Speed(Date,ut=None,Format=None):
+	'''
+	Messenger's speed relative to the Sun (km/s), from its state vector.
+	If ut is not given then the speed at 12:00 on each date is used.
+	
+	'''
+	#get the ephemeris times
+	et = GetET(Date,ut,Format,DefaultUT=12.0)
+
+	with KM.Use(lsk_path,spk_kernel,spk_kernel2):
+		v = SunSpeed('MESSENGER',et)
+	
+	return v
+
+def AberrationAngle(Date,Vsw=400.0,*,ut=None,Format=None):
+	'''
+	Aberration angle (degrees) of the solar wind due to Messenger's 
+	motion relative to the Sun. Vsw can be an array which broadcasts 
+	against the times (see Body.Aberration), ut and Format can only
+	be given as keywords.
+	
+	'''
+	return Aberration(Speed(Date,ut,Format),Vsw)
@@ -1 +1 @@
-from .MessengerPos import MET,HAELon,CarringtonLongitude,PosHCI,NSOrientationMSO,OrientationMSO,OrientationSUN,PosHAE,PosMSM,SaveMinutePos,ReadMinutePos,CombineMinutePos
+from .MessengerPos import MET,HAELon,CarringtonLongitude,PosHCI,NSOrientationMSO,OrientationMSO,OrientationSUN,PosHAE,PosMSM,SaveMinutePos,ReadMinutePos,CombineMinutePos,Speed,AberrationAngle
@@ -1,6 +1,8 @@
 from .Orbit import OrbitHAE,OrbitHCI
-from .Pos import AberrationAngle,PosHCI,PosHCIDates,PosIAU_SUN,ReadPos,ReadPosDate,SaveCarringtonRotations,ReadCarringtonRotations,SavePos,Speed,CombinePos,ReadCombinedPos,CombinePosSmall,SaveSpeed
+from .Pos import AberrationAngle,PosHCI,PosHCIDates,PosHAE,PosIAU_SUN,CarringtonLongitude,ReadPos,ReadPosDate,MigratePos,SaveCarringtonRotations,ReadCarringtonRotations,SavePos,Speed,CombinePos,ReadCombinedPos,CombinePosSmall,SaveSpeed
 
+from ..Tools.Lazy import LazyImports
 
-from . import Messenger
-from . import Bepi
+#the spacecraft are only imported when they are first used
+LazyImports(__name__,{	'Messenger' : ('.Messenger',None),
+						'Bepi' : ('.Bepi',None)})
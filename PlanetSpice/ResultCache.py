@@ -0,0 +1,210 @@
+import numpy as np
+import hashlib
+import os
+import threading
+from . import Globals
+from . import KernelManager as KM
+from .DayStartET import GetET
+from .Tools.FileHash import FileHash
+
+#total size (bytes) of the cached results to keep
+MaxBytes = 2*1024**3
+
+#running total of the cache size (bytes) since it was last scanned, or
+#None if it hasn't been scanned yet
+_total = None
+_lock = threading.Lock()
+
+
+def _CachePath():
+	'''
+	Directory containing the cached results.
+
+	'''
+	return Globals.CachePath + 'Results/'
+
+def SetBudget(Bytes):
+	'''
+	Change the total size of cached results to keep, evicting the least
+	recently used results if necessary.
+
+	Inputs
+	======
+	Bytes : int
+		Maximum total size of the cache in bytes.
+
+	'''
+	global MaxBytes
+	MaxBytes = Bytes
+	Evict()
+
+def Evict(Bytes=None):
+	'''
+	Remove the least recently used results until the total size of the
+	cache is within the budget. This scans the cache directory, and
+	resets the running total of its size kept by Save.
+
+	Inputs
+	======
+	Bytes : int
+		Size to shrink the cache to, defaults to MaxBytes.
+
+	'''
+	global _total
+	if Bytes is None:
+		Bytes = MaxBytes
+	path = _CachePath()
+	if not os.path.isdir(path):
+		_total = 0
+		return
+
+	files = []
+	for f in os.listdir(path):
+		if f.endswith('.npy'):
+			try:
+				st = os.stat(path + f)
+				files.append((st.st_mtime_ns,st.st_size,path + f))
+			except OSError:
+				pass
+	files.sort()
+
+	total = np.sum([f[1] for f in files])
+	for mt,size,fname in files:
+		if total <= Bytes:
+			break
+		try:
+			os.remove(fname)
+		except OSError:
+			pass
+		total -= size
+	_total = total
+
+def Clear():
+	'''
+	Remove all cached results.
+
+	'''
+	Evict(0)
+
+def CacheKey(Name,Target,Frame,Kernels,et,Options=None):
+	'''
+	Create a key for a result from everything that it depends upon.
+
+	Inputs
+	======
+	Name : str
+		Name of the function producing the result.
+	Target : str
+		Target body.
+	Frame : str
+		Reference frame.
+	Kernels : list
+		Kernel file names used.
+	et : float64
+		Ephemeris times.
+	Options : dict
+		Any other keyword arguments affecting the result.
+
+	Returns
+	=======
+	key : str
+		Hexadecimal SHA1 hash.
+
+	'''
+	h = hashlib.sha1()
+	h.update('{:s}|{:s}|{:s}|{:s}'.format(Name,str(Target),Frame,repr(sorted((Options or {}).items()))).encode())
+	for k in KM.KernelList([Kernels]):
+		h.update(FileHash(k).encode())
+	et = np.ascontiguousarray(et,dtype='float64')
+	h.update(et.tobytes())
+	return h.hexdigest()
+
+def Load(key):
+	'''
+	Return a read-only memory-mapped cached result, or None if it does
+	not exist.
+
+	'''
+	fname = _CachePath() + key + '.npy'
+	try:
+		out = np.load(fname,mmap_mode='r')
+	except (OSError,ValueError):
+		return None
+
+	#mark it as recently used
+	try:
+		os.utime(fname)
+	except OSError:
+		pass
+	return out
+
+def Save(key,arr):
+	'''
+	Store a result in the cache, then evict old results if the cache
+	is over budget. The directory is only scanned the first time and
+	when the running total goes over budget.
+
+	'''
+	global _total
+	path = _CachePath()
+	fname = path + key + '.npy'
+	try:
+		if not os.path.isdir(path):
+			os.makedirs(path)
+		tmp = fname + '.{:d}.tmp'.format(os.getpid())
+		f = open(tmp,'wb')
+		np.save(f,arr)
+		size = f.tell()
+		f.close()
+		os.replace(tmp,fname)
+	except OSError:
+		return
+
+	with _lock:
+		if _total is None or _total + size > MaxBytes:
+			Evict()
+		else:
+			_total += size
+
+def CachedPos(Func,Date,ut,Target,Frame,Kernels,**kwargs):
+	'''
+	Call a position function, or return its cached result if it has
+	already been called with the same times and kernels.
+
+	Inputs
+	======
+	Func : callable
+		Function returning (x,y,z) for (Date,ut,Format=Format,**kwargs).
+	Date : int
+		Date(s) in format yyyymmdd.
+	ut : float
+		Time(s) in hours.
+	Target : str
+		Target body.
+	Frame : str
+		Reference frame.
+	Kernels : list
+		Kernel file names used by Func.
+	Format : str
+		Form of the times, if they are not dates and times (see
+		GetET). This is passed on to Func but is not part of the key,
+		as the key already contains the ephemeris times.
+
+	Returns
+	=======
+	x : float64
+	y : float64
+	z : float64
+		Positions - on a cache hit these are read-only views of the
+		memory-mapped cache file.
+
+	'''
+	Format = kwargs.pop('Format',None)
+	et = GetET(Date,ut,Format)
+	key = CacheKey(Func.__module__+'.'+Func.__name__,Target,Frame,Kernels,et,kwargs)
+	pos = Load(key)
+	if pos is None:
+		x,y,z = Func(Date,ut,Format=Format,**kwargs)
+		pos = np.array([x,y,z],dtype='float64')
+		Save(key,pos)
+	return (pos[0],pos[1],pos[2])
@@ -0,0 +1,244 @@
+import numpy as np
+import threading
+from .Tools.FileHash import FileHash
+from .Tools.Chebyshev import Clenshaw
+
+#NAIF ID codes of the bodies used in this package
+Bodies = {	'SOLAR SYSTEM BARYCENTER' : 0,
+			'SSB' : 0,
+			'MERCURY BARYCENTER' : 1,
+			'VENUS BARYCENTER' : 2,
+			'EARTH BARYCENTER' : 3,
+			'EARTH MOON BARYCENTER' : 3,
+			'MARS BARYCENTER' : 4,
+			'JUPITER BARYCENTER' : 5,
+			'SATURN BARYCENTER' : 6,
+			'URANUS BARYCENTER' : 7,
+			'NEPTUNE BARYCENTER' : 8,
+			'PLUTO BARYCENTER' : 9,
+			'SUN' : 10,
+			'MERCURY' : 199,
+			'VENUS' : 299,
+			'EARTH' : 399,
+			'MOON' : 301,
+			'MARS' : 499}
+
+#NAIF frame code of J2000
+_J2000 = 1
+
+#record length of a DAF file in doubles
+_RecLen = 128
+
+
+def BodyID(Body):
+	'''
+	Convert a body name or NAIF ID code to an integer ID code.
+
+	'''
+	if isinstance(Body,str):
+		b = Body.strip().upper()
+		if b in Bodies:
+			return Bodies[b]
+		return int(b)
+	return int(Body)
+
+
+class SPKFile(object):
+	'''
+	A memory-mapped SPK file containing type 2 and/or type 3 (Chebyshev)
+	segments. The segment summaries are read once when the object is
+	created, the coefficients are only read from the mapped pages when
+	they are needed, so multiple processes reading the same file share
+	the same pages.
+
+	'''
+	def __init__(self,fname):
+		'''
+		Inputs
+		======
+		fname : str
+			Name of the SPK file.
+
+		'''
+		self.fname = fname
+
+		#read the file record
+		f = open(fname,'rb')
+		rec = f.read(1024)
+		f.close()
+		if rec[:7] != b'DAF/SPK':
+			raise ValueError('Not an SPK file: '+fname)
+		fmt = rec[88:96]
+		if fmt == b'BIG-IEEE':
+			bo = '>'
+		elif fmt == b'LTL-IEEE':
+			bo = '<'
+		else:
+			raise ValueError('Unsupported DAF binary format in '+fname)
+		nd,ni = np.frombuffer(rec[8:16],dtype=bo+'i4')
+		fward = np.frombuffer(rec[76:80],dtype=bo+'i4')[0]
+
+		#map the whole file as doubles
+		self.data = np.memmap(fname,dtype=bo+'f8',mode='r')
+
+		#read the summaries, following the linked list of summary records
+		ns = nd + (ni + 1)//2
+		segs = []
+		r = fward
+		while r > 0:
+			srec = np.array(self.data[(r-1)*_RecLen:r*_RecLen])
+			nsum = np.int64(srec[2])
+			for i in range(nsum):
+				s = srec[3+i*ns:3+(i+1)*ns]
+				dc = s[:nd]
+				ic = s[nd:].view(bo+'i4')[:ni]
+				segs.append((dc[0],dc[1]) + tuple(np.int64(ic[:6])))
+			r = np.int64(srec[0])
+
+		#segment table: start, end, target, center, frame, type, start address, end address
+		self.Start = np.array([s[0] for s in segs])
+		self.End = np.array([s[1] for s in segs])
+		self.Target = np.array([s[2] for s in segs],dtype='int64')
+		self.Center = np.array([s[3] for s in segs],dtype='int64')
+		self.Frame = np.array([s[4] for s in segs],dtype='int64')
+		self.Type = np.array([s[5] for s in segs],dtype='int64')
+		self.Addr0 = np.array([s[6] for s in segs],dtype='int64')
+		self.Addr1 = np.array([s[7] for s in segs],dtype='int64')
+
+		#directory at the end of each segment: INIT, INTLEN, RSIZE, N
+		self.Init = np.zeros(self.Target.size)
+		self.IntLen = np.zeros(self.Target.size)
+		self.RSize = np.zeros(self.Target.size,dtype='int64')
+		self.NRec = np.zeros(self.Target.size,dtype='int64')
+		for i in range(self.Target.size):
+			if self.Type[i] in [2,3]:
+				d = self.data[self.Addr1[i]-4:self.Addr1[i]]
+				self.Init[i] = d[0]
+				self.IntLen[i] = d[1]
+				self.RSize[i] = np.int64(d[2])
+				self.NRec[i] = np.int64(d[3])
+
+	def Segments(self,Target):
+		'''
+		Indices of the segments for a target, highest priority first.
+
+		'''
+		return np.where(self.Target == Target)[0][::-1]
+
+	def Evaluate(self,seg,et):
+		'''
+		Evaluate the position (km) of a single segment's target relative
+		to its center at an array of ephemeris times.
+
+		Inputs
+		======
+		seg : int
+			Segment index.
+		et : float64
+			Ephemeris times within the segment.
+
+		Returns
+		=======
+		pos : float64
+			Positions, shape (n,3).
+
+		'''
+		if not self.Type[seg] in [2,3]:
+			raise ValueError('Unsupported SPK segment type {:d}'.format(self.Type[seg]))
+
+		#the records as a 2D view of the mapped data
+		rsize = self.RSize[seg]
+		nrec = self.NRec[seg]
+		a0 = self.Addr0[seg] - 1
+		records = self.data[a0:a0 + nrec*rsize].reshape((nrec,rsize))
+		ncomp = 3 if self.Type[seg] == 2 else 6
+		ncoef = (rsize - 2)//ncomp
+
+		#group the samples by record so each record is only read once
+		irec = np.int64(np.floor((et - self.Init[seg])/self.IntLen[seg]))
+		irec = np.clip(irec,0,nrec-1)
+		urec,inv = np.unique(irec,return_inverse=True)
+		rec = np.array(records[urec])
+		mid = rec[inv,0]
+		rad = rec[inv,1]
+		coef = rec[:,2:2 + 3*ncoef].reshape((urec.size,3,ncoef))
+
+		#Clenshaw recursion for all samples at once
+		return Clenshaw((et - mid)/rad,coef,inv)
+
+
+#SPK files which have already been opened
+_files = {}
+_lock = threading.Lock()
+
+def OpenSPK(fname):
+	'''
+	Return an SPKFile object for a file, which is only opened once per
+	process (or again if the file changes).
+
+	'''
+	key = FileHash(fname)
+	with _lock:
+		if not key in _files:
+			_files[key] = SPKFile(fname)
+		return _files[key]
+
+
+def _PosSSB(files,Target,et):
+	'''
+	Position of a target relative to the solar system barycenter,
+	following the chain of segment centers.
+
+	'''
+	pos = np.zeros((et.size,3))
+	if Target == 0:
+		return pos
+
+	#find the highest priority segment covering each sample (later
+	#files and later segments take priority, as in SPICE)
+	done = np.zeros(et.size,dtype='bool')
+	for spk in files[::-1]:
+		for seg in spk.Segments(Target):
+			if spk.Frame[seg] != _J2000:
+				continue
+			use = np.where((~done) & (et >= spk.Start[seg]) & (et <= spk.End[seg]))[0]
+			if use.size == 0:
+				continue
+			pos[use] = spk.Evaluate(seg,et[use]) + _PosSSB(files,spk.Center[seg],et[use])
+			done[use] = True
+			if done.all():
+				return pos
+
+	raise ValueError('Insufficient ephemeris data to compute the position of body {:d}'.format(Target))
+
+
+def SPKPos(Target,et,Observer,Kernels):
+	'''
+	Position of a target relative to an observer in the J2000 frame,
+	without light time corrections, i.e. the same as
+	spkpos(Target,et,'J2000','NONE',Observer), evaluated using NumPy
+	alone.
+
+	Inputs
+	======
+	Target : str or int
+		Name or NAIF ID code of the target body.
+	et : float64
+		Ephemeris time(s).
+	Observer : str or int
+		Name or NAIF ID code of the observing body.
+	Kernels : str or list of str
+		SPK file name(s), in the order that they would be furnished.
+
+	Returns
+	=======
+	pos : float64
+		Positions (km), shape (n,3).
+
+	'''
+	if isinstance(Kernels,str):
+		Kernels = [Kernels]
+	files = [OpenSPK(k) for k in Kernels]
+	et = np.array(et,dtype='float64').flatten()
+
+	return _PosSSB(files,BodyID(Target),et) - _PosSSB(files,BodyID(Observer),et)
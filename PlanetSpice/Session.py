@@ -0,0 +1,85 @@
+from . import KernelManager as KM
+
+#sets pinned by a session when no names are given
+DefaultSets = ['Sun','Mercury','Venus','Earth','Mars']
+
+class Session(object):
+	'''
+	Keeps a group of kernels furnished for the lifetime of the session,
+	so that calls to the position functions inside it do not need to
+	do any loading or unloading of kernels.
+
+	Usage
+	=====
+	with PlanetSpice.session('Mercury','Messenger',Date=Dates):
+		x,y,z = PlanetSpice.Mercury.PosHCI(Date,ut)
+		lon = PlanetSpice.Mercury.Messenger.CarringtonLongitude(Date,ut)
+
+	or
+
+	s = PlanetSpice.session('Earth')
+	...
+	s.Close()
+
+	'''
+	def __init__(self,*Sets,Date=None):
+		'''
+		Inputs
+		======
+		Sets : str
+			Names of kernel sets (e.g. 'Mercury','Messenger','Bepi',
+			'VEX') or kernel file names to keep loaded. If none are
+			given then the sets in DefaultSets are used.
+		Date : int
+			Date(s) in format yyyymmdd, used to select the date-
+			dependent kernels (e.g. MESSENGER CK or VEX SPK files).
+
+		'''
+		if len(Sets) == 0:
+			Sets = DefaultSets
+
+		self.Kernels = []
+		for s in Sets:
+			if KM.HasSet(s):
+				k = KM.GetSet(s,Date)
+			else:
+				k = KM.KernelList([s])
+			for kk in k:
+				if not kk in self.Kernels:
+					self.Kernels.append(kk)
+
+		self.Open = False
+		self.Start()
+
+	def Start(self):
+		'''
+		Pin the kernels.
+
+		'''
+		if not self.Open:
+			KM.Pin(self.Kernels)
+			self.Open = True
+
+	def Close(self):
+		'''
+		Unpin the kernels, leaving them to the kernel manager to evict.
+
+		'''
+		if self.Open:
+			KM.Unpin(self.Kernels)
+			self.Open = False
+
+	def __enter__(self):
+		self.Start()
+		return self
+
+	def __exit__(self,*args):
+		self.Close()
+
+	def __del__(self):
+		try:
+			self.Close()
+		except Exception:
+			pass
+
+session = Session
@@ -0,0 +1,191 @@
+import numpy as np
+import spiceypy as sp
+from .. import Globals
+from ..Tools.ReadTextKernel import ReadTextKernel
+from ..Tools.RotateVectors import RotateVectors
+from .. import KernelManager as KM
+
+pck_kernel = Globals.SpicePath + '/bodies/pck00010.tpc'
+hci_kernel = Globals.SpicePath + '/frames/tk/sunframes.tk'
+
+#constants already read from each PCK
+_pck = {}
+
+#HCI to J2000 matrices already calculated
+_hci = {}
+
+def ReadSunPCK(fname=pck_kernel):
+	'''
+	Read the orientation model of the Sun from a PCK. This is only 
+	read once for each file.
+	
+	Inputs
+	======
+	fname : str
+		Name of the PCK file.
+		
+	Returns
+	=======
+	pck : dict
+		Contains the polynomial coefficients 'POLE_RA', 'POLE_DEC' 
+		(degrees, degrees/century...) and 'PM' (degrees, degrees/day...)
+	
+	'''
+	if not fname in _pck:
+		tk = ReadTextKernel(fname)
+		_pck[fname] = {	'POLE_RA' : np.array(tk['BODY10_POLE_RA'],dtype='float64'),
+						'POLE_DEC' : np.array(tk['BODY10_POLE_DEC'],dtype='float64'),
+						'PM' : np.array(tk['BODY10_PM'],dtype='float64')}
+	return _pck[fname]
+
+def _Poly(c,t):
+	'''
+	Evaluate the PCK polynomial c at t.
+	
+	'''
+	out = np.zeros(t.shape,dtype='float64')
+	for i in range(c.size-1,-1,-1):
+		out = out*t + c[i]
+	return out
+
+def SunOrientation(et,fname=pck_kernel):
+	'''
+	Calculate the right ascension and declination of the Sun's pole
+	and the angle of the prime meridian, from the PCK constants.
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time(s)
+	fname : str
+		Name of the PCK file.
+		
+	Returns
+	=======
+	ra : float64
+		Right ascension of the pole (radians)
+	dec : float64
+		Declination of the pole (radians)
+	w : float64
+		Prime meridian angle (radians)
+	
+	'''
+	pck = ReadSunPCK(fname)
+	et = np.array(et,dtype='float64').flatten()
+	d = et/86400.0
+	T = d/36525.0
+	
+	ra = np.radians(_Poly(pck['POLE_RA'],T))
+	dec = np.radians(_Poly(pck['POLE_DEC'],T))
+	w = np.radians(np.mod(_Poly(pck['PM'],d),360.0))
+	
+	return ra,dec,w
+
+def IAU_SUNMatrices(et,fname=pck_kernel):
+	'''
+	Calculate the matrices which rotate from J2000 to IAU_SUN, as 
+	sp.pxform('J2000','IAU_SUN',et) would, i.e. R3(w).R1(pi/2-dec).R3(pi/2+ra).
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time(s)
+	fname : str
+		Name of the PCK file.
+		
+	Returns
+	=======
+	rot : float64
+		Rotation matrices, shape (n,3,3)
+	
+	'''
+	ra,dec,w = SunOrientation(et,fname)
+	n = ra.size
+	
+	#the three rotation angles
+	a = np.pi/2 + ra
+	b = np.pi/2 - dec
+	ca,sa = np.cos(a),np.sin(a)
+	cb,sb = np.cos(b),np.sin(b)
+	cw,sw = np.cos(w),np.sin(w)
+	
+	rot = np.zeros((n,3,3),dtype='float64')
+	rot[:,0,0] = cw*ca - sw*cb*sa
+	rot[:,0,1] = cw*sa + sw*cb*ca
+	rot[:,0,2] = sw*sb
+	rot[:,1,0] = -sw*ca - cw*cb*sa
+	rot[:,1,1] = -sw*sa + cw*cb*ca
+	rot[:,1,2] = cw*sb
+	rot[:,2,0] = sb*sa
+	rot[:,2,1] = -sb*ca
+	rot[:,2,2] = cb
+	
+	return rot
+
+def HCItoJ2000Matrix(et=0.0):
+	'''
+	The matrix which rotates HCI to J2000. The Sun's pole has no rates
+	in the PCK, so HCI is an inertial frame and a single matrix is 
+	used for all times. The frame kernel defining HCI is only loaded
+	the first time, after that the matrix is reused.
+	
+	'''
+	if not et in _hci:
+		with KM.Use(pck_kernel,hci_kernel):
+			_hci[et] = sp.pxform('HCI','J2000',et)
+	return _hci[et].copy()
+	
+def J2000toIAU_SUN(et,xi,yi,zi,fname=pck_kernel):
+	'''
+	Rotate vectors from J2000 to IAU_SUN.
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time(s)
+	xi : float
+		x components of the vectors.
+	yi : float
+		y components of the vectors.
+	zi : float
+		z components of the vectors.
+	fname : str
+		Name of the PCK file.
+		
+	Returns
+	=======
+	x : float64
+		IAU_SUN x components.
+	y : float64
+		IAU_SUN y components.
+	z : float64
+		IAU_SUN z components.
+	
+	'''
+	return RotateVectors(IAU_SUNMatrices(et,fname),xi,yi,zi)
+
+def CarringtonLon(et,xi,yi,zi,fname=pck_kernel):
+	'''
+	Calculate the Carrington longitude of J2000 vectors.
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time(s)
+	xi : float
+		J2000 x components of the vectors.
+	yi : float
+		J2000 y components of the vectors.
+	zi : float
+		J2000 z components of the vectors.
+	fname : str
+		Name of the PCK file.
+		
+	Returns
+	=======
+	lon : float64
+		Longitude (radians)
+	
+	'''
+	x,y,z = J2000toIAU_SUN(et,xi,yi,zi,fname)
+	return np.arctan2(y,x)
@@ -1,15 +1,26 @@
 import numpy as np
-import DateTimeTools as TT
-from .Transform import HCItoIAU_SUN
+import os
 from .. import Globals
-from ..Tools.ContUT import ContUT
-import PyFileIO as pf
+from ..utc2et import utc2et
+from ..et2dateut import et2dateut
+from ..Tools.ListDates import ListDates
+from ..Tools.FindCrossings import FindCrossings
+from .IAU_SUN import IAU_SUNMatrices,HCItoJ2000Matrix
+from .Transform import pck_kernel
 
 dtype=[	('Date','int32'),
 		('ut','float32'),
 		('utc','float64')]
 
 
+def _HCILon(et):
+	'''
+	Longitude (radians) in IAU_SUN of the HCI x-axis.
+	
+	'''
+	rot = IAU_SUNMatrices(et,pck_kernel) @ HCItoJ2000Matrix()
+	return np.arctan2(rot[:,1,0],rot[:,0,0])
+	
 def SaveSolarRotations(Date0=19500101,Date1=20500101):
 	'''
 	List all of the times when the Sun has completed a full rotation
@@ -19,28 +30,15 @@ def SaveSolarRotations(Date0=19500101,Date1=20500101):
 	Dates = ListDates(Date0,Date1)
 	nd = Dates.size	
 	
-	#some temporary arrays
-	ut = np.zeros(nd,dtype='float32')
-	x = np.zeros(nd,dtype='float32')+1.496e8
-	y = np.zeros(nd,dtype='float32')
-	z = np.zeros(nd,dtype='float32')
-	
-	#convert coordinates
-	nx,ny,nz = HCItoIAU_SUN(Dates,ut,x,y,z)
-	
-	#calculate longitude
-	lon = np.arctan2(ny,nx)*180.0/np.pi
+	#find the crossings, sampling once per day (HCItoJ2000Matrix loads
+	#the HCI frame kernel itself the first time it is needed)
+	et0 = utc2et(Dates[0],0.0)
+	ets = FindCrossings(_HCILon,et0,et0 + (nd-1)*86400.0,86400.0,Direction=-1,Wrap=2*np.pi)
 	
-	#find the crossings and interpolate
-	use0 = np.where((lon[:-1] >= 0.0) & (lon[1:] < 0.0))[0]
-	use1 = use0 + 1
-	n = np.size(use0)
+	#convert to dates and times
+	n = np.size(ets)
 	out = np.recarray(n,dtype=dtype)
-	out.Date = Dates[use0]
-	m = (lon[use1]-lon[use0])/24.0
-	c = lon[use0]
-	out.ut = -c/m
-	out.utc = ContUT(out.Date,out,ut)
+	out.Date,out.ut,out.utc = et2dateut(ets)
 	
 	#save
 	outpath = Globals.OutputPath + 'Sun/'
@@ -48,7 +46,8 @@ def SaveSolarRotations(Date0=19500101,Date1=20500101):
 		os.system('mkdir -pv '+outpath)
 	fname = outpath + '/SunRotations.dat'
 	
-	pf.WriteASCIIData(fname,data)
+	import PyFileIO as pf
+	pf.WriteASCIIData(fname,out)
 
 def ReadSolarRotations():
 	'''
@@ -59,4 +58,5 @@ def ReadSolarRotations():
 	path = Globals.OutputPath + 'Sun/'
 	fname = path + '/SunRotations.dat'
 	
+	import PyFileIO as pf
 	return pf.ReadASCIIData(fname,dtype=dtype)
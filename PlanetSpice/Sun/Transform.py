@@ -1,116 +1,156 @@
 import numpy as np
 import spiceypy as sp
-from ..utc2et import utc2et
-import DateTimeTools as TT
+from ..DayStartET import GetET
+from ..Tools.RotateVectors import RotateVectors
+from .IAU_SUN import IAU_SUNMatrices,HCItoJ2000Matrix
 import os
 from .. import Globals
+from .. import KernelManager as KM
 
 lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
 spk_kernel = Globals.SpicePath + '/bodies/de432s.bsp'
 pck_kernel = Globals.SpicePath + '/bodies/pck00010.tpc'
 hci_kernel = Globals.SpicePath + '/frames/tk/sunframes.tk'
+KM.RegisterSet('Sun',[lsk_path,spk_kernel,pck_kernel,hci_kernel])
 
-def HCItoIAU_SUN(Date,ut,xi,yi,zi):
+def RotationMatrices(FromFrame,ToFrame,et,Step=None):
 	'''
-	Convert from HCI to IAU_SUN coordinates
+	Get the matrices which rotate vectors from one frame to another for
+	an array of ephemeris times. sp.pxform is only called once for each
+	unique epoch.
+	
+	Inputs
+	======
+	FromFrame : str
+		Name of the frame to rotate from.
+	ToFrame : str
+		Name of the frame to rotate to.
+	et : float64
+		Ephemeris time(s).
+	Step : float
+		If set, the matrices are only calculated every Step seconds
+		and are linearly interpolated in between. This is only suitable 
+		for frames which rotate slowly with respect to each other (e.g. 
+		the precession of ECLIPDATE with respect to HCI, where a step of
+		10 days gives relative errors of ~1e-11).
+		
+	Returns
+	=======
+	rot : float64
+		Array of rotation matrices with the shape (n,3,3). If all of 
+		the epochs are the same then this is a read-only view of a 
+		single matrix.
+	
 	'''
+	et = np.array(et,dtype='float64').flatten()
+	n = et.size
 	
-	#create some arrays
-	n = np.size(xi)
-
-	if np.size(ut) == 1:
-		ut = np.zeros(n,dtype='float32') + ut
-	if np.size(xi) == 1:
-		xi = np.array([xi])
-		yi = np.array([yi])
-		zi = np.array([zi])
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	#only calculate each unique matrix once
+	uet,inv = np.unique(et,return_inverse=True)
+	nu = uet.size
+	
+	#or calculate them on a coarser grid
+	if not Step is None and nu > 1:
+		ng = np.int64(np.ceil((uet[-1] - uet[0])/Step)) + 1
+		if ng < nu:
+			get = uet[0] + np.arange(ng)*Step
+			grot = np.zeros((ng,3,3),dtype='float64')
+			for i in range(0,ng):
+				grot[i] = sp.pxform(FromFrame,ToFrame,get[i])
+			rot = np.zeros((n,3,3),dtype='float64')
+			for i in range(0,3):
+				for j in range(0,3):
+					rot[:,i,j] = np.interp(et,get,grot[:,i,j])
+			return rot
+	
+	rot = np.zeros((nu,3,3),dtype='float64')
+	for i in range(0,nu):
+		rot[i] = sp.pxform(FromFrame,ToFrame,uet[i])
+	
+	if nu == 1:
+		return np.broadcast_to(rot,(n,3,3))
+	else:
+		return rot[inv]
 
-	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(hci_kernel)
+def TransformFrame(FromFrame,ToFrame,et,xi,yi,zi,Step=None):
+	'''
+	Rotate vectors from one frame to another at an array of ephemeris 
+	times, using a single matrix multiplication. The kernels needed by
+	the frames should already be loaded.
+	
+	Inputs
+	======
+	FromFrame : str
+		Name of the frame to rotate from.
+	ToFrame : str
+		Name of the frame to rotate to.
+	et : float64
+		Ephemeris time(s).
+	xi : float
+		x components of the vectors.
+	yi : float
+		y components of the vectors.
+	zi : float
+		z components of the vectors.
+	Step : float
+		See RotationMatrices.
+		
+	Returns
+	=======
+	x : float64
+		Rotated x components.
+	y : float64
+		Rotated y components.
+	z : float64
+		Rotated z components.
+	
+	'''
+	rot = RotationMatrices(FromFrame,ToFrame,et,Step)
+	return RotateVectors(rot,xi,yi,zi)
 
+def HCItoIAU_SUN(Date,ut,xi,yi,zi,Format=None):
+	'''
+	Convert from HCI to IAU_SUN coordinates. The times can be given in
+	any of the forms accepted by GetET.
+	
+	'''
 
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
+	#get the ephemeris times, matching the vectors
+	et = GetET(Date,ut,Format)
+	if et.size == 1:
+		et = np.zeros(np.size(xi)) + et
 
-	#transform coords
-	for i in range(0,n):
-		rot = sp.pxform('HCI','IAU_SUN',et[i])
-		x[i],y[i],z[i] = np.sum(rot*np.array([xi[i],yi[i],zi[i]]),axis=1)
-		
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(hci_kernel)
+	#transform coords - HCI to J2000 is fixed (and only needs the
+	#kernels the first time) and J2000 to IAU_SUN is calculated 
+	#directly from the PCK constants, so no kernels are loaded here
+	rot = IAU_SUNMatrices(et,pck_kernel) @ HCItoJ2000Matrix()
+	x,y,z = RotateVectors(rot,xi,yi,zi)
 
 	return (x,y,z)
 
 
 
-def HAEtoHCI(Date,ut,xi,yi,zi):
+def HAEtoHCI(Date,ut,xi,yi,zi,Format=None,Step=None):
 	'''
-	Convert HAE to HCI coordinates
+	Convert HAE to HCI coordinates. The times can be given in any of 
+	the forms accepted by GetET.
+
+	ECLIPDATE only precesses slowly, so for long time series the
+	matrices can be interpolated from values every Step seconds (e.g.
+	Step=864000.0 for 10 days, see RotationMatrices), otherwise they are
+	calculated exactly for each unique epoch.
 	
 	'''
-	
-	
-	
-	#create some arrays
-	n = np.size(xi)
-
-	if np.size(ut) == 1:
-		ut = np.zeros(n,dtype='float32') + ut
-	if np.size(xi) == 1:
-		xi = np.array([xi])
-		yi = np.array([yi])
-		zi = np.array([zi])
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
 
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(hci_kernel)
-	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-
-	
-	for i in range(0,n):
-		rot = sp.pxform('ECLIPDATE','HCI',et[i])
-		x[i],y[i],z[i] = np.sum(rot*np.array([xi[i],yi[i],zi[i]]),axis=1)
-		
-	#free kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	sp.unload(pck_kernel)
-	sp.unload(hci_kernel)
+	with KM.Use(lsk_path,spk_kernel,pck_kernel,hci_kernel):
+		#get the ephemeris times, matching the vectors
+		et = GetET(Date,ut,Format)
+		if et.size == 1:
+			et = np.zeros(np.size(xi)) + et
+
+		#transform coords
+		x,y,z = TransformFrame('ECLIPDATE','HCI',et,xi,yi,zi,Step)
 
 	return (x,y,z)
 
@@ -1,2 +1,3 @@
-from .Transform import HCItoIAU_SUN,HAEtoHCI
+from .Transform import HCItoIAU_SUN,HAEtoHCI,RotationMatrices,RotateVectors,TransformFrame
 from .SunRotations import SaveSolarRotations,ReadSolarRotations
+from .IAU_SUN import IAU_SUNMatrices,J2000toIAU_SUN,CarringtonLon,SunOrientation
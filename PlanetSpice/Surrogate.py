@@ -0,0 +1,245 @@
+import numpy as np
+import spiceypy as sp
+import hashlib
+import os
+import threading
+from . import Globals
+from . import KernelManager as KM
+from .et2dateut import et2dateut
+from .Tools.ListDates import ListDates
+from .Tools.FileHash import FileHash
+from .Tools.Chebyshev import Clenshaw,ChebyshevNodes,ChebyshevFit
+
+#length (s) of each block of time which is fitted and cached separately
+BlockLen = 30*86400.0
+
+#surrogates which have already been loaded, keyed by the cache file name
+_blocks = {}
+_lock = threading.Lock()
+
+
+def _Coverage(kernels,Target,t0,t1):
+	'''
+	List the intervals between t0 and t1 which are covered for Target
+	by any of the SPK files in kernels (which should be loaded).
+
+	'''
+	code = sp.bods2c(Target)
+	iv = []
+	for k in kernels:
+		if k.lower().endswith('.bsp'):
+			cov = sp.spkcov(k,code)
+			for i in range(sp.wncard(cov)):
+				a,b = sp.wnfetd(cov,i)
+				if b > t0 and a < t1:
+					iv.append([max(a,t0),min(b,t1)])
+
+	#merge overlapping intervals
+	iv.sort()
+	out = []
+	for a,b in iv:
+		if len(out) > 0 and a <= out[-1][1]:
+			out[-1][1] = max(out[-1][1],b)
+		else:
+			out.append([a,b])
+	return out
+
+def _Fit(Func,t0,t1,Degree,Tol,MaxSplit):
+	'''
+	Fit Chebyshev series to Func on the intervals t0 to t1, splitting
+	any intervals where the error at the Chebyshev extrema (which
+	include the ends of each interval) is larger than Tol. Intervals
+	which still miss Tol after MaxSplit splits are returned with NaN
+	coefficients, so that they are evaluated exactly instead.
+
+	'''
+	x = ChebyshevNodes(Degree)
+	xc = np.cos(np.pi*np.arange(Degree + 2)/(Degree + 1))
+	nx = x.size
+
+	T0 = []
+	T1 = []
+	C = []
+	for i in range(MaxSplit+1):
+		#sample every interval at once
+		mid = 0.5*(t0 + t1)
+		rad = 0.5*(t1 - t0)
+		ts = mid[:,None] + rad[:,None]*np.append(x,xc)[None,:]
+		f = Func(ts.flatten()).reshape(ts.shape + (-1,))
+
+		#fit and check
+		coef = ChebyshevFit(np.swapaxes(f[:,:nx],1,2))
+		nc = xc.size
+		fc = Clenshaw(np.tile(xc,t0.size),coef,np.repeat(np.arange(t0.size),nc))
+		err = np.sqrt(np.sum((fc - f[:,nx:].reshape((-1,f.shape[2])))**2,axis=1))
+		err = err.reshape((t0.size,nc)).max(axis=1)
+		good = err <= Tol
+		if i == MaxSplit:
+			coef[~good] = np.nan
+			good[:] = True
+		T0.append(t0[good])
+		T1.append(t1[good])
+		C.append(coef[good])
+
+		#split the rest in half
+		bad = ~good
+		if not bad.any():
+			break
+		t0,t1 = np.append(t0[bad],mid[bad]),np.append(mid[bad],t1[bad])
+
+	T0 = np.concatenate(T0)
+	srt = np.argsort(T0)
+	return T0[srt],np.concatenate(T1)[srt],np.concatenate(C)[srt]
+
+def _Key(Target,Frame,Center,kernels,block,Degree,Tol,Interval):
+	'''
+	Unique name for a surrogate block, from the kernel hashes and the
+	fitting parameters.
+
+	'''
+	h = hashlib.sha1()
+	s = '{:s}|{:s}|{:s}|{:d}|{:d}|{:.6e}|{:.6e}'.format(str(Target),Frame,str(Center),block,Degree,Tol,Interval)
+	h.update(s.encode())
+	for k in kernels:
+		h.update(FileHash(k).encode())
+	return h.hexdigest()
+
+def _BlockKernels(Kernels,block):
+	'''
+	List the kernels needed for a single block of time.
+
+	'''
+	if callable(Kernels):
+		t0 = block*BlockLen
+		Date,ut,utc = et2dateut(np.array([t0,t0 + BlockLen]))
+		return KM.KernelList([Kernels(ListDates(Date[0],Date[1]))])
+	else:
+		return KM.KernelList([Kernels])
+
+def _Block(Target,Frame,Center,Kernels,block,Degree,Tol,Interval,MaxSplit):
+	'''
+	Load or create the surrogate for a single block of time.
+
+	'''
+	t0 = block*BlockLen
+	t1 = t0 + BlockLen
+	kernels = _BlockKernels(Kernels,block)
+
+	key = _Key(Target,Frame,Center,kernels,block,Degree,Tol,Interval)
+	cname = Globals.CachePath + 'Surrogate/{:s}.npz'.format(key)
+	with _lock:
+		if cname in _blocks:
+			return _blocks[cname]
+
+	if os.path.isfile(cname):
+		with np.load(cname) as f:
+			out = (f['t0'],f['t1'],f['coef'])
+	else:
+		KM.Furnsh(kernels)
+		try:
+			def Func(et):
+				pos,lt = sp.spkpos(Target,et,Frame,'NONE',Center)
+				return np.array(pos)
+
+			#split the covered parts of the block into intervals
+			ta = []
+			tb = []
+			for a,b in _Coverage(kernels,Target,t0,t1):
+				n = np.int64(np.ceil((b - a)/Interval))
+				e = np.linspace(a,b,n + 1)
+				ta.append(e[:-1])
+				tb.append(e[1:])
+			if len(ta) > 0:
+				out = _Fit(Func,np.concatenate(ta),np.concatenate(tb),Degree,Tol,MaxSplit)
+			else:
+				out = (np.zeros(0),np.zeros(0),np.zeros((0,3,Degree+1)))
+		finally:
+			KM.Unload(kernels)
+
+		#save it for next time (via a temporary file so that other
+		#processes never see a partial file)
+		try:
+			if not os.path.isdir(os.path.dirname(cname)):
+				os.makedirs(os.path.dirname(cname))
+			tmp = cname + '.{:d}.tmp'.format(os.getpid())
+			f = open(tmp,'wb')
+			np.savez(f,t0=out[0],t1=out[1],coef=out[2])
+			f.close()
+			os.replace(tmp,cname)
+		except OSError:
+			pass
+
+	with _lock:
+		_blocks[cname] = out
+	return out
+
+def SurrogatePos(Target,et,Frame,Center,Kernels,Degree=15,Tol=1e-3,
+				Interval=3600.0,MaxSplit=8):
+	'''
+	Position of a target from a cache of Chebyshev fits to its SPK
+	trajectory, which is built the first time that each 30 day block
+	is needed and stored in Globals.CachePath + 'Surrogate/', keyed by
+	the hashes of the kernels used. Evaluating the fits is much faster
+	than calling spkpos for dense time series.
+
+	Inputs
+	======
+	Target : str
+		Name of the target, e.g. 'MESSENGER'.
+	et : float64
+		Ephemeris time(s).
+	Frame : str
+		Name of the reference frame.
+	Center : str
+		Name of the observing body.
+	Kernels : list or callable
+		Kernel file names needed by spkpos, or a function which
+		accepts an array of dates (yyyymmdd) and returns them.
+	Degree : int
+		Degree of the Chebyshev series.
+	Tol : float
+		Maximum position error (km), intervals are halved until this is
+		met (up to MaxSplit times). Any intervals where it still isn't
+		met are evaluated using spkpos instead of the fit.
+	Interval : float
+		Initial length (s) of each fitted interval.
+	MaxSplit : int
+		Maximum number of times an interval can be halved.
+
+	Returns
+	=======
+	pos : float64
+		Positions (km), shape (n,3). Times outside of the SPK coverage
+		are filled with NaN.
+
+	'''
+	et = np.array(et,dtype='float64').flatten()
+	pos = np.zeros((et.size,3)) + np.nan
+
+	blocks = np.int64(np.floor(et/BlockLen))
+	for b in np.unique(blocks):
+		use = np.where(blocks == b)[0]
+		t0,t1,coef = _Block(Target,Frame,Center,Kernels,b,Degree,Tol,Interval,MaxSplit)
+		if t0.size == 0:
+			continue
+
+		#find the interval containing each sample
+		i = np.clip(np.searchsorted(t0,et[use],side='right') - 1,0,t0.size-1)
+		good = (et[use] >= t0[i]) & (et[use] <= t1[i])
+		use = use[good]
+		i = i[good]
+
+		#intervals which couldn't be fitted within Tol
+		exact = np.isnan(coef[i,0,0])
+		if exact.any():
+			with KM.Use(_BlockKernels(Kernels,b)):
+				p,lt = sp.spkpos(Target,et[use[exact]],Frame,'NONE',Center)
+			pos[use[exact]] = np.array(p)
+			use = use[~exact]
+			i = i[~exact]
+
+		mid = 0.5*(t0[i] + t1[i])
+		rad = 0.5*(t1[i] - t0[i])
+		pos[use] = Clenshaw((et[use] - mid)/rad,coef,i)
+
+	return pos
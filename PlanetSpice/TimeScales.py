@@ -0,0 +1,203 @@
+'''
+Vectorised conversions between UTC, TAI, TDT and TDB (ephemeris time)
+using the contents of the LSK, without needing any SPICE kernels to be
+furnished. All of the continuous time scales are in seconds past J2000,
+as they are in SPICE.
+
+These use the same formulae as SPICE, so:
+	UTCtoET agrees with sp.str2et to better than 1 microsecond;
+	ETtoUTC agrees with sp.et2utc to better than 1 microsecond (beyond
+		the number of decimal places requested from sp.et2utc);
+	ETtoTAI(TAItoET(tai)) returns tai to within 1e-9 s.
+Before the first leap second (1972-01-01), TAI - UTC is fixed at one 
+second less than the first value in the LSK, as it is in SPICE.
+
+'''
+
+import numpy as np
+from . import Globals
+from .LeapSeconds import ReadLSK
+from .Tools.CivilDays import DateToDays
+
+lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
+
+def _DeltaAT(lsk,days):
+	'''
+	TAI - UTC (s) for days since 2000-01-01.
+	
+	'''
+	i = np.searchsorted(lsk['LeapDays'],days,side='right') - 1
+	return np.where(i >= 0,lsk['DeltaAT'][np.clip(i,0,None)],lsk['DeltaAT'][0] - 1.0)
+
+def _LeapTAI(lsk):
+	'''
+	TAI at the start of each day where TAI - UTC changes.
+	
+	'''
+	return lsk['LeapDays']*86400.0 - 43200.0 + lsk['DeltaAT']
+	
+def UTCtoTAI(Date,ut,lsk_path=lsk_path):
+	'''
+	Convert UTC dates and times to TAI.
+	
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd
+	ut : float
+		Time(s) in hours from beginning of the day
+	lsk_path : str
+		LSK file to use
+		
+	Returns
+	=======
+	tai : float64
+		TAI seconds past J2000
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	Date,ut = np.broadcast_arrays(np.array(Date,dtype='int64'),np.array(ut,dtype='float64'))
+	days = DateToDays(Date)
+	
+	#add the small terms first to keep the precision
+	return (ut*3600.0 + _DeltaAT(lsk,days)) + (days*86400.0 - 43200.0)
+
+def TAItoUTC(tai,lsk_path=lsk_path):
+	'''
+	Convert TAI to UTC dates and times. During a leap second, ut will
+	be between 24.0 and 24.0 + 1/3600 hours on the day before the leap
+	second takes effect.
+	
+	Inputs
+	======
+	tai : float64
+		TAI seconds past J2000
+	lsk_path : str
+		LSK file to use
+		
+	Returns
+	=======
+	days : int64
+		Number of days since 2000-01-01
+	sec : float64
+		Seconds since the start of the day
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	tai = np.array(tai,dtype='float64')
+	
+	#find TAI - UTC
+	ltai = _LeapTAI(lsk)
+	i = np.searchsorted(ltai,tai,side='right') - 1
+	dat = np.where(i >= 0,lsk['DeltaAT'][np.clip(i,0,None)],lsk['DeltaAT'][0] - 1.0)
+	
+	#split into days and seconds
+	utc = tai - dat + 43200.0
+	days = np.floor(utc/86400.0).astype('int64')
+	sec = utc - days*86400.0
+	
+	#times within a leap second belong at the end of the previous day
+	j = np.clip(i + 1,0,ltai.size - 1)
+	leap = (i + 1 < ltai.size) & (tai >= ltai[j] - 1.0) & (tai < ltai[j])
+	days = np.where(leap,days - 1,days)
+	sec = np.where(leap,sec + 86400.0,sec)
+	
+	return days,sec
+
+def TAItoTDT(tai,lsk_path=lsk_path):
+	'''
+	Convert TAI to TDT (TT), both in seconds past J2000.
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	return np.array(tai,dtype='float64') + lsk['DELTA_T_A']
+
+def TDTtoTAI(tdt,lsk_path=lsk_path):
+	'''
+	Convert TDT (TT) to TAI, both in seconds past J2000.
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	return np.array(tdt,dtype='float64') - lsk['DELTA_T_A']
+
+def TDTtoTDB(tdt,lsk_path=lsk_path):
+	'''
+	Convert TDT (TT) to TDB (ET) by adding the periodic term
+	K*sin(E), where E = M + EB*sin(M) and M = M0 + M1*tdt.
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	tdt = np.array(tdt,dtype='float64')
+	M = lsk['M'][0] + lsk['M'][1]*tdt
+	E = M + lsk['EB']*np.sin(M)
+	return tdt + lsk['K']*np.sin(E)
+
+def TDBtoTDT(et,lsk_path=lsk_path):
+	'''
+	Convert TDB (ET) to TDT (TT), iterating on the periodic term.
+	
+	'''
+	lsk = ReadLSK(lsk_path)
+	et = np.array(et,dtype='float64')
+	tdt = np.copy(et)
+	for i in range(0,3):
+		M = lsk['M'][0] + lsk['M'][1]*tdt
+		E = M + lsk['EB']*np.sin(M)
+		tdt = et - lsk['K']*np.sin(E)
+	return tdt
+
+def TAItoET(tai,lsk_path=lsk_path):
+	'''
+	Convert TAI to ephemeris time (TDB), both in seconds past J2000.
+	
+	'''
+	return TDTtoTDB(TAItoTDT(tai,lsk_path),lsk_path)
+
+def ETtoTAI(et,lsk_path=lsk_path):
+	'''
+	Convert ephemeris time (TDB) to TAI, both in seconds past J2000.
+	
+	'''
+	return TDTtoTAI(TDBtoTDT(et,lsk_path),lsk_path)
+
+def UTCtoET(Date,ut,lsk_path=lsk_path):
+	'''
+	Convert UTC dates and times to ephemeris time.
+	
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd
+	ut : float
+		Time(s) in hours from beginning of the day
+	lsk_path : str
+		LSK file to use
+		
+	Returns
+	=======
+	et : float64
+		Ephemeris time (TDB seconds past J2000)
+	
+	'''
+	return TAItoET(UTCtoTAI(Date,ut,lsk_path),lsk_path)
+
+def ETtoUTC(et,lsk_path=lsk_path):
+	'''
+	Convert ephemeris time to UTC.
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time (TDB seconds past J2000)
+	lsk_path : str
+		LSK file to use
+		
+	Returns
+	=======
+	days : int64
+		Number of days since 2000-01-01
+	sec : float64
+		Seconds since the start of the day
+	
+	'''
+	return TAItoUTC(ETtoTAI(et,lsk_path),lsk_path)
@@ -0,0 +1,188 @@
+import numpy as np
+import os
+from .CivilDays import DateToDays,DaysToDate
+
+#number of day slots in each yearly file
+_DaysPerYear = 366
+
+class Archive(object):
+	'''
+	A columnar archive of daily data, with one directory per year which
+	contains a raw binary file for each field and an index of the
+	number of records stored for each day. Every day has a fixed slot
+	of RowsPerDay records within the yearly files, so any range of
+	dates can be read with a single seek per field per year, and each
+	field can be memory-mapped on its own.
+
+	Layout
+	======
+	Path/yyyy/<field>.bin : RowsPerDay*366 records of the field
+	Path/yyyy/index.bin : int32 number of records stored on each day
+		of the year (0 where the day is missing)
+
+	'''
+	def __init__(self,Path,dtype,RowsPerDay):
+		'''
+		Inputs
+		======
+		Path : str
+			Directory containing the archive.
+		dtype : list
+			numpy dtype of the records, which must include a 'Date'
+			field (yyyymmdd).
+		RowsPerDay : int
+			Maximum number of records per day.
+
+		'''
+		self.Path = Path
+		self.dtype = np.dtype(dtype)
+		self.RowsPerDay = RowsPerDay
+
+	def _YearPath(self,Year):
+		return self.Path + '/{:04d}/'.format(Year)
+
+	def _Slot(self,Date):
+		'''
+		Day of the year (from 0) of each date.
+
+		'''
+		Date = np.asarray(Date)
+		return DateToDays(Date) - DateToDays((Date//10000)*10000 + 101)
+
+	def Create(self,Years):
+		'''
+		Make sure that the files for each year exist and have the full
+		size. This should be done before writing from several processes
+		at once.
+
+		'''
+		for yr in np.unique(Years):
+			path = self._YearPath(yr)
+			if not os.path.isdir(path):
+				os.makedirs(path,exist_ok=True)
+			n = _DaysPerYear*self.RowsPerDay
+			for name in self.dtype.names:
+				fname = path + name + '.bin'
+				size = n*self.dtype[name].itemsize
+				if not os.path.isfile(fname) or os.path.getsize(fname) < size:
+					f = open(fname,'ab')
+					f.truncate(size)
+					f.close()
+			fname = path + 'index.bin'
+			if not os.path.isfile(fname):
+				np.zeros(_DaysPerYear,dtype='int32').tofile(fname)
+
+	def _Map(self,Year,Name,Mode='r'):
+		'''
+		Memory-map the file of a single field for one year.
+
+		'''
+		if Name == 'index':
+			dt = np.dtype('int32')
+		else:
+			dt = self.dtype[Name]
+		return np.memmap(self._YearPath(Year) + Name + '.bin',dtype=dt,mode=Mode)
+
+	def Write(self,data):
+		'''
+		Store records in the archive, replacing any already stored on
+		the same dates. The index for each date is only updated after
+		its records have been written.
+
+		Inputs
+		======
+		data : numpy.recarray
+			Records to store, sorted by date.
+
+		'''
+		ud,i0,cnt = np.unique(data.Date,return_index=True,return_counts=True)
+		if np.any(cnt > self.RowsPerDay):
+			raise ValueError('Too many records on a single day')
+		years = ud//10000
+		self.Create(years)
+		slots = self._Slot(ud)
+		R = self.RowsPerDay
+
+		for yr in np.unique(years):
+			use = np.where(years == yr)[0]
+
+			#rows within the yearly files and within data
+			fr = np.concatenate([slots[i]*R + np.arange(cnt[i]) for i in use])
+			dr = np.concatenate([i0[i] + np.arange(cnt[i]) for i in use])
+
+			for name in self.dtype.names:
+				m = self._Map(yr,name,'r+')
+				m[fr] = data[name][dr]
+				m.flush()
+				del m
+
+			idx = self._Map(yr,'index','r+')
+			idx[slots[use]] = cnt[use]
+			idx.flush()
+			del idx
+
+	def Read(self,Date0,Date1,Fields=None):
+		'''
+		Read the records stored between two dates.
+
+		Inputs
+		======
+		Date0 : int
+			Start date, format yyyymmdd.
+		Date1 : int
+			End date (inclusive), format yyyymmdd.
+		Fields : list
+			Names of the fields to read, defaults to all of them.
+
+		Returns
+		=======
+		data : numpy.recarray
+			The records, in date order.
+
+		'''
+		if Fields is None:
+			Fields = list(self.dtype.names)
+		dtype = [(f,self.dtype[f]) for f in Fields]
+		R = self.RowsPerDay
+
+		out = []
+		for yr in range(Date0//10000,Date1//10000 + 1):
+			if not os.path.isfile(self._YearPath(yr) + 'index.bin'):
+				continue
+
+			#the range of slots needed from this year
+			d0 = max(Date0,yr*10000 + 101)
+			d1 = min(Date1,yr*10000 + 1231)
+			s0 = self._Slot(d0)
+			s1 = self._Slot(d1) + 1
+			cnt = np.fromfile(self._YearPath(yr) + 'index.bin',dtype='int32')[s0:s1]
+			rows = np.concatenate([s*R + np.arange(c) for s,c in zip(range(s0,s1),cnt)] + [np.zeros(0,dtype='int64')]) - s0*R
+
+			tmp = np.recarray(rows.size,dtype=dtype)
+			for f in Fields:
+				m = self._Map(yr,f)
+				tmp[f] = m[s0*R:s1*R][rows]
+				del m
+			out.append(tmp)
+
+		if len(out) == 0:
+			return np.recarray(0,dtype=dtype)
+		return np.concatenate(out).view(np.recarray)
+
+	def Dates(self):
+		'''
+		List the dates stored in the archive.
+
+		'''
+		out = []
+		if not os.path.isdir(self.Path):
+			return np.zeros(0,dtype='int32')
+		for yr in sorted(os.listdir(self.Path)):
+			fname = self.Path + '/' + yr + '/index.bin'
+			if os.path.isfile(fname):
+				cnt = np.fromfile(fname,dtype='int32')
+				days = DateToDays(np.int64(yr)*10000 + 101) + np.where(cnt > 0)[0]
+				out.append(days)
+		if len(out) == 0:
+			return np.zeros(0,dtype='int32')
+		return DaysToDate(np.concatenate(out))
@@ -0,0 +1,66 @@
+import numpy as np
+
+def Clenshaw(s,coef,idx=None):
+	'''
+	Evaluate Chebyshev series for many samples at once using the
+	Clenshaw recursion.
+	
+	Inputs
+	======
+	s : float64
+		Normalised times (-1 to 1), shape (n,).
+	coef : float64
+		Chebyshev coefficients, shape (m,ncomp,ncoef), where m is n if
+		idx is not provided.
+	idx : int
+		Optional index of the row of coef to use for each sample, which
+		avoids copying the coefficients for every sample.
+		
+	Returns
+	=======
+	out : float64
+		Evaluated series, shape (n,ncomp).
+	
+	'''
+	m,ncomp,ncoef = coef.shape
+	n = np.size(s)
+	if idx is None:
+		idx = slice(None)
+	s = np.reshape(s,(n,1))
+	s2 = 2*s
+	b1 = np.zeros((n,ncomp))
+	b2 = np.zeros((n,ncomp))
+	for k in range(ncoef-1,0,-1):
+		b1,b2 = s2*b1 - b2 + coef[idx,:,k],b1
+	return s*b1 - b2 + coef[idx,:,0]
+
+def ChebyshevNodes(Degree):
+	'''
+	The Chebyshev nodes (of the first kind) on -1 to 1 used to fit a 
+	series of degree Degree.
+	
+	'''
+	n = Degree + 1
+	return np.cos(np.pi*(np.arange(n) + 0.5)/n)
+
+def ChebyshevFit(f):
+	'''
+	Calculate the Chebyshev coefficients of the series which
+	interpolates values sampled at the nodes from ChebyshevNodes.
+	
+	Inputs
+	======
+	f : float64
+		Values at the nodes, shape (...,n).
+		
+	Returns
+	=======
+	coef : float64
+		Coefficients, shape (...,n).
+	
+	'''
+	n = f.shape[-1]
+	k = np.arange(n)
+	T = np.cos(np.pi*np.outer(k,k + 0.5)/n)*(2.0/n)
+	T[0] *= 0.5
+	return f @ T.T
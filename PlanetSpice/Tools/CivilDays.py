@@ -0,0 +1,62 @@
+import numpy as np
+
+#days between 1970-01-01 and 2000-01-01
+_days2000 = 10957
+
+def DateToDays(Date):
+	'''
+	Convert dates to the number of days since 2000-01-01 using integer
+	arithmetic on the (proleptic Gregorian) civil calendar.
+
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd
+
+	Returns
+	=======
+	days : int64
+		Number of days since 2000-01-01
+
+	'''
+	Date = np.asarray(Date,dtype='int64')
+	yr = Date//10000
+	mn = (Date % 10000)//100
+	dy = Date % 100
+
+	#count years from March so that the leap day is at the end
+	yr = yr - (mn <= 2)
+	era = yr//400
+	yoe = yr - era*400
+	doy = (153*(mn + np.where(mn > 2,-3,9)) + 2)//5 + dy - 1
+	doe = yoe*365 + yoe//4 - yoe//100 + doy
+
+	return era*146097 + doe - 719468 - _days2000
+
+def DaysToDate(Days):
+	'''
+	Convert the number of days since 2000-01-01 to dates, the inverse
+	of DateToDays.
+
+	Inputs
+	======
+	Days : int
+		Number of days since 2000-01-01
+
+	Returns
+	=======
+	Date : int32
+		Date(s) in format yyyymmdd
+
+	'''
+	z = np.asarray(Days,dtype='int64') + 719468 + _days2000
+	era = z//146097
+	doe = z - era*146097
+	yoe = (doe - doe//1460 + doe//36524 - doe//146096)//365
+	doy = doe - (365*yoe + yoe//4 - yoe//100)
+	mp = (5*doy + 2)//153
+	dy = doy - (153*mp + 2)//5 + 1
+	mn = mp + np.where(mp < 10,3,-9)
+	yr = yoe + era*400 + (mn <= 2)
+
+	return (yr*10000 + mn*100 + dy).astype('int32')
@@ -1,27 +1,56 @@
 import numpy as np
-import copy
-import DateTimeTools as TT
+from .CivilDays import DateToDays,DaysToDate
+
+#days between 1950-01-01 and 2000-01-01
+_days1950 = 18262
+
+def ContUT(Date,ut,out=None):
+	'''
+	Calculate the continuous ut array, i.e. the number of hours since
+	00:00 on 1950-01-01.
+
+	Inputs
+	======
+	Date : int
+		Date(s) in format yyyymmdd.
+	ut : float
+		Time(s) in hours since the start of each day.
+	out : float64
+		Optional array to store the result in.
+
+	Returns
+	=======
+	utc : float64
+		Continuous time in hours.
 
-def ContUT(Date,ut):
 	'''
-	Calculate the continuous ut array
+	days = DateToDays(Date) + _days1950
+	if out is None:
+		out = np.empty(np.broadcast(days,ut).shape,dtype='float64')
+	np.multiply(days,24.0,out=out)
+	out += np.asarray(ut,dtype='float64')
+	return out
+
+def ContUTtoDate(utc):
+	'''
+	Convert continuous time back to dates and times, the inverse of
+	ContUT.
+
+	Inputs
+	======
+	utc : float
+		Continuous time in hours since 00:00 on 1950-01-01.
+
+	Returns
+	=======
+	Date : int32
+		Date(s) in format yyyymmdd.
+	ut : float64
+		Time(s) in hours since the start of each day.
+
 	'''
-	utc = copy.deepcopy(ut).astype('float64')
-	
-	ud = np.unique(Date)
-	nd = ud.size
-	
-	#date difference between 19500101 and 20000101
-	dd2000 = 18262
-	dtp = dd2000*24.0
-	pd = 20000101
-	for i in range(0,nd):
-		use = np.where(Date == ud[i])[0]
-		dt = np.float64(dtp) + np.float64(TT.DateDifference(pd,ud[i]))*np.float64(24.0)
-		utc[use] = np.float64(ut[use]) + np.float64(dt)
-		dtp = np.array(dt)
-		pd = ud[i]
-		
-	return utc		
-	
-	
+	utc = np.asarray(utc,dtype='float64')
+	days = np.floor(utc/24.0)
+	Date = DaysToDate(np.int64(days) - _days1950)
+	ut = utc - days*24.0
+	return Date,ut
@@ -0,0 +1,38 @@
+import hashlib
+import os
+
+#hashes already calculated, keyed by file name, size and modification time
+_hashes = {}
+
+def FileHash(fname):
+	'''
+	Calculate the SHA1 hash of the contents of a file. The hash is only
+	recalculated if the file size or modification time changes.
+	
+	Inputs
+	======
+	fname : str
+		Name of the file.
+		
+	Returns
+	=======
+	hash : str
+		Hexadecimal SHA1 hash.
+	
+	'''
+	st = os.stat(fname)
+	key = (os.path.abspath(fname),st.st_size,st.st_mtime_ns)
+	if key in _hashes:
+		return _hashes[key]
+	
+	h = hashlib.sha1()
+	f = open(fname,'rb')
+	while True:
+		b = f.read(2**20)
+		if not b:
+			break
+		h.update(b)
+	f.close()
+	
+	_hashes[key] = h.hexdigest()
+	return _hashes[key]
@@ -0,0 +1,155 @@
+import numpy as np
+
+def FindCrossings(Func,t0,t1,dt,Level=0.0,Direction=-1,Wrap=None,Tol=1e-3,MaxIter=50):
+	'''
+	Find all of the times where a function crosses a level. The 
+	function is sampled once on a regular grid, the sign changes are
+	found using array operations and then all of the roots are refined
+	together using a vectorised regula falsi (Illinois) iteration.
+	
+	Inputs
+	======
+	Func : callable
+		Vectorised function which accepts an array of times and returns
+		an array of values.
+	t0 : float
+		Start time.
+	t1 : float
+		End time.
+	dt : float
+		Time step used to sample Func, should be small enough that 
+		there is no more than one crossing per step.
+	Level : float
+		Value of Func to find the crossings of.
+	Direction : int
+		-1 : only where Func goes from above Level to below it
+		1 : only where Func goes from below Level to above it
+		0 : both
+	Wrap : float
+		If set, then Func is treated as an angle which wraps around 
+		with this period (e.g. 2*pi) and jumps larger than half of this
+		are ignored.
+	Tol : float
+		Tolerance on the times of the roots.
+	MaxIter : int
+		Maximum number of iterations.
+		
+	Returns
+	=======
+	t : float64
+		Array of the times of each crossing.
+	
+	'''
+	#sample the function
+	n = np.int64(np.floor((t1 - t0)/dt)) + 1
+	t = t0 + np.arange(n,dtype='float64')*dt
+	f = Func(t) - Level
+	
+	#find the intervals containing crossings
+	use = FindBrackets(f,Direction,Wrap)
+	
+	return RefineRoots(Func,t[use],t[use+1],f[use],f[use+1],Level,Tol,MaxIter)
+
+def FindBrackets(f,Direction=-1,Wrap=None):
+	'''
+	Find the intervals of a sampled function which contain a crossing 
+	of zero.
+	
+	Inputs
+	======
+	f : float
+		Sampled function values (minus the level).
+	Direction : int
+		-1 : only where f goes from above zero to below it
+		1 : only where f goes from below zero to above it
+		0 : both
+	Wrap : float
+		If set, then f is treated as an angle which wraps around with
+		this period and jumps larger than half of this are ignored.
+		
+	Returns
+	=======
+	use : int
+		Indices i, where the crossing lies between f[i] and f[i+1].
+	
+	'''
+	fa = f[...,:-1]
+	fb = f[...,1:]
+	if Direction < 0:
+		use = (fa > 0) & (fb <= 0)
+	elif Direction > 0:
+		use = (fa < 0) & (fb >= 0)
+	else:
+		use = ((fa > 0) & (fb <= 0)) | ((fa < 0) & (fb >= 0))
+	if not Wrap is None:
+		use &= np.abs(fb - fa) < Wrap/2.0
+	return np.where(use)[0]
+	
+def RefineRoots(Func,ta,tb,fa,fb,Level=0.0,Tol=1e-3,MaxIter=50):
+	'''
+	Refine an array of bracketed roots all at once using the Illinois
+	variant of regula falsi.
+	
+	Inputs
+	======
+	Func : callable
+		Vectorised function which accepts an array of times and returns
+		an array of values.
+	ta : float
+		Start of each bracket.
+	tb : float
+		End of each bracket.
+	fa : float
+		Func(ta) - Level
+	fb : float
+		Func(tb) - Level
+	Level : float
+		Value of Func to find the crossings of.
+	Tol : float
+		Tolerance on the times of the roots.
+	MaxIter : int
+		Maximum number of iterations.
+	
+	Returns
+	=======
+	t : float64
+		Array of the times of each root.
+	
+	'''
+	ta = np.array(ta,dtype='float64')
+	tb = np.array(tb,dtype='float64')
+	fa = np.array(fa,dtype='float64')
+	fb = np.array(fb,dtype='float64')
+	
+	#exact roots at the ends of the brackets
+	out = np.where(fb == 0.0,tb,np.where(fa == 0.0,ta,np.nan))
+	act = np.where(np.isnan(out))[0]
+	
+	tc = np.copy(tb)
+	for it in range(0,MaxIter):
+		if act.size == 0:
+			break
+		a,b = ta[act],tb[act]
+		ya,yb = fa[act],fb[act]
+		
+		#new estimate and its value
+		c = b - yb*(b - a)/(yb - ya)
+		yc = Func(c) - Level
+		
+		#keep the bracket, halving the value at a stale end
+		swap = yc*yb < 0
+		ta[act] = np.where(swap,b,a)
+		fa[act] = np.where(swap,yb,ya/2.0)
+		tb[act] = c
+		fb[act] = yc
+		
+		#check for convergence
+		done = (np.abs(c - tc[act]) < Tol) | (yc == 0.0) | (np.abs(tb[act] - ta[act]) < Tol)
+		tc[act] = c
+		out[act[done]] = c[done]
+		act = act[~done]
+	
+	#anything which didn't converge gets its best estimate
+	out[act] = tc[act]
+	
+	return out
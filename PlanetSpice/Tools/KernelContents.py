@@ -0,0 +1,155 @@
+import numpy as np
+import os
+import threading
+from .ReadTextKernel import ReadTextKernel
+
+#record length of a DAF file in doubles
+_RecLen = 128
+
+#contents of each kernel which has already been read
+_contents = {}
+
+#pairs of kernels which have already been compared
+_overlaps = {}
+
+_lock = threading.Lock()
+
+def DAFSegments(fname):
+	'''
+	Read the segment summaries of a DAF file (binary SPK, CK or PCK).
+
+	Inputs
+	======
+	fname : str
+		Name of the DAF file.
+
+	Returns
+	=======
+	daf : str
+		The file type, e.g. 'DAF/SPK'.
+	ID : int64
+		The first integer of each summary: the target body for SPK
+		segments, the instrument for CK segments or the frame for PCK
+		segments.
+	t0 : float64
+		Start time of each segment.
+	t1 : float64
+		End time of each segment.
+
+	'''
+	f = open(fname,'rb')
+	rec = f.read(1024)
+	fmt = rec[88:96]
+	if fmt == b'BIG-IEEE':
+		bo = '>'
+	elif fmt == b'LTL-IEEE':
+		bo = '<'
+	else:
+		f.close()
+		raise ValueError('Unsupported DAF binary format in '+fname)
+	daf = rec[:8].decode('ascii').strip()
+	nd,ni = np.frombuffer(rec[8:16],dtype=bo+'i4')
+	fward = np.frombuffer(rec[76:80],dtype=bo+'i4')[0]
+
+	#follow the linked list of summary records
+	ns = nd + (ni + 1)//2
+	ID = []
+	t0 = []
+	t1 = []
+	r = fward
+	while r > 0:
+		f.seek((r-1)*_RecLen*8)
+		srec = np.frombuffer(f.read(_RecLen*8),dtype=bo+'f8')
+		nsum = np.int64(srec[2])
+		for i in range(nsum):
+			s = srec[3+i*ns:3+(i+1)*ns]
+			ID.append(s[nd:].view(bo+'i4')[0])
+			t0.append(s[0])
+			t1.append(s[1])
+		r = np.int64(srec[0])
+	f.close()
+
+	return daf,np.array(ID,dtype='int64'),np.array(t0),np.array(t1)
+
+def KernelContents(fname):
+	'''
+	Summarise the data provided by a kernel, so that kernels which
+	provide the same data can be found. Each file is only read once.
+
+	Inputs
+	======
+	fname : str
+		Name of the kernel file.
+
+	Returns
+	=======
+	contents : tuple or None
+		('DAF/SPK',ID,t0,t1) etc. for binary kernels (see DAFSegments),
+		('TEXT',names) for text kernels, where names is the set of
+		kernel variables defined, or None if the file could not be
+		read.
+
+	'''
+	with _lock:
+		if fname in _contents:
+			return _contents[fname]
+
+	try:
+		f = open(fname,'rb')
+		head = f.read(8)
+		f.close()
+		if head.startswith(b'DAF/') or head.startswith(b'NAIF/DAF'):
+			out = DAFSegments(fname)
+		else:
+			out = ('TEXT',set(ReadTextKernel(fname).keys()))
+	except (OSError,ValueError,UnicodeDecodeError):
+		out = None
+
+	with _lock:
+		_contents[fname] = out
+	return out
+
+def KernelsOverlap(a,b):
+	'''
+	Check whether two kernels provide any of the same data, i.e.
+	whether the one loaded last would override some of the other.
+	Binary kernels overlap if they are the same type and have segments
+	for the same ID covering the same times, text kernels overlap if
+	they define any of the same variables. Kernels which can't be read
+	are assumed to overlap with kernels of the same type (extension).
+
+	Inputs
+	======
+	a : str
+		Name of the first kernel.
+	b : str
+		Name of the second kernel.
+
+	Returns
+	=======
+	overlap : bool
+
+	'''
+	key = (a,b) if a < b else (b,a)
+	with _lock:
+		if key in _overlaps:
+			return _overlaps[key]
+
+	ca = KernelContents(a)
+	cb = KernelContents(b)
+	if ca is None or cb is None:
+		out = os.path.splitext(a)[1].lower() == os.path.splitext(b)[1].lower()
+	elif ca[0] != cb[0]:
+		out = False
+	elif ca[0] == 'TEXT':
+		out = len(ca[1] & cb[1]) > 0
+	else:
+		_,ida,t0a,t1a = ca
+		_,idb,t0b,t1b = cb
+		same = ida[:,np.newaxis] == idb[np.newaxis,:]
+		cross = (t0a[:,np.newaxis] <= t1b[np.newaxis,:]) & (t0b[np.newaxis,:] <= t1a[:,np.newaxis])
+		out = bool((same & cross).any())
+
+	with _lock:
+		_overlaps[key] = out
+	return out
@@ -0,0 +1,60 @@
+import importlib
+import types
+import sys
+
+class _LazyModule(types.ModuleType):
+	'''
+	A module with attributes (listed in its _Lazy dict) which are only
+	imported when they are first used.
+
+	'''
+	def __getattr__(self,Name):
+		lazy = self.__dict__.get('_Lazy',{})
+		if Name in lazy:
+			mod,attr = lazy[Name]
+			out = importlib.import_module(mod,self.__name__)
+			if not attr is None:
+				out = getattr(out,attr)
+			self.__dict__[Name] = out
+			return out
+		raise AttributeError('module {:s} has no attribute {:s}'.format(self.__name__,Name))
+
+	def __dir__(self):
+		return sorted(set(self.__dict__) | set(self.__dict__.get('_Lazy',{})))
+
+	def __setattr__(self,Name,Value):
+		#importing a submodule sets it as an attribute of its package,
+		#which would hide a function or class of the same name (e.g.
+		#PlanetSpice.utc2et), so those are kept
+		lazy = self.__dict__.get('_Lazy',{})
+		if isinstance(Value,types.ModuleType) and Name in lazy and not lazy[Name][1] is None:
+			return
+		super().__setattr__(Name,Value)
+
+
+def LazyImports(Name,Lazy):
+	'''
+	Make a module import some of its attributes only when they are
+	first used, e.g. in a package's __init__.py:
+
+		LazyImports(__name__,{	'Messenger' : ('.Messenger',None),
+								'utc2et' : ('.utc2et','utc2et')})
+
+	Inputs
+	======
+	Name : str
+		Name of the module (__name__).
+	Lazy : dict
+		Maps each attribute name to a tuple of the module to import
+		(relative to Name) and the name of the object within it, or None
+		for the module itself.
+
+	'''
+	mod = sys.modules[Name]
+	mod._Lazy = Lazy
+	if hasattr(mod,'__all__'):
+		names = mod.__all__
+	else:
+		names = [n for n in mod.__dict__ if not n.startswith('_')]
+	mod.__all__ = [n for n in names if not n in Lazy] + list(Lazy)
+	mod.__class__ = _LazyModule
@@ -1,16 +1,111 @@
 import numpy as np
-import DateTimeTools as TT
+from .CivilDays import DateToDays,DaysToDate
 
-def ListDates(Date0,Date1):
+def _Days(Date):
 	'''
-	Creates an array of dates from Date0 to Date1
-	
+	Day number of the date, or of the next valid date if it is not a
+	real date (e.g. 20150431 -> 20150501).
+
+	'''
+	d = DateToDays(Date)
+	if DaysToDate(d) < Date:
+		d += 1
+	return np.int64(d)
+
+def _MonthDates(Date0,i,Step):
+	'''
+	Dates which are i*Step months after Date0, on the same day of the
+	month where possible, otherwise on the last day of the month.
+
+	'''
+	yr = Date0//10000
+	mn = (Date0 % 10000)//100
+	dy = Date0 % 100
+	m = yr*12 + mn - 1 + np.asarray(i,dtype='int64')*Step
+	first = (m//12)*10000 + (m % 12 + 1)*100 + 1
+	nxt = ((m + 1)//12)*10000 + ((m + 1) % 12 + 1)*100 + 1
+	ndays = DateToDays(nxt) - DateToDays(first)
+	return (first - 1 + np.minimum(dy,ndays)).astype('int32')
+
+def _Count(Date0,Date1,Step,Monthly):
+	'''
+	Number of dates from Date0 up to and including Date1.
+
+	'''
+	d0 = _Days(Date0)
+	d1 = _Days(Date1)
+	if d1 <= d0:
+		return 1
+	if not Monthly:
+		return np.int64((d1 - d0)//Step + 1)
+
+	#estimate the number of months, then correct it
+	n = np.int64((Date1//10000 - Date0//10000)*12 + ((Date1 % 10000)//100 - (Date0 % 10000)//100))//Step + 2
+	while n > 1 and DateToDays(_MonthDates(Date0,n - 1,Step)) > d1:
+		n -= 1
+	return n
+
+def _Dates(Date0,i,Step,Monthly):
+	'''
+	The i-th dates from Date0.
+
+	'''
+	if Monthly:
+		return _MonthDates(Date0,i,Step)
+	return DaysToDate(_Days(Date0) + np.asarray(i,dtype='int64')*Step)
+
+def ListDates(Date0,Date1,Step=1,Monthly=False):
+	'''
+	Creates an array of dates from Date0 to Date1 (inclusive), using
+	integer arithmetic on the civil calendar rather than stepping
+	through each day.
+
+	Inputs
+	======
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+	Step : int
+		Number of days (or months) between dates.
+	Monthly : bool
+		If True, Step is in months and each date is on the same day of
+		the month as Date0 (or the last day of shorter months).
+
+	Returns
+	=======
+	dates : int32
+		Array of dates, format yyyymmdd.
+
+	'''
+	n = _Count(Date0,Date1,Step,Monthly)
+	return _Dates(Date0,np.arange(n),Step,Monthly)
+
+def DateChunks(Date0,Date1,ChunkSize=100,Step=1,Monthly=False):
+	'''
+	Generator producing the same dates as ListDates in chunks, so that
+	long ranges of dates can be processed without creating the full
+	list.
+
+	Inputs
+	======
+	Date0 : int
+		Start date, format yyyymmdd.
+	Date1 : int
+		End date, format yyyymmdd.
+	ChunkSize : int
+		Maximum number of dates in each chunk.
+	Step : int
+		Number of days (or months) between dates.
+	Monthly : bool
+		If True, Step is in months.
+
+	Yields
+	======
+	dates : int32
+		Array of dates, format yyyymmdd.
+
 	'''
-	dates = []
-	date = np.copy(Date0)
-	dates.append(date)
-	while date < Date1:
-		date = TT.PlusDay(date)
-		dates.append(date)
-	dates = np.array(dates)
-	return dates
+	n = _Count(Date0,Date1,Step,Monthly)
+	for i in range(0,n,ChunkSize):
+		yield _Dates(Date0,np.arange(i,min(i + ChunkSize,n)),Step,Monthly)
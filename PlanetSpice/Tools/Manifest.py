@@ -0,0 +1,153 @@
+import numpy as np
+import hashlib
+import os
+from .FileHash import FileHash
+
+#status of each day
+Pending = 0
+Complete = 1
+
+
+def KernelKey(Kernels):
+	'''
+	A single hash for a list of kernel files, which changes whenever
+	any of the files change.
+
+	Inputs
+	======
+	Kernels : list
+		Kernel file names.
+
+	Returns
+	=======
+	key : str
+		Hexadecimal SHA1 hash.
+
+	'''
+	h = hashlib.sha1()
+	for k in Kernels:
+		h.update(FileHash(k).encode())
+	return h.hexdigest()
+
+
+class Manifest(object):
+	'''
+	A record of the days which have been saved, their status and the
+	hash of the kernels which were used for each one, so that saving
+	can be resumed after an interruption and only repeated for days
+	which are missing or were made using different kernels.
+
+	The manifest is stored as a .npz file containing the arrays Date,
+	Status and Kernel (an index into the array Keys of kernel hashes).
+
+	'''
+	def __init__(self,fname):
+		'''
+		Inputs
+		======
+		fname : str
+			Name of the manifest file, which is created when it is first
+			saved.
+
+		'''
+		self.fname = fname
+		self.Date = np.zeros(0,dtype='int32')
+		self.Status = np.zeros(0,dtype='int8')
+		self.Kernel = np.zeros(0,dtype='int32')
+		self.Keys = []
+		if os.path.isfile(fname):
+			with np.load(fname) as f:
+				self.Date = f['Date']
+				self.Status = f['Status']
+				self.Kernel = f['Kernel']
+				self.Keys = [str(k) for k in f['Keys']]
+
+	def _Find(self,Dates):
+		'''
+		Index of each date within the manifest, or -1.
+
+		'''
+		Dates = np.atleast_1d(np.asarray(Dates,dtype='int32'))
+		if self.Date.size == 0:
+			return np.zeros(Dates.size,dtype='int64') - 1
+		i = np.clip(np.searchsorted(self.Date,Dates),0,self.Date.size-1)
+		return np.where(self.Date[i] == Dates,i,-1)
+
+	def Todo(self,Dates,Key):
+		'''
+		List the dates which still need to be saved, i.e. those which
+		are not complete or were saved using different kernels.
+
+		Inputs
+		======
+		Dates : int
+			Dates, format yyyymmdd.
+		Key : str
+			Hash of the kernels which would be used (see KernelKey).
+
+		Returns
+		=======
+		Dates : int32
+			Dates to save.
+
+		'''
+		Dates = np.atleast_1d(np.asarray(Dates,dtype='int32'))
+		i = self._Find(Dates)
+		if Key in self.Keys:
+			k = self.Keys.index(Key)
+		else:
+			k = -1
+		done = np.zeros(Dates.size,dtype='bool')
+		use = np.where(i >= 0)[0]
+		done[use] = (self.Status[i[use]] == Complete) & (self.Kernel[i[use]] == k)
+		return Dates[~done]
+
+	def Mark(self,Dates,Key,Status=Complete):
+		'''
+		Set the status of some dates and save the manifest.
+
+		Inputs
+		======
+		Dates : int
+			Dates, format yyyymmdd.
+		Key : str
+			Hash of the kernels used (see KernelKey).
+		Status : int
+			Pending or Complete.
+
+		'''
+		Dates = np.atleast_1d(np.asarray(Dates,dtype='int32'))
+		if not Key in self.Keys:
+			self.Keys.append(Key)
+		k = self.Keys.index(Key)
+
+		#add any new dates
+		new = np.setdiff1d(Dates,self.Date)
+		if new.size > 0:
+			self.Date = np.append(self.Date,new)
+			self.Status = np.append(self.Status,np.zeros(new.size,dtype='int8') + Pending)
+			self.Kernel = np.append(self.Kernel,np.zeros(new.size,dtype='int32') - 1)
+			srt = np.argsort(self.Date)
+			self.Date = self.Date[srt]
+			self.Status = self.Status[srt]
+			self.Kernel = self.Kernel[srt]
+
+		i = self._Find(Dates)
+		self.Status[i] = Status
+		self.Kernel[i] = k
+		self.Save()
+
+	def Save(self):
+		'''
+		Write the manifest, via a temporary file so that it is never
+		left partially written.
+
+		'''
+		path = os.path.dirname(self.fname)
+		if path != '' and not os.path.isdir(path):
+			os.makedirs(path,exist_ok=True)
+		tmp = self.fname + '.{:d}.tmp'.format(os.getpid())
+		f = open(tmp,'wb')
+		np.savez(f,Date=self.Date,Status=self.Status,Kernel=self.Kernel,Keys=np.array(self.Keys,dtype='U40'))
+		f.close()
+		os.replace(tmp,self.fname)
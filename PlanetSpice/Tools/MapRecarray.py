@@ -0,0 +1,171 @@
+import numpy as np
+import os
+
+class MapRecarray(object):
+	'''
+	Read-only memory map of a file written by RecarrayTools.SaveRecarray,
+	which stores an int32 record count followed by each field in turn.
+	The position of every field in the file is known from the count and
+	the dtype, so each field is mapped separately and only the pages
+	which are actually used are ever read from the disk.
+
+	'''
+	def __init__(self,fname,dtype):
+		'''
+		Inputs
+		======
+		fname : str
+			Name of the file.
+		dtype : list
+			numpy dtype of the records stored in the file.
+
+		'''
+		self.fname = fname
+		self.dtype = np.dtype(dtype)
+
+		f = open(fname,'rb')
+		self.size = np.int64(np.fromfile(f,dtype='int32',count=1)[0])
+		f.close()
+
+		#offset (bytes) of each field within the file
+		self.offsets = {}
+		p = 4
+		for name in self.dtype.names:
+			self.offsets[name] = p
+			p += self.size*self.dtype[name].itemsize
+		if p != os.path.getsize(fname):
+			raise ValueError('File size does not match dtype: '+fname)
+
+		self._cols = {}
+
+	def __len__(self):
+		return int(self.size)
+
+	def __getattr__(self,name):
+		if name in self.__dict__.get('offsets',{}):
+			return self.Column(name)
+		raise AttributeError(name)
+
+	def Column(self,name):
+		'''
+		Memory-mapped array of a single field.
+
+		'''
+		if not name in self._cols:
+			dt = self.dtype[name]
+			if self.size == 0:
+				self._cols[name] = np.zeros((0,) + dt.shape,dtype=dt.base)
+			else:
+				self._cols[name] = np.memmap(self.fname,dtype=dt.base,mode='r',
+								offset=self.offsets[name],shape=(self.size,) + dt.shape)
+		return self._cols[name]
+
+	def Find(self,t0,t1,Field='utc'):
+		'''
+		Find the rows where a sorted field is within t0 <= t < t1, using
+		a binary search so that only a few pages of the field are read.
+
+		Returns
+		=======
+		i0 : int
+			First row.
+		i1 : int
+			Row after the last one.
+
+		'''
+		col = self.Column(Field)
+		i0 = np.searchsorted(col,t0,side='left')
+		i1 = np.searchsorted(col,t1,side='left')
+		return i0,i1
+
+	def Slice(self,i0,i1,Fields=None,Copy=True):
+		'''
+		Get a range of rows.
+
+		Inputs
+		======
+		i0 : int
+			First row.
+		i1 : int
+			Row after the last one.
+		Fields : list
+			Names of the fields to include, defaults to all of them. Other
+			fields are not read.
+		Copy : bool
+			If True, return a recarray containing a copy of the rows,
+			otherwise a dict of read-only views of the memory-mapped
+			fields.
+
+		Returns
+		=======
+		data : numpy.recarray or dict
+
+		'''
+		if Fields is None:
+			Fields = list(self.dtype.names)
+		if not Copy:
+			return {f:self.Column(f)[i0:i1] for f in Fields}
+
+		out = np.recarray(i1 - i0,dtype=[(f,self.dtype[f]) for f in Fields])
+		for f in Fields:
+			out[f] = self.Column(f)[i0:i1]
+		return out
+
+	def Range(self,t0,t1,Fields=None,Copy=True,Field='utc'):
+		'''
+		Get the rows where a sorted field (utc by default) is within
+		t0 <= t < t1 (see Find and Slice).
+
+		'''
+		i0,i1 = self.Find(t0,t1,Field)
+		return self.Slice(i0,i1,Fields,Copy)
+
+def Decimate(src,fname,Step,Field='utc',Offset=0.0,Tol=1e-3,Chunk=1048576):
+	'''
+	Save a reduced resolution copy of a memory-mapped recarray file,
+	in the same format as RecarrayTools.SaveRecarray. The rows are read
+	and written in chunks, so the full file is never loaded into
+	memory.
+
+	Inputs
+	======
+	src : MapRecarray
+		The source file.
+	fname : str
+		Name of the output file.
+	Step : int or float
+		If Field is None, keep every Step-th row, otherwise keep the
+		rows where Field - Offset is a multiple of Step (within Tol),
+		e.g. Step=24.0 keeps the first hour of each day in a file with
+		utc in hours.
+	Field : str or None
+		Field to align the output to.
+	Offset : int or float
+		Row offset (Field is None) or value of Field which is aligned.
+	Tol : float
+		Tolerance for the alignment.
+	Chunk : int
+		Number of rows processed at once.
+
+	'''
+	#rows to keep
+	if Field is None:
+		idx = np.arange(np.int64(Offset),src.size,np.int64(Step))
+	else:
+		col = src.Column(Field)
+		idx = []
+		for i in range(0,src.size,Chunk):
+			t = np.float64(col[i:i+Chunk]) - Offset
+			r = np.abs(t - Step*np.round(t/Step))
+			idx.append(i + np.where(r <= Tol)[0])
+		idx = np.concatenate(idx + [np.zeros(0,dtype='int64')])
+
+	tmp = fname + '.{:d}.tmp'.format(os.getpid())
+	f = open(tmp,'wb')
+	np.int32(idx.size).tofile(f)
+	for name in src.dtype.names:
+		col = src.Column(name)
+		for i in range(0,idx.size,Chunk):
+			np.ascontiguousarray(col[idx[i:i+Chunk]]).tofile(f)
+	f.close()
+	os.replace(tmp,fname)
@@ -0,0 +1,74 @@
+import numpy as np
+import re
+
+#tokens found in the data sections of text kernels
+_token = re.compile(r"'(?:[^']|'')*'|\+=|=|\(|\)|,|[^\s=(),']+")
+
+def _Value(tok):
+	'''
+	Convert a single text kernel token to a Python value.
+
+	'''
+	if tok.startswith("'"):
+		return tok[1:-1].replace("''","'")
+	if tok.startswith('@'):
+		return tok
+	try:
+		return float(tok.replace('D','E').replace('d','e'))
+	except ValueError:
+		return tok
+
+def ReadTextKernel(fname):
+	'''
+	Read the variables defined in the data sections of a SPICE text
+	kernel (e.g. LSK, PCK, FK) without using the SPICE kernel pool.
+
+	Inputs
+	======
+	fname : str
+		Name of the text kernel file.
+
+	Returns
+	=======
+	out : dict
+		Dictionary where each key is a kernel variable name and each
+		value is a list of the values assigned to it. Numbers are
+		converted to float, quoted strings have their quotes removed
+		and dates are left as strings beginning with '@'.
+
+	'''
+	f = open(fname,'r')
+	lines = f.readlines()
+	f.close()
+
+	#collect the tokens from all of the data sections
+	tokens = []
+	indata = False
+	for l in lines:
+		s = l.strip()
+		if s.startswith('\\begindata'):
+			indata = True
+		elif s.startswith('\\begintext'):
+			indata = False
+		elif indata:
+			tokens.extend(_token.findall(l))
+
+	#now assign the values
+	out = {}
+	name = None
+	append = False
+	i = 0
+	nt = len(tokens)
+	while i < nt:
+		if i + 1 < nt and tokens[i+1] in ('=','+='):
+			name = tokens[i]
+			append = tokens[i+1] == '+='
+			if not append or not name in out:
+				out[name] = []
+			i += 2
+			continue
+		if not tokens[i] in ('(',')',',') and not name is None:
+			out[name].append(_Value(tokens[i]))
+		i += 1
+
+	return out
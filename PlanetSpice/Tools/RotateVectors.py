@@ -0,0 +1,42 @@
+import numpy as np
+
+def RotateVectors(rot,xi,yi,zi):
+	'''
+	Apply an array of rotation matrices to vectors.
+	
+	Inputs
+	======
+	rot : float64
+		Rotation matrices, shape (n,3,3) or (3,3).
+	xi : float
+		x components of the vectors.
+	yi : float
+		y components of the vectors.
+	zi : float
+		z components of the vectors.
+		
+	Returns
+	=======
+	x : float64
+		Rotated x components.
+	y : float64
+		Rotated y components.
+	z : float64
+		Rotated z components.
+	
+	'''
+	v = np.stack(np.broadcast_arrays(np.array(xi,dtype='float64').flatten(),
+									np.array(yi,dtype='float64').flatten(),
+									np.array(zi,dtype='float64').flatten()),axis=-1)
+	
+	rot = np.asarray(rot)
+	if rot.ndim == 2:
+		#a single matrix for every vector
+		out = v @ rot.T
+	elif rot.shape[0] == 1 or rot.strides[0] == 0:
+		#the same matrix repeated for every vector
+		out = v @ rot[0].T
+	else:
+		out = np.einsum('nij,nj->ni',rot,v)
+		
+	return (out[:,0],out[:,1],out[:,2])
@@ -1,11 +1,14 @@
 import numpy as np
 import spiceypy as sp
-from ...utc2et import utc2et
+from ...DayStartET import GetET,GetDate
+from ...Surrogate import SurrogatePos
+from ...Body import SunSpeed,Aberration
 from scipy.interpolate import InterpolatedUnivariateSpline
 import os
-import DateTimeTools as TT
 from ...Tools.FileSearch import FileSearch
 from ... import Globals
+from ... import KernelManager as KM
+from ...Sun.IAU_SUN import CarringtonLon
 
 lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
 spk_kernel = Globals.SpicePath + '/bodies/de432s.bsp'
@@ -62,106 +65,68 @@ def ListVenusSPK(Date):
 	return files
 
 
-		
-def PosVSO(Date,ut):
+def _KernelSet(Date=None):
 	'''
-	VEX position in VSO coordinates
+	Kernels used by this module, including the VEX SPK kernels for 
+	Date.
 	
 	'''
-	
-	#create the output arrays
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
+	kernels = [lsk_path,spk_kernel,pck_kernel,hci_kernel,vso_kernel]
+	if not Date is None:
+		kernels = kernels + list(ListVenusSPK(Date))
+	return kernels
+
+KM.RegisterSet('VEX',_KernelSet)
+
 		
-	#load the relevant kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	VEXspk = ListVenusSPK(Date)
-	for vk in VEXspk:
-		sp.furnsh(vk)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(vso_kernel)	
+def PosVSO(Date,ut=None,Surrogate=False,Format=None):
+	'''
+	VEX position in VSO coordinates. If Surrogate=True then the 
+	positions are evaluated from cached Chebyshev fits to the 
+	trajectory (see Surrogate.py), which is much faster for dense time
+	series.
 	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get the positions for each date/time
-	pos,lt = sp.spkpos('VEX',et,'VENUSVSO','NONE','VENUS')
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]		
+	'''
+	if Surrogate:
+		et = GetET(Date,ut,Format)
+		kernels = lambda d: [lsk_path,spk_kernel,pck_kernel,vso_kernel] + list(ListVenusSPK(d))
+		pos = SurrogatePos('VEX',et,'VENUSVSO','VENUS',kernels)
+		return (pos.T[0],pos.T[1],pos.T[2])
 	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	for vk in VEXspk:
-		sp.unload(vk)
-	sp.unload(pck_kernel)
-	sp.unload(vso_kernel)
+	
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+
+	#load the relevant kernels
+	VEXspk = ListVenusSPK(GetDate(Date,ut,Format))
+	with KM.Use(lsk_path,spk_kernel,VEXspk,pck_kernel,vso_kernel):
+		#get the positions for each date/time
+		pos,lt = sp.spkpos('VEX',et,'VENUSVSO','NONE','VENUS')
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]
 
 	return (x,y,z)
 
 
-def PosHCI(Date,ut):
+def PosHCI(Date,ut=None,Format=None):
 	'''
 	VEX position in HCI coordinates
 	
 	'''
 	
-	#create the output arrays
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	x = np.zeros(n,dtype='float64')
-	y = np.zeros(n,dtype='float64')
-	z = np.zeros(n,dtype='float64')
-		
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+
 	#load the relevant kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	VEXspk = ListVenusSPK(Date)
-	for vk in VEXspk:
-		sp.furnsh(vk)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(vso_kernel)	
-	sp.furnsh(hci_kernel)	
-	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
-			
-	#get the positions for each date/time
-	pos,lt = sp.spkpos('VEX',et,'HCI','NONE','SUN')
-	pos = np.array(pos)
-	x = pos.T[0]
-	y = pos.T[1]
-	z = pos.T[2]		
-	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	for vk in VEXspk:
-		sp.unload(vk)
-	sp.unload(pck_kernel)
-	sp.unload(vso_kernel)
-	sp.unload(hci_kernel)	
+	VEXspk = ListVenusSPK(GetDate(Date,ut,Format))
+	with KM.Use(lsk_path,spk_kernel,VEXspk,pck_kernel,vso_kernel,hci_kernel):
+		#get the positions for each date/time
+		pos,lt = sp.spkpos('VEX',et,'HCI','NONE','SUN')
+		pos = np.array(pos)
+		x = pos.T[0]
+		y = pos.T[1]
+		z = pos.T[2]
 
 	return (x,y,z)
 
@@ -170,46 +135,44 @@ def PosHCI(Date,ut):
 
 
 
-def CarringtonLongitude(Date,ut):
+def CarringtonLongitude(Date,ut=None,Format=None):
 	
-	#create output array
-	n = np.size(ut)
-	et = np.zeros((n,),dtype='float64')
-	lon = np.zeros(n,dtype='float64')
-	if n == 1:
-		ut = np.array([ut])
-		
+	#get the ephemeris times
+	et = GetET(Date,ut,Format)
+
 	#load kernels
-	sp.furnsh(lsk_path)
-	sp.furnsh(spk_kernel)
-	VEXspk = ListVenusSPK(Date)
-	for vk in VEXspk:
-		sp.furnsh(vk)
-	sp.furnsh(pck_kernel)
-	sp.furnsh(hci_kernel)	
-	
-	#do each unique date to speed things up
-	if np.size(Date) == 1 :
-		et[0] = utc2et(Date,0.0)
-		et = et[0] + ut*3600.0
-	else:
-		ud = np.unique(Date)
-		for i in range(0,ud.size):
-			use = np.where(Date == ud[i])[0]
-			tmp = utc2et(ud[i],0.0)
-			et[use] = tmp + ut[use]*3600.0
+	VEXspk = ListVenusSPK(GetDate(Date,ut,Format))
+	with KM.Use(lsk_path,spk_kernel,VEXspk,pck_kernel,hci_kernel):
+		#get the longitudes
+		pos,lt = sp.spkpos('VEX',et,'J2000','NONE','SUN')
+		pos = np.array(pos)
+		lon = CarringtonLon(et,pos.T[0],pos.T[1],pos.T[2],pck_kernel)*180/np.pi
+
+	return lon
+
+
+def Speed(Date,ut=None,Format=None):
+	'''
+	VEX speed relative to the Sun (km/s), from its state vector. If ut
+	is not given then the speed at 12:00 on each date is used.
 	
-	#get the longitudes
-	pos,lt = sp.spkpos('VEX',et,'IAU_SUN','NONE','SUN')
-	pos = np.array(pos)
-	lon = np.arctan2(pos.T[1],pos.T[0])*180/np.pi
+	'''
+	#get the ephemeris times
+	et = GetET(Date,ut,Format,DefaultUT=12.0)
+
+	#load the relevant kernels
+	VEXspk = ListVenusSPK(GetDate(Date,ut,Format))
+	with KM.Use(lsk_path,spk_kernel,VEXspk):
+		v = SunSpeed('VEX',et)
 	
-	#unload kernels
-	sp.unload(lsk_path)
-	sp.unload(spk_kernel)
-	for vk in VEXspk:
-		sp.unload(vk)
-	sp.unload(pck_kernel)	
-	sp.unload(hci_kernel)	
+	return v
 
-	return lon
+def AberrationAngle(Date,Vsw=400.0,*,ut=None,Format=None):
+	'''
+	Aberration angle (degrees) of the solar wind due to the motion of
+	VEX relative to the Sun. Vsw can be an array which broadcasts 
+	against the times (see Body.Aberration), ut and Format can only
+	be given as keywords.
+	
+	'''
+	return Aberration(Speed(Date,ut,Format),Vsw)
@@ -1 +1 @@
-from .VEXPos import PosVSO,PosHCI,CarringtonLongitude,ListVenusSPK
+from .VEXPos import PosVSO,PosHCI,CarringtonLongitude,ListVenusSPK,Speed,AberrationAngle
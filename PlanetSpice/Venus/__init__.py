@@ -1,3 +1,6 @@
-from .Pos import PosHCI,PosHAE,ReadCarringtonRotations,SaveCarringtonRotations,CarringtonLongitude,PosIAU_SUN,SavePos,ReadPos,ReadPosDate,CombinePos,ReadCombinedPos,CombinePosSmall
+from .Pos import PosHCI,PosHAE,ReadCarringtonRotations,SaveCarringtonRotations,CarringtonLongitude,PosIAU_SUN,SavePos,ReadPos,ReadPosDate,MigratePos,CombinePos,ReadCombinedPos,CombinePosSmall,Speed,SaveSpeed,AberrationAngle
 from .Orbit import OrbitHAE,OrbitHCI
-from . import VEX
+from ..Tools.Lazy import LazyImports
+
+#the spacecraft are only imported when they are first used
+LazyImports(__name__,{'VEX' : ('.VEX',None)})
@@ -1,6 +1,24 @@
-from . import Earth
-from . import Mars
-from . import Sun
-from . import Mercury
-from . import Venus
-from .utc2et import utc2et
+#the subpackages and functions are only imported when they are first
+#used, so that importing PlanetSpice is quick and spiceypy, scipy etc.
+#and the SPICE_KERNEL_PATH and SPICE_OUTPUT_PATH environment variables
+#are not needed until then (see Tools/Lazy.py)
+from .Tools.Lazy import LazyImports
+
+LazyImports(__name__,{	'Earth' : ('.Earth',None),
+						'Mars' : ('.Mars',None),
+						'Sun' : ('.Sun',None),
+						'Mercury' : ('.Mercury',None),
+						'Venus' : ('.Venus',None),
+						'utc2et' : ('.utc2et','utc2et'),
+						'et2dateut' : ('.et2dateut','et2dateut'),
+						'KernelManager' : ('.KernelManager',None),
+						'TimeScales' : ('.TimeScales',None),
+						'session' : ('.Session','session'),
+						'Session' : ('.Session','Session'),
+						'SPK' : ('.SPK',None),
+						'Surrogate' : ('.Surrogate',None),
+						'ResultCache' : ('.ResultCache',None),
+						'RegisterBody' : ('.Body','RegisterBody'),
+						'GetBody' : ('.Body','GetBody'),
+						'BatchPos' : ('.Body','BatchPos'),
+						'Events' : ('.Events',None)})
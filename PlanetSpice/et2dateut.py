@@ -0,0 +1,39 @@
+import numpy as np
+from . import Globals
+from .TimeScales import ETtoUTC
+from .Tools.CivilDays import DaysToDate
+
+lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
+
+#days between 19500101 and 20000101
+_days1950 = 18262
+
+def et2dateut(et):
+	'''
+	Convert ephemeris times to dates and times, the inverse of utc2et.
+	
+	Times within a leap second are given as ut >= 24.0 on the day 
+	before the leap second takes effect.
+	
+	Inputs
+	======
+	et : float64
+		Ephemeris time(s)
+		
+	Returns
+	=======
+	Date : int32
+		Date(s) in format yyyymmdd
+	ut : float64
+		Time(s) in hours from beginning of the day
+	utc : float64
+		Continuous time in hours since 00:00 on 19500101 (see ContUT)
+	
+	'''
+	days,sec = ETtoUTC(np.array(et,dtype='float64'),lsk_path)
+	
+	Date = DaysToDate(days)
+	ut = sec/3600.0
+	utc = (days + _days1950)*24.0 + ut
+	
+	return Date,ut,utc
@@ -0,0 +1,76 @@
+'''
+Measure the time taken to import PlanetSpice and to load each of its
+subpackages on first use, each in a fresh Python process.
+
+Usage
+=====
+python benchmarks/import_time.py [Repeats]
+
+'''
+import subprocess
+import sys
+import os
+import tempfile
+import numpy as np
+
+#code to time, run after "import PlanetSpice as ps"
+Tests = [	('import PlanetSpice',''),
+			('ps.utc2et','ps.utc2et'),
+			('ps.Sun','ps.Sun'),
+			('ps.Mercury','ps.Mercury'),
+			('ps.Venus','ps.Venus'),
+			('ps.Earth','ps.Earth'),
+			('ps.Mars','ps.Mars'),
+			('ps.Mercury.Messenger','ps.Mercury.Messenger'),
+			('ps.Events','ps.Events')]
+
+_Script = '''
+import time
+t0 = time.perf_counter()
+import PlanetSpice as ps
+t1 = time.perf_counter()
+{:s}
+t2 = time.perf_counter()
+print(t1 - t0,t2 - t1)
+'''
+
+def TimeImport(Code,Repeats=5):
+	'''
+	Time importing PlanetSpice and then running Code.
+
+	Returns
+	=======
+	t0 : float
+		Median time (s) to import PlanetSpice.
+	t1 : float
+		Median time (s) to run Code afterwards.
+
+	'''
+	env = dict(os.environ)
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	env['PYTHONPATH'] = root + os.pathsep + env.get('PYTHONPATH','')
+
+	#the paths are only needed to exist once the subpackages are used
+	tmp = tempfile.gettempdir()
+	env.setdefault('SPICE_KERNEL_PATH',tmp)
+	env.setdefault('SPICE_OUTPUT_PATH',tmp)
+
+	t = []
+	for i in range(0,Repeats):
+		out = subprocess.run([sys.executable,'-c',_Script.format(Code)],env=env,
+							capture_output=True,text=True,check=True)
+		t.append([float(x) for x in out.stdout.split()])
+	t = np.median(np.array(t),axis=0)
+	return t[0],t[1]
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		Repeats = int(sys.argv[1])
+	else:
+		Repeats = 5
+
+	print('{:24s} {:>12s} {:>15s}'.format('','import (ms)','first use (ms)'))
+	for name,code in Tests:
+		t0,t1 = TimeImport(code,Repeats)
+		print('{:24s} {:12.1f} {:15.1f}'.format(name,t0*1000,t1*1000))
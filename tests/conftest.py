@@ -0,0 +1,91 @@
+'''
+Several modules build their kernel paths from $SPICE_KERNEL_PATH when
+they are imported, so if either environment variable is missing it is
+pointed at an empty temporary directory. The tests which don't need
+any kernels can then run anywhere, and those which do are skipped.
+
+The fake fixture replaces SPICE within the kernel manager, recording
+the kernels furnished and unloaded instead.
+
+'''
+import os
+import atexit
+import shutil
+import tempfile
+import pytest
+
+for var in ['SPICE_KERNEL_PATH','SPICE_OUTPUT_PATH']:
+	if os.getenv(var) is None:
+		path = tempfile.mkdtemp(prefix='PlanetSpice')
+		atexit.register(shutil.rmtree,path,True)
+		os.environ[var] = path
+
+
+class FakeSpice(object):
+	'''
+	Records the calls to furnsh and unload, and the SPICE load order.
+
+	'''
+	def __init__(self):
+		self.calls = []
+		self.order = []
+
+	def furnsh(self,k):
+		self.calls.append(('furnsh',k))
+		self.order.append(k)
+
+	def unload(self,k):
+		self.calls.append(('unload',k))
+		self.order.remove(k)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+	'''
+	Replace SPICE and the process-wide manager used by the module
+	functions.
+
+	'''
+	sp = FakeSpice()
+	from PlanetSpice import KernelManager as KM
+	monkeypatch.setattr(KM,'sp',sp)
+	m = KM.KernelManager()
+	for name in ['Furnsh','Unload','Use','Pin','Unpin','IsLoaded','Loaded','SetBudget','Evict','Clear']:
+		monkeypatch.setattr(KM,name,getattr(m,name))
+	return sp,m
+
+
+#a shortened leap seconds kernel (the leap seconds are real, but those
+#between 1972 and 2006 are left out)
+_LSK = '''KPL/LSK
+\\begindata
+DELTET/DELTA_T_A = 32.184
+DELTET/K = 1.657D-3
+DELTET/EB = 1.671D-2
+DELTET/M = ( 6.239996D0 1.99096871D-7 )
+DELTET/DELTA_AT = ( 10, @1972-JAN-1
+                    33, @2006-JAN-1
+                    34, @2009-JAN-1
+                    35, @2012-JUL-1 )
+\\begintext
+'''
+
+@pytest.fixture
+def lsk(monkeypatch,tmp_path):
+	'''
+	Write a leap seconds kernel and use it for the NumPy time
+	conversions, starting with an empty table of day start times.
+
+	'''
+	import numpy as np
+	import importlib
+	fname = str(tmp_path/'test.tls')
+	f = open(fname,'w')
+	f.write(_LSK)
+	f.close()
+	for m in ['utc2et','et2dateut','TimeScales']:
+		monkeypatch.setattr(importlib.import_module('PlanetSpice.'+m),'lsk_path',fname)
+	D = importlib.import_module('PlanetSpice.DayStartET')
+	monkeypatch.setattr(D,'_day0',0)
+	monkeypatch.setattr(D,'_table',np.zeros((0,2),dtype='float64'))
+	return fname
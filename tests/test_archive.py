@@ -0,0 +1,130 @@
+'''
+Test the columnar position archive, and reading the per-day files
+written by older versions of SavePos. Everything is kept in a temporary
+output directory.
+
+'''
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice import Body as B
+from PlanetSpice.Tools.Archive import Archive
+from PlanetSpice.Tools.CivilDays import DateToDays,DaysToDate
+from PlanetSpice.Tools.Manifest import Manifest,KernelKey
+
+
+@pytest.fixture
+def body(monkeypatch,tmp_path):
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+	k = str(tmp_path/'k.tls')
+	f = open(k,'w')
+	f.write('\\begindata\nA = 1\n')
+	f.close()
+	return B.Body('Test',Kernels=[k])
+
+
+def Positions(Dates,nut=24):
+	'''
+	Some records with different values on each date and hour.
+
+	'''
+	Dates = np.array(Dates,dtype='int32')
+	data = np.recarray(Dates.size*nut,dtype=B.dtype)
+	data.fill(0)
+	data.Date = np.repeat(Dates,nut)
+	data.ut = np.tile(np.arange(nut,dtype='float32'),Dates.size)
+	data.utc = DateToDays(data.Date)*24.0 + data.ut
+	data.xHCI = data.utc*2.0
+	data.LonHCI = data.ut + 1.0
+	return data
+
+
+def SaveLegacy(fname,data):
+	'''
+	Write a file in the format of RecarrayTools.SaveRecarray.
+
+	'''
+	f = open(fname,'wb')
+	np.int32(data.size).tofile(f)
+	for name in data.dtype.names:
+		np.ascontiguousarray(data[name]).tofile(f)
+	f.close()
+
+
+def test_LegacyRead(body):
+	#the archive has some dates, the old per-day files others
+	archive = body._Archive()
+	archive.Write(Positions([20110101,20110103]))
+	for d in [20110102,20110103,20110104]:
+		SaveLegacy(archive.Path + '/{:08d}.bin'.format(d),Positions([d],nut=d % 10))
+
+	data = body.ReadPos(20110101,20110104)
+	assert (np.unique(data.Date) == [20110101,20110102,20110103,20110104]).all()
+	assert (np.diff(data.utc) > 0).all()
+
+	#the archive takes priority
+	assert (data.Date == 20110103).sum() == 24
+	assert (data.Date == 20110104).sum() == 4
+	expect = np.concatenate([Positions([20110101]),Positions([20110102],2),Positions([20110103]),Positions([20110104],4)]).view(np.recarray)
+	assert (data == expect).all()
+
+	#a subset of the fields, or a single date
+	data = body.ReadPos(20110102,20110104,Fields=['utc','xHCI'])
+	assert data.dtype.names == ('utc','xHCI')
+	assert (data.xHCI == expect.xHCI[24:]).all()
+	assert (body.ReadPosDate(20110102) == Positions([20110102],2)).all()
+
+
+def test_MigratePos(body):
+	archive = body._Archive()
+	archive.Write(Positions([20110101]))
+	for d in [20110101,20110102,20101231]:
+		SaveLegacy(archive.Path + '/{:08d}.bin'.format(d),Positions([d],nut=3))
+	before = body.ReadPos(20101231,20110102)
+
+	body.MigratePos(Remove=True)
+	assert not any([f.endswith('.bin') for f in os.listdir(archive.Path)])
+	assert (archive.Dates() == [20101231,20110101,20110102]).all()
+	assert (body.ReadPos(20101231,20110102) == before).all()
+
+	#the copied dates don't need saving again
+	manifest = Manifest(archive.Path + '/manifest.npz')
+	key = KernelKey(body.Kernels)
+	assert (manifest.Todo([20101230,20101231,20110101,20110102],key) == [20101230,20110101]).all()
+
+
+def test_ArchiveYears(tmp_path):
+	a = Archive(str(tmp_path/'Pos'),B.dtype,24)
+	Dates = np.array([20111230,20111231,20120101,20120102,20121231,20130101])
+	data = np.concatenate([Positions([d],nut=1 + i*4) for i,d in enumerate(Dates)]).view(np.recarray)
+	a.Write(data)
+
+	assert sorted(os.listdir(str(tmp_path/'Pos'))) == ['2011','2012','2013']
+	assert (a.Dates() == Dates).all()
+	assert (a.Read(20111201,20130131) == data).all()
+
+	#ranges across the year boundaries, and parts of years
+	for d0,d1 in [(20111231,20120101),(20120101,20120101),(20120102,20130101),(20111230,20111230)]:
+		use = (data.Date >= d0) & (data.Date <= d1)
+		assert (a.Read(d0,d1) == data[use]).all()
+	assert a.Read(20120103,20121230).size == 0
+	assert a.Read(20140101,20141231).size == 0
+
+	#only the fields asked for
+	out = a.Read(20111231,20120101,['utc','LonHCI'])
+	assert out.dtype.names == ('utc','LonHCI')
+	use = (data.Date >= 20111231) & (data.Date <= 20120101)
+	assert (out.LonHCI == data.LonHCI[use]).all()
+
+	#writing a date again replaces it
+	new = Positions([20120101],nut=2)
+	new.xHCI = -1.0
+	a.Write(new)
+	assert (a.Read(20120101,20120101) == new).all()
+	assert (a.Read(20111231,20111231) == data[data.Date == 20111231]).all()
+
+	with pytest.raises(ValueError):
+		a.Write(Positions([20120105],nut=25))
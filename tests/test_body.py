@@ -0,0 +1,132 @@
+'''
+Test the common body engine. Registering bodies needs no kernels, the
+positions are compared with spkpos and pxform using the kernels in
+$SPICE_KERNEL_PATH and are skipped without them.
+
+'''
+import os
+import numpy as np
+import pytest
+
+sp = pytest.importorskip('spiceypy')
+
+from PlanetSpice import Globals
+from PlanetSpice import Body as B
+from PlanetSpice import KernelManager as KM
+from PlanetSpice.utc2et import utc2et
+
+
+def Kernels():
+	kernels = [B.lsk_path,B.spk_kernel,B.pck_kernel,B.hci_kernel]
+	for k in kernels:
+		if not os.path.isfile(k):
+			pytest.skip('Kernel not found: '+k)
+	return kernels
+
+
+@pytest.fixture
+def registry(monkeypatch):
+	'''
+	Keep bodies and kernel sets registered by a test out of the others.
+
+	'''
+	monkeypatch.setattr(B,'Bodies',dict(B.Bodies))
+	monkeypatch.setattr(KM,'KernelSets',dict(KM.KernelSets))
+
+
+def test_RegisterBody(registry):
+	body = B.RegisterBody('Jupiter','5')
+	assert B.GetBody('Jupiter') is body
+	assert body.NAIF == '5'
+	assert body.SPK == B.spk_kernel
+	assert body.Kernels == [B.lsk_path,B.spk_kernel,B.pck_kernel,B.hci_kernel]
+	assert KM.GetSet('Jupiter') == KM.KernelList([body.Kernels])
+	assert body._OutPath() == Globals.OutputPath + 'Jupiter/'
+
+	body = B.RegisterBody('Comet',1000012,SPK='comet.bsp',Kernels=['a.tls','comet.bsp'])
+	assert body.NAIF == '1000012'
+	assert body.SPK == 'comet.bsp'
+	assert B.GetBody('Comet').Kernels == ['a.tls','comet.bsp']
+
+	with pytest.raises(KeyError):
+		B.GetBody('Pluto')
+
+
+def test_GetBody():
+	#the planets are registered when their subpackages are first
+	#imported (and stay registered, so they aren't kept separate here)
+	body = B.GetBody('Venus')
+	import PlanetSpice.Venus as V
+	assert V.Pos.Venus is body
+	assert body.NAIF == 'VENUS'
+	assert V.PosHCI.__self__ is body
+	assert KM.HasSet('Venus')
+
+
+def test_Pos():
+	kernels = Kernels()
+	body = B.GetBody('Mercury')
+	Date = np.array([20080114,20110318,20120630,20150430])
+	ut = np.array([19.0,1.0,23.5,0.0])
+	et = utc2et(Date,ut)
+
+	sp.furnsh(kernels)
+	try:
+		expect = {}
+		for f in ['HCI','ECLIPDATE','J2000']:
+			pos,lt = sp.spkpos('MERCURY',et,f,'NONE','SUN')
+			expect[f] = np.array(pos)
+		iau = np.array([sp.pxform('J2000','IAU_SUN',e) @ p for e,p in zip(et,expect['J2000'])])
+	finally:
+		sp.unload(kernels)
+
+	#Pos uses the day start ephemeris times, which differ from utc2et by
+	#up to ~1e-7 s (a few mm here)
+	for f,s in [('HCI','HCI'),('HAE','ECLIPDATE'),('J2000','J2000')]:
+		assert np.abs(np.array(body.Pos(Date,ut,f)).T - expect[s]).max() < 1e-4
+	assert np.abs(np.array(body.PosHCI(Date,ut,Native=True)).T - expect['HCI']).max() < 1e-3
+	assert np.abs(np.array(body.PosIAU_SUN(Date,ut)).T - iau).max() < 1e-3
+	assert np.abs(np.array(body.PosET(et,'HCI')).T - expect['HCI']).max() < 1e-6
+
+	#the recarray has the same positions
+	data = body.PosRecarray(Date,ut)
+	assert (data.Date == Date).all()
+	assert np.abs(np.array([data.xHCI,data.yHCI,data.zHCI]).T*B.AU - expect['HCI']).max() < 1e-3
+	assert np.allclose(data.Rsun*B.AU,np.sqrt(np.sum(expect['HCI']**2,axis=1)))
+
+
+def test_Aberration():
+	assert B.Aberration(400.0,400.0) == pytest.approx(45.0)
+	V = np.array([30.0,40.0,50.0])
+	assert np.allclose(B.Aberration(V),np.arctan(V/400.0)*180.0/np.pi)
+
+	#one solar wind speed per time, or several per time
+	assert B.Aberration(V,np.array([300.0,400.0,500.0])).shape == (3,)
+	a = B.Aberration(V,np.array([[300.0,600.0]]*3))
+	assert a.shape == (3,2)
+	assert np.allclose(a[:,1],np.arctan(V/600.0)*180.0/np.pi)
+
+
+def test_Speed():
+	kernels = Kernels()
+	body = B.GetBody('Mercury')
+	Date = np.array([20080114,20110318,20120630,20150430])
+	et = utc2et(Date,np.zeros(Date.size) + 12.0)
+
+	#central differences of the position over +/-1 s
+	sp.furnsh(kernels)
+	try:
+		p0,lt = sp.spkpos('MERCURY',et - 1.0,'J2000','NONE','SUN')
+		p1,lt = sp.spkpos('MERCURY',et + 1.0,'J2000','NONE','SUN')
+	finally:
+		sp.unload(kernels)
+	v = np.sqrt(np.sum(((np.array(p1) - np.array(p0))/2.0)**2,axis=1))
+
+	#defaults to midday, and accepts other time formats
+	assert np.abs(body.Speed(Date) - v).max() < 1e-6
+	assert np.abs(body.Speed(et,Format='et') - v).max() < 1e-6
+	assert np.abs(body.Speed(Date[1],12.0) - v[1]).max() < 1e-6
+
+	a = body.AberrationAngle(Date,[[400.0,800.0]]*4)
+	assert np.allclose(a,np.arctan(v[:,None]/[400.0,800.0])*180.0/np.pi)
+	assert np.allclose(body.AberrationAngle(Date[:1],ut=12.0),B.Aberration(v[:1]))
@@ -0,0 +1,132 @@
+'''
+Test the vectorised date tools against loops over Python's datetime,
+which step through the dates one at a time in the same way as the
+original ContUT and ListDates did using DateTimeTools.
+
+'''
+import datetime
+import numpy as np
+import pytest
+
+from PlanetSpice.Tools.CivilDays import DateToDays,DaysToDate
+from PlanetSpice.Tools.ContUT import ContUT,ContUTtoDate
+from PlanetSpice.Tools.ListDates import ListDates,DateChunks
+
+
+def ToDate(d):
+	return d.year*10000 + d.month*100 + d.day
+
+
+def FromDate(Date):
+	return datetime.date(Date//10000,(Date % 10000)//100,Date % 100)
+
+
+def LoopContUT(Date,ut):
+	'''
+	The original loop over each unique date, counting the days from
+	1950-01-01.
+
+	'''
+	utc = np.array(ut,dtype='float64')
+	for d in np.unique(Date):
+		use = np.where(Date == d)[0]
+		utc[use] += (FromDate(d) - datetime.date(1950,1,1)).days*24.0
+	return utc
+
+
+#random dates between 1600 and 2400
+_rng = np.random.default_rng(1)
+_days = _rng.integers(-146097,146097,2000)
+Dates = np.array([ToDate(datetime.date(2000,1,1) + datetime.timedelta(days=int(d))) for d in _days])
+
+
+def test_CivilDays():
+	assert (DateToDays(Dates) == _days).all()
+	assert (DaysToDate(_days) == Dates).all()
+	assert DateToDays(20000101) == 0
+	assert DaysToDate(-1) == 19991231
+
+	#the leap days
+	for yr in [1900,2000,2012,2100]:
+		d = DateToDays(yr*10000 + 301) - DateToDays(yr*10000 + 228)
+		assert d == (2 if yr in [2000,2012] else 1)
+
+
+def test_ContUT():
+	ut = _rng.uniform(0.0,24.0,Dates.size)
+	utc = ContUT(Dates,ut)
+	assert (utc == LoopContUT(Dates,ut)).all()
+	assert ContUT(19500101,0.0) == 0.0
+
+	#into an existing array, and from a scalar date
+	out = np.zeros(Dates.size)
+	assert ContUT(Dates,ut,out=out) is out
+	assert (out == utc).all()
+	assert (ContUT(20120630,np.arange(25.0)) == LoopContUT(np.zeros(25,dtype='int32') + 20120630,np.arange(25.0))).all()
+
+
+def test_ContUTtoDate():
+	ut = np.floor(_rng.uniform(0.0,24.0,Dates.size)*3600.0)/3600.0
+	Date,ut1 = ContUTtoDate(ContUT(Dates,ut))
+	assert (Date == Dates).all()
+	assert np.abs(ut1 - ut).max() < 1e-6
+
+	#midnight belongs to the next day
+	Date,ut = ContUTtoDate(ContUT(20111231,24.0))
+	assert Date == 20120101 and ut == 0.0
+
+
+def LoopDates(Date0,Date1,Step=1,Monthly=False):
+	'''
+	The original loop, stepping forward one date at a time while the
+	date is before Date1.
+
+	'''
+	d0 = FromDate(Date0)
+	out = [Date0]
+	i = 0
+	while True:
+		i += 1
+		if Monthly:
+			m = d0.year*12 + d0.month - 1 + i*Step
+			yr,mn = m//12,m % 12 + 1
+			ndays = (datetime.date(yr + mn//12,mn % 12 + 1,1) - datetime.date(yr,mn,1)).days
+			d = datetime.date(yr,mn,min(d0.day,ndays))
+		else:
+			d = d0 + datetime.timedelta(days=i*Step)
+		if ToDate(d) > Date1:
+			return np.array(out)
+		out.append(ToDate(d))
+
+
+@pytest.mark.parametrize('Date0,Date1,Step,Monthly',[
+	(19500101,20500101,1,False),
+	(20111215,20120310,1,False),
+	(20110101,20111231,7,False),
+	(20120229,20160301,365,False),
+	(20120131,20130331,1,True),
+	(20111130,20140228,3,True),
+	(19500101,20500101,12,True)])
+def test_ListDates(Date0,Date1,Step,Monthly):
+	expect = LoopDates(Date0,Date1,Step,Monthly)
+	dates = ListDates(Date0,Date1,Step,Monthly)
+	assert dates.dtype == np.int32
+	assert (dates == expect).all()
+
+	#the chunks join up to the same list
+	chunks = list(DateChunks(Date0,Date1,97,Step,Monthly))
+	assert max([c.size for c in chunks]) <= 97
+	assert (np.concatenate(chunks) == expect).all()
+
+
+def test_ListDatesEnds():
+	#a single date, or an end before the start
+	assert (ListDates(20120101,20120101) == [20120101]).all()
+	assert (ListDates(20120101,20111231) == [20120101]).all()
+
+	#an end date which doesn't exist is treated as the next real date,
+	#as the original loop (which stepped on while the date was before
+	#Date1) did
+	assert ListDates(20150425,20150431).tolist() == [20150425,20150426,20150427,20150428,20150429,20150430,20150501]
+	assert ListDates(20150101,20150229,Monthly=True).tolist() == [20150101,20150201,20150301]
+	assert ListDates(20150131,20150431,Monthly=True).tolist() == [20150131,20150228,20150331,20150430]
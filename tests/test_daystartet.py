@@ -0,0 +1,144 @@
+'''
+Test the table of ephemeris times at the start of each day against
+utc2et, using the leap seconds kernel written by the lsk fixture in
+conftest.py.
+
+'''
+import importlib
+import threading
+import numpy as np
+import pytest
+
+sp = pytest.importorskip('spiceypy')
+
+from PlanetSpice.utc2et import utc2et
+from PlanetSpice.Tools.ListDates import ListDates
+
+D = importlib.import_module('PlanetSpice.DayStartET')
+
+
+def test_DayStartET(lsk):
+	Date = np.array([20120630,20120701,19991231,20110318])
+	assert np.abs(D.DayStartET(Date) - utc2et(Date,np.zeros(Date.size))).max() < 1e-6
+	assert np.abs(D.DayStartET(20110318)[0] - utc2et(20110318,0.0)) < 1e-6
+
+
+def test_Extend(lsk):
+	D.DayStartET([20110101])
+	assert D._table.shape[0] == 1
+
+	#the table grows to cover the new days, keeping the old ones
+	old = D._table
+	D.DayStartET([20101225,20110110])
+	assert D._table.shape[0] == 17
+	Date = ListDates(20101225,20110110)
+	assert np.abs(D._table[:,0] - utc2et(Date,np.zeros(Date.size))).max() < 1e-6
+	assert (D._table[7] == old[0]).all()
+
+	#days already covered don't change it
+	table = D._table
+	D.DayStartET([20110105])
+	assert D._table is table
+
+
+def test_MaxDays(lsk,monkeypatch):
+	monkeypatch.setattr(D,'MaxDays',10)
+
+	#the table starts again rather than growing beyond MaxDays
+	D.DayStartET([20110101,20110105])
+	assert D._table.shape[0] == 5
+	et = D.DayStartET([20110120])
+	assert D._table.shape[0] == 1
+	assert np.abs(et[0] - utc2et(20110120,0.0)) < 1e-6
+
+	#ranges longer than MaxDays are converted without the table
+	Date = ListDates(20110101,20110131)
+	et = D.DayStartET(Date)
+	assert np.abs(et - utc2et(Date,np.zeros(Date.size))).max() < 1e-6
+	assert D._table.shape[0] == 1
+
+
+def test_Lock(lsk):
+	#the table can't be changed while another thread holds the lock
+	out = []
+	t = threading.Thread(target=lambda: out.append(D.DayStartET([20110318])))
+	with D._lock:
+		t.start()
+		t.join(0.2)
+		assert t.is_alive()
+		assert D._table.shape[0] == 0
+	t.join()
+	assert np.abs(out[0][0] - utc2et(20110318,0.0)) < 1e-6
+
+	#many threads extending the table at once
+	Date = ListDates(20100101,20121231)
+	res = {}
+	def Work(i):
+		res[i] = D.DayStartET(Date[i::8])
+	threads = [threading.Thread(target=Work,args=(i,)) for i in range(0,8)]
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+	et = utc2et(Date,np.zeros(Date.size))
+	for i in range(0,8):
+		assert np.abs(res[i] - et[i::8]).max() < 1e-6
+
+
+
+def test_TimeOfDay(lsk):
+	#TDB - UTC drifts through each day, including the leap second
+	Date = np.repeat(ListDates(20120629,20120702),25)
+	ut = np.tile(np.arange(25)*(24.0 + 1.0/3600)/24,4)
+	assert np.abs(D.GetET(Date,ut) - utc2et(Date,ut)).max() < 1e-6
+
+
+
+#times either side of the leap second at the end of 2012-06-30
+Times = ['2011-03-18T01:00:00.250','2012-06-30T23:59:59','2012-07-01T00:00:00','2012-07-01T00:00:01','1999-12-31T12:00:00']
+
+
+def test_Datetime64toET(lsk):
+	t = np.array(Times,dtype='datetime64[ns]')
+	Date = np.array([int(s[:10].replace('-','')) for s in Times])
+	ut = np.array([int(s[11:13]) + int(s[14:16])/60.0 + float(s[17:])/3600.0 for s in Times])
+	et = utc2et(Date,ut)
+
+	assert np.abs(D.Datetime64toET(t) - et).max() < 1e-6
+	assert np.abs(D.Datetime64toET(t.astype('datetime64[ms]')) - et).max() < 1e-6
+	assert np.abs(D.GetET(t) - et).max() < 1e-6
+
+	#and against SPICE
+	sp.furnsh(lsk)
+	try:
+		spet = np.array([sp.str2et(s) for s in Times])
+	finally:
+		sp.unload(lsk)
+	assert np.abs(D.Datetime64toET(t) - spet).max() < 1e-6
+
+
+def test_UnixtoET(lsk):
+	t = np.array(Times,dtype='datetime64[ns]')
+	unix = t.view('int64')*1e-9
+	assert np.abs(D.UnixtoET(unix) - D.Datetime64toET(t)).max() < 1e-6
+	assert np.abs(D.GetET(unix,Format='unix') - D.Datetime64toET(t)).max() < 1e-6
+	assert np.abs(D.GetET(unix,Format='Unix') - D.Datetime64toET(t)).max() < 1e-6
+
+
+def test_GetET(lsk):
+	Date = np.array([20110318,20120701])
+	et = utc2et(Date,np.array([1.0,1.0]))
+	assert np.abs(D.GetET(Date,1.0) - et).max() < 1e-6
+	assert (D.GetET(et,Format='et') == et).all()
+	assert np.abs(D.GetET(Date,DefaultUT=1.0) - et).max() < 1e-6
+	assert (D.GetDate(et,Format='et') == Date).all()
+
+	#yyyymmdd dates without ut could be mistaken for other times
+	with pytest.raises(ValueError):
+		D.GetET(Date)
+	with pytest.raises(ValueError):
+		D.GetET(et)
+	with pytest.raises(ValueError):
+		D.GetET(et,1.0,Format='et')
+	with pytest.raises(ValueError):
+		D.GetET(et,Format='jd')
@@ -0,0 +1,169 @@
+'''
+Test the event search on analytic functions of ephemeris time (using
+the leap seconds kernel written by the lsk fixture in conftest.py) and
+the planet searches against brute-force scans, which need the kernels
+in $SPICE_KERNEL_PATH and are skipped without them.
+
+'''
+import os
+import numpy as np
+import pytest
+
+sp = pytest.importorskip('spiceypy')
+
+from PlanetSpice import Globals
+from PlanetSpice import Events
+from PlanetSpice.utc2et import utc2et
+from PlanetSpice.Tools.ContUT import ContUT
+
+#period (s) of the test functions
+P = 1.3*86400.0
+
+Date0 = 20110101
+Date1 = 20110110
+
+
+def EventET(ev):
+	'''
+	Ephemeris times of events, from their continuous time (there are no
+	leap seconds within the test range).
+
+	'''
+	return utc2et(Date0,0.0) + (ev.utc - ContUT(Date0,0.0))*3600.0
+
+
+def Expected(et):
+	'''
+	Multiples of P/2 within the search range.
+
+	'''
+	k = np.arange(np.ceil(2*et[0]/P),np.floor(2*et[1]/P) + 1)
+	return k,k*P/2
+
+
+def test_Crossing(lsk):
+	F = lambda et: np.sin(2*np.pi*et/P)
+	k,t = Expected([utc2et(Date0,0.0),utc2et(Date1,24.0)])
+
+	for Direction,use in [(0,k == k),(1,k % 2 == 0),(-1,k % 2 == 1)]:
+		ev = Events.FindEvents(F,Date0,Date1,'crossing',Direction=Direction,ET=True)
+		assert ev.size == use.sum()
+		assert np.abs(EventET(ev) - t[use]).max() < 1e-2
+
+
+def test_Threshold(lsk):
+	F = lambda et: np.sin(2*np.pi*et/P)
+	k,t = Expected([utc2et(Date0,0.0),utc2et(Date1,24.0)])
+
+	ev = Events.FindEvents(F,Date0,Date1,'threshold',Direction=-1,ET=True)
+	assert np.abs(EventET(ev) - t[k % 2 == 1]).max() < 1e-2
+
+	#a direction is needed
+	with pytest.raises(ValueError):
+		Events.FindEvents(F,Date0,Date1,'threshold',ET=True)
+	with pytest.raises(ValueError):
+		Events.FindEvents(F,Date0,Date1,'peak',ET=True)
+
+
+def test_MinMax(lsk):
+	F = lambda et: np.cos(2*np.pi*et/P)
+	k,t = Expected([utc2et(Date0,0.0),utc2et(Date1,24.0)])
+
+	#maxima at even multiples of P/2, minima at odd ones
+	ev = Events.FindEvents(F,Date0,Date1,'max',ET=True)
+	assert np.abs(EventET(ev) - t[k % 2 == 0]).max() < 1e-2
+	ev = Events.FindEvents(F,Date0,Date1,'min',ET=True)
+	assert np.abs(EventET(ev) - t[k % 2 == 1]).max() < 1e-2
+
+
+def test_Hidden(lsk):
+	#pairs of crossings closer together than the coarse step, found by
+	#the finer sampling around the turning points
+	F = lambda et: np.cos(2*np.pi*et/P)
+	k,t = Expected([utc2et(Date0,0.0),utc2et(Date1,24.0)])
+	dt = np.arccos(0.9995)*P/(2*np.pi)
+	assert 2*dt < 3600.0
+
+	ev = Events.FindEvents(F,Date0,Date1,'crossing',Level=0.9995,ET=True)
+	peaks = t[k % 2 == 0]
+	expect = np.sort(np.append(peaks - dt,peaks + dt))
+	assert ev.size == expect.size
+	assert np.abs(EventET(ev) - expect).max() < 1e-2
+
+
+def test_DateFunc(lsk):
+	#functions of Date and ut give the same events
+	F = lambda et: np.sin(2*np.pi*et/P)
+	G = lambda Date,ut: F(utc2et(Date,ut))
+	ev = Events.FindEvents(F,Date0,Date1,ET=True)
+	evd = Events.FindEvents(G,Date0,Date1)
+	assert np.abs(EventET(ev) - EventET(evd)).max() < 1e-2
+
+
+def Kernels():
+	lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
+	spk_kernel = Globals.SpicePath + '/bodies/de432s.bsp'
+	pck_kernel = Globals.SpicePath + '/bodies/pck00010.tpc'
+	hci_kernel = Globals.SpicePath + '/frames/tk/sunframes.tk'
+	kernels = [lsk_path,spk_kernel,pck_kernel,hci_kernel]
+	for k in kernels:
+		if not os.path.isfile(k):
+			pytest.skip('Kernel not found: '+k)
+	return kernels
+
+
+def Scan(Func,Date0,Date1,Step):
+	'''
+	Sample a function of ET on a regular grid.
+
+	'''
+	et0 = utc2et(Date0,0.0)
+	et1 = utc2et(Date1,24.0)
+	t = np.arange(et0,et1,Step)
+	return t,Func(t)
+
+
+def test_Perihelia():
+	kernels = Kernels()
+	def R(et):
+		sp.furnsh(kernels[1])
+		try:
+			pos,lt = sp.spkpos('MERCURY',et,'J2000','NONE','SUN')
+		finally:
+			sp.unload(kernels[1])
+		return np.sqrt(np.sum(np.array(pos)**2,axis=1))
+
+	ev = Events.Perihelia('Mercury',20110101,20111231)
+	et = utc2et(ev.Date,ev.ut.astype('float64'))
+
+	#local minima of the hourly distance
+	t,r = Scan(R,20110101,20111231,3600.0)
+	i = np.where((r[1:-1] < r[:-2]) & (r[1:-1] < r[2:]))[0] + 1
+	assert et.size == i.size
+	assert np.abs(et - t[i]).max() < 3600.0
+
+	#and within a finer scan around each one
+	for e in et:
+		tt = e + np.arange(-600.0,601.0,1.0)
+		assert np.abs(tt[np.argmin(R(tt))] - e) <= 60.0
+
+
+def test_Conjunctions():
+	Kernels()
+	from PlanetSpice import Venus,Earth
+	def DLon(et):
+		xp,yp,zp = Venus.PosHCI(et,Format='et')
+		xe,ye,ze = Earth.PosHCI(et,Format='et')
+		dlon = np.arctan2(yp,xp) - np.arctan2(ye,xe)
+		return (dlon + np.pi) % (2*np.pi) - np.pi
+
+	ev = Events.Conjunctions('Venus',20000101,20100101)
+	et = utc2et(ev.Date,ev.ut.astype('float64'))
+	assert np.abs(DLon(et)).max() < 1e-5
+
+	#sign changes of the daily longitude difference, ignoring the
+	#jumps when the planets are on opposite sides of the Sun
+	t,d = Scan(DLon,20000101,20100101,86400.0)
+	i = np.where((d[:-1]*d[1:] <= 0) & (np.abs(d[1:] - d[:-1]) < np.pi))[0]
+	assert et.size == i.size
+	assert ((et >= t[i]) & (et <= t[i+1])).all()
@@ -0,0 +1,78 @@
+'''
+Test the vectorised crossing finder on analytic functions, against the
+crossings found by a brute-force scan.
+
+'''
+import numpy as np
+import pytest
+
+from PlanetSpice.Tools.FindCrossings import FindCrossings,FindBrackets,RefineRoots
+
+
+def Scan(Func,t0,t1,dt,Level,Direction,Wrap=None):
+	'''
+	Find the crossings one step at a time, bisecting each one.
+
+	'''
+	out = []
+	t = t0
+	while t + dt <= t1:
+		a,b = t,t + dt
+		fa,fb = Func(np.array([a]))[0] - Level,Func(np.array([b]))[0] - Level
+		up = fa < 0 and fb >= 0
+		down = fa > 0 and fb <= 0
+		jump = not Wrap is None and abs(fb - fa) >= Wrap/2.0
+		if ((Direction <= 0 and down) or (Direction >= 0 and up)) and not jump:
+			while b - a > 1e-9:
+				c = 0.5*(a + b)
+				fc = Func(np.array([c]))[0] - Level
+				if fc*fa > 0:
+					a,fa = c,fc
+				else:
+					b = c
+			out.append(b)
+		t += dt
+	return np.array(out)
+
+
+def Sin(t):
+	return np.sin(t) + 0.3*np.sin(3.1*t)
+
+
+@pytest.mark.parametrize('Direction',[-1,0,1])
+@pytest.mark.parametrize('Level',[0.0,0.5])
+def test_FindCrossings(Direction,Level):
+	t = FindCrossings(Sin,0.0,50.0,0.1,Level=Level,Direction=Direction,Tol=1e-9)
+	s = Scan(Sin,0.0,50.0,0.1,Level,Direction)
+	assert t.size == s.size
+	assert t.size > 5
+	assert np.abs(t - s).max() < 1e-6
+	assert np.abs(Sin(t) - Level).max() < 1e-6
+
+
+def test_Wrap():
+	#a longitude which increases steadily, wrapping at +/-pi
+	def Lon(t):
+		return (t + np.pi) % (2*np.pi) - np.pi
+	t = FindCrossings(Lon,0.0,40.0,0.1,Direction=1,Wrap=2*np.pi,Tol=1e-9)
+	assert np.abs(t - 2*np.pi*np.arange(1,7)).max() < 1e-6
+
+	#without Wrap, the jumps from pi to -pi are also found
+	t = FindCrossings(Lon,0.0,40.0,0.1,Direction=-1,Tol=1e-9)
+	assert np.abs(t - np.pi*(2*np.arange(6) + 1)).max() < 0.1
+
+
+def test_Brackets():
+	f = np.array([1.0,-1.0,0.0,2.0,0.0,-3.0])
+	assert (FindBrackets(f,-1) == [0,3]).all()
+	assert (FindBrackets(f,1) == [1]).all()
+	assert (FindBrackets(f,0) == [0,1,3]).all()
+
+
+def test_RefineRoots():
+	#exact roots at the ends of brackets are returned as they are
+	ta = np.array([0.0,1.0,2.5])
+	tb = np.array([1.0,np.pi,3.5])
+	t = RefineRoots(np.sin,ta,tb,np.sin(ta),np.sin(tb),Tol=1e-12)
+	assert t[0] == 0.0
+	assert np.abs(t[1:] - np.pi).max() < 1e-9
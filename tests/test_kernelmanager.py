@@ -0,0 +1,265 @@
+'''
+Test the kernel manager without SPICE: spiceypy's furnsh and unload are
+replaced with functions which record the calls made (the fake fixture in
+conftest.py), and the kernels are small text and DAF files written for
+each test.
+
+'''
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice import KernelManager as KM
+from PlanetSpice.Session import Session
+from PlanetSpice.Tools.KernelContents import KernelsOverlap
+
+
+def TextKernel(path,names):
+	'''
+	Write a text kernel defining each of the variables in names.
+
+	'''
+	f = open(str(path),'w')
+	f.write('KPL/FK\n\\begindata\n')
+	for n in names:
+		f.write('{:s} = ( 1.0 )\n'.format(n))
+	f.write('\\begintext\n')
+	f.close()
+	return str(path)
+
+
+def SPKKernel(path,segments):
+	'''
+	Write the file and summary records of a little-endian DAF/SPK file,
+	with one summary for each (target,start,end) in segments.
+
+	'''
+	nd,ni = 2,6
+	rec = bytearray(1024)
+	rec[:8] = b'DAF/SPK '
+	rec[8:16] = np.array([nd,ni],dtype='<i4').tobytes()
+	rec[76:88] = np.array([2,2,0],dtype='<i4').tobytes()
+	rec[88:96] = b'LTL-IEEE'
+
+	srec = np.zeros(128,dtype='<f8')
+	srec[2] = len(segments)
+	ns = nd + (ni + 1)//2
+	for i,(target,t0,t1) in enumerate(segments):
+		s = np.zeros(ns,dtype='<f8')
+		s[0] = t0
+		s[1] = t1
+		ints = s[nd:].view('<i4')
+		ints[:ni] = [target,10,1,2,0,0]
+		srec[3+i*ns:3+(i+1)*ns] = s
+
+	f = open(str(path),'wb')
+	f.write(bytes(rec))
+	f.write(srec.tobytes())
+	f.write(bytes(1024))
+	f.close()
+	return str(path)
+
+
+def test_Overlap(tmp_path):
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT','DELTET/K'])
+	b = TextKernel(tmp_path/'b.tls',['DELTET/DELTA_AT'])
+	c = TextKernel(tmp_path/'c.tpc',['BODY199_RADII'])
+	assert KernelsOverlap(a,b)
+	assert not KernelsOverlap(a,c)
+
+	s1 = SPKKernel(tmp_path/'s1.bsp',[(199,0.0,100.0),(299,0.0,100.0)])
+	s2 = SPKKernel(tmp_path/'s2.bsp',[(199,50.0,150.0)])
+	s3 = SPKKernel(tmp_path/'s3.bsp',[(199,200.0,300.0),(399,0.0,100.0)])
+	assert KernelsOverlap(s1,s2)
+	assert not KernelsOverlap(s1,s3)
+	assert not KernelsOverlap(s2,s3)
+	assert not KernelsOverlap(s1,a)
+
+
+def test_RaiseOverlapping(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+	b = TextKernel(tmp_path/'b.tls',['DELTET/DELTA_AT'])
+
+	#b overrides a, so a must be furnished again to take priority
+	with m.Use(a):
+		pass
+	with m.Use(b):
+		pass
+	del sp.calls[:]
+	with m.Use(a):
+		assert sp.order[-1] == a
+	assert sp.calls == [('unload',a),('furnsh',a)]
+
+	#a is already on top this time
+	del sp.calls[:]
+	with m.Use(a):
+		pass
+	assert sp.calls == []
+
+
+def test_NoRaiseDisjoint(fake,tmp_path):
+	sp,m = fake
+	s1 = SPKKernel(tmp_path/'s1.bsp',[(199,0.0,100.0)])
+	s2 = SPKKernel(tmp_path/'s2.bsp',[(299,0.0,100.0)])
+	s3 = SPKKernel(tmp_path/'s3.bsp',[(199,200.0,300.0)])
+
+	m.Furnsh(s1,s2,s3)
+	m.Unload(s1,s2,s3)
+	del sp.calls[:]
+	for i in range(0,10):
+		with m.Use(s1):
+			pass
+		with m.Use(s2):
+			pass
+	assert sp.calls == []
+
+
+def test_NoRaisePinned(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+	b = TextKernel(tmp_path/'b.tls',['DELTET/DELTA_AT'])
+
+	m.Pin(a)
+	m.Pin(b)
+	del sp.calls[:]
+	with m.Use(a):
+		pass
+	assert sp.calls == []
+	assert sp.order == [a,b]
+
+
+def test_SessionNoLoading(fake,tmp_path):
+	sp,m = fake
+	lsk = TextKernel(tmp_path/'naif.tls',['DELTET/DELTA_AT'])
+	pck = TextKernel(tmp_path/'pck.tpc',['BODY199_RADII','BODY299_RADII'])
+	hci = TextKernel(tmp_path/'hci.tf',['FRAME_HCI'])
+	spk = SPKKernel(tmp_path/'de.bsp',[(199,0.0,100.0),(299,0.0,100.0)])
+	sc = SPKKernel(tmp_path/'sc.bsp',[(-236,0.0,100.0)])
+	ck = TextKernel(tmp_path/'sc.tf',['FRAME_MSM'])
+
+	with Session(lsk,spk,pck,hci,sc,ck):
+		del sp.calls[:]
+		for i in range(0,100):
+			with KM.Use(lsk,spk,pck,hci):
+				pass
+			with KM.Use(lsk,spk,sc,ck):
+				pass
+			KM.Furnsh(spk,pck)
+			KM.Unload(spk,pck)
+		assert sp.calls == []
+
+
+def test_RefCounts(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+
+	#furnished once however many times it is requested
+	m.Furnsh(a)
+	m.Furnsh(a,a)
+	assert sp.calls == [('furnsh',a)]
+	assert m._refs[a] == 2
+
+	m.Unload(a)
+	assert m._refs[a] == 1
+	assert not a in m._unused
+	m.Unload(a)
+	assert m._refs[a] == 0
+	assert a in m._unused
+
+	#still loaded until it is evicted
+	assert m.IsLoaded(a)
+	assert sp.calls == [('furnsh',a)]
+	m.Evict()
+	assert not m.IsLoaded(a)
+	assert sp.calls == [('furnsh',a),('unload',a)]
+
+	#unloading something which isn't loaded does nothing
+	m.Unload(a)
+	assert sp.calls == [('furnsh',a),('unload',a)]
+
+
+def test_Pins(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+
+	m.Pin(a)
+	with m.Use(a):
+		pass
+	m.Evict()
+	assert m.IsLoaded(a)
+
+	m.Unpin(a)
+	assert a in m._unused
+	m.Evict()
+	assert not m.IsLoaded(a)
+	assert sp.calls == [('furnsh',a),('unload',a)]
+
+
+def test_EvictLRU(fake,tmp_path):
+	sp,m = fake
+	m.SetBudget(MaxUnused=2)
+	k = [TextKernel(tmp_path/'k{:d}.tpc'.format(i),['BODY{:d}_RADII'.format(i)]) for i in range(0,4)]
+
+	for kk in k[:3]:
+		with m.Use(kk):
+			pass
+	#the least recently used kernel goes first
+	assert m.Loaded() == k[1:3]
+
+	#using a kernel again moves it to the end of the list
+	with m.Use(k[1]):
+		pass
+	with m.Use(k[3]):
+		pass
+	assert set(m.Loaded()) == set([k[1],k[3]])
+
+	#kernels in use are never evicted
+	m.Furnsh(k[0])
+	m.SetBudget(MaxUnused=0)
+	assert m.Loaded() == [k[0]]
+	m.Unload(k[0])
+	assert m.Loaded() == []
+
+
+def test_EvictBytes(fake,tmp_path):
+	sp,m = fake
+	k = [TextKernel(tmp_path/'k{:d}.tpc'.format(i),['BODY{:d}_RADII'.format(i)]) for i in range(0,3)]
+	size = os.path.getsize(k[0])
+
+	#room for two unused kernels
+	m.SetBudget(MaxBytes=2*size)
+	for kk in k:
+		with m.Use(kk):
+			pass
+	assert m.Loaded() == k[1:]
+
+	#pinned kernels count towards the total but aren't evicted
+	m.Pin(k[0])
+	m.SetBudget(MaxBytes=0)
+	assert m.Loaded() == [k[0]]
+
+
+def test_UseException(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+
+	with pytest.raises(RuntimeError):
+		with m.Use(a):
+			raise RuntimeError('SPICE error')
+	assert m._refs[a] == 0
+	assert a in m._unused
+
+
+def test_Clear(fake,tmp_path):
+	sp,m = fake
+	a = TextKernel(tmp_path/'a.tls',['DELTET/DELTA_AT'])
+	b = TextKernel(tmp_path/'b.tpc',['BODY199_RADII'])
+
+	m.Pin(a)
+	m.Furnsh(b)
+	m.Clear()
+	assert m.Loaded() == []
+	assert sp.order == []
@@ -0,0 +1,83 @@
+'''
+Test that the subpackages are only imported when they are first used.
+Each import is checked in a fresh interpreter, so that the modules
+imported by the other tests don't interfere.
+
+'''
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+
+def Run(code,path=None,unset=False):
+	'''
+	Run some code in a new interpreter, returning what it prints.
+
+	'''
+	env = dict(os.environ)
+	if unset:
+		env.pop('SPICE_KERNEL_PATH',None)
+		env.pop('SPICE_OUTPUT_PATH',None)
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	env['PYTHONPATH'] = os.pathsep.join([p for p in [path,root,env.get('PYTHONPATH')] if p])
+	out = subprocess.run([sys.executable,'-c',code],env=env,capture_output=True,text=True)
+	assert out.returncode == 0,out.stderr
+	return json.loads(out.stdout)
+
+
+def test_LazyImports(tmp_path):
+	pkg = tmp_path/'lazypkg'
+	pkg.mkdir()
+	(pkg/'__init__.py').write_text("from PlanetSpice.Tools.Lazy import LazyImports\nA = 1\nLazyImports(__name__,{'sub' : ('.sub',None),'func' : ('.func','func')})\n")
+	(pkg/'sub.py').write_text('X = 2\n')
+	(pkg/'func.py').write_text('def func():\n\treturn 3\n')
+
+	code = '''import sys,json
+import lazypkg
+out = [sorted(m for m in sys.modules if m.startswith('lazypkg')),lazypkg.__all__]
+out.append(lazypkg.sub.X)
+out.append(sorted(m for m in sys.modules if m.startswith('lazypkg')))
+#importing the module of the same name doesn't hide the function
+out.append(lazypkg.func())
+import lazypkg.func
+out.append(lazypkg.func())
+out.append('func' in dir(lazypkg))
+try:
+	lazypkg.missing
+except AttributeError:
+	out.append('AttributeError')
+print(json.dumps(out))
+'''
+	out = Run(code,str(tmp_path))
+	assert out[0] == ['lazypkg']
+	assert out[1] == ['LazyImports','A','sub','func']
+	assert out[2] == 2
+	assert out[3] == ['lazypkg','lazypkg.sub']
+	assert out[4:] == [3,3,True,'AttributeError']
+
+
+def test_PlanetSpice():
+	#importing the package needs neither spiceypy nor the environment
+	#variables
+	code = '''import sys,json
+import PlanetSpice
+mods = lambda: sorted(m for m in sys.modules if m.startswith('PlanetSpice') or m in ['spiceypy','scipy'])
+print(json.dumps(mods()))
+'''
+	assert Run(code,unset=True) == ['PlanetSpice','PlanetSpice.Tools','PlanetSpice.Tools.Lazy']
+
+
+def test_Subpackages():
+	pytest.importorskip('spiceypy')
+	code = '''import sys,json
+import PlanetSpice as ps
+out = [callable(ps.utc2et),'PlanetSpice.Venus' in sys.modules]
+ps.Mercury
+out += ['PlanetSpice.Mercury' in sys.modules,'PlanetSpice.Mercury.Messenger' in sys.modules,'PlanetSpice.Venus' in sys.modules]
+ps.Mercury.Messenger
+out.append('PlanetSpice.Mercury.Messenger' in sys.modules)
+print(json.dumps(out))
+'''
+	assert Run(code) == [True,False,True,False,False,True]
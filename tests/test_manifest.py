@@ -0,0 +1,122 @@
+'''
+Test the manifest of saved dates, including resuming SavePos after an
+interrupted run (the positions are faked, so no kernels are needed).
+
+'''
+import os
+import numpy as np
+import pytest
+
+from PlanetSpice.Tools.Manifest import Manifest,KernelKey,Pending,Complete
+from PlanetSpice.Tools.ListDates import ListDates
+
+
+def test_TodoMark(tmp_path):
+	fname = str(tmp_path/'m'/'manifest.npz')
+	Dates = ListDates(20111230,20120105)
+	m = Manifest(fname)
+	assert (m.Todo(Dates,'a') == Dates).all()
+
+	m.Mark(Dates,'a',Pending)
+	m.Mark(Dates[[4,1]],'a',Complete)
+	assert (m.Todo(Dates,'a') == Dates[[0,2,3,5,6]]).all()
+
+	#reloaded from the file
+	m = Manifest(fname)
+	assert (m.Date == Dates).all()
+	assert (m.Todo(Dates,'a') == Dates[[0,2,3,5,6]]).all()
+
+	#everything is out of date with a different kernel key
+	assert (m.Todo(Dates,'b') == Dates).all()
+	m.Mark(Dates[:3],'b')
+	assert (m.Todo(Dates,'b') == Dates[3:]).all()
+	assert (m.Todo(Dates,'a') == Dates[[0,1,2,3,5,6]]).all()
+	assert m.Keys == ['a','b']
+
+	#no temporary files are left behind
+	assert os.listdir(os.path.dirname(fname)) == ['manifest.npz']
+
+
+def test_KernelKey(tmp_path):
+	a = str(tmp_path/'a.tls')
+	b = str(tmp_path/'b.tls')
+	for k in [a,b]:
+		f = open(k,'w')
+		f.write(k)
+		f.close()
+	key = KernelKey([a,b])
+	assert KernelKey([a,b]) == key
+	assert KernelKey([b,a]) != key
+
+	f = open(b,'a')
+	f.write('changed')
+	f.close()
+	os.utime(b,(0,0))
+	assert KernelKey([a,b]) != key
+
+
+class Interrupt(Exception):
+	pass
+
+
+@pytest.fixture
+def body(monkeypatch,tmp_path,fake):
+	pytest.importorskip('spiceypy')
+	from PlanetSpice import Body as B
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+	k = str(tmp_path/'k.tls')
+	f = open(k,'w')
+	f.write('\\begindata\nA = 1\n')
+	f.close()
+	body = B.Body('Test',Kernels=[k])
+
+	#fake positions, which fail for the dates in body.fail
+	body.fail = []
+	body.saved = []
+	def PosRecarray(Date,ut):
+		if np.isin(Date,body.fail).any():
+			raise Interrupt()
+		body.saved.extend(np.unique(Date))
+		data = np.recarray(Date.size,dtype=B.dtype)
+		data.fill(0)
+		data.Date = Date
+		data.ut = ut
+		data.utc = np.arange(Date.size)
+		return data
+	body.PosRecarray = PosRecarray
+	return body
+
+
+def test_Interrupted(body):
+	Dates = ListDates(20111201,20120131)
+	body.fail = [20120115]
+	with pytest.raises(Interrupt):
+		body.SavePos(20111201,20120131,ChunkDays=10)
+
+	#the chunks before the failure are complete, the rest pending
+	archive = body._Archive()
+	m = Manifest(archive.Path + '/manifest.npz')
+	key = KernelKey(body.Kernels)
+	assert (m.Date == Dates).all()
+	done = Dates < 20120110
+	assert (m.Status == np.where(done,Complete,Pending)).all()
+	assert (m.Todo(Dates,key) == Dates[~done]).all()
+
+	#only the remaining dates are saved when it is resumed
+	body.fail = []
+	body.saved = []
+	body.SavePos(20111201,20120131,ChunkDays=10)
+	assert (np.array(body.saved) == Dates[~done]).all()
+	assert (Manifest(archive.Path + '/manifest.npz').Status == Complete).all()
+	assert (np.unique(body.ReadPos(20111201,20120131).Date) == Dates).all()
+
+	#nothing left to do, until the kernels change
+	body.saved = []
+	body.SavePos(20111201,20120131,ChunkDays=10)
+	assert body.saved == []
+	f = open(body.Kernels[0],'a')
+	f.write('B = 2\n')
+	f.close()
+	os.utime(body.Kernels[0],(0,0))
+	body.SavePos(20111225,20120105,ChunkDays=10)
+	assert (np.array(body.saved) == ListDates(20111225,20120105)).all()
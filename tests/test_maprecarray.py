@@ -0,0 +1,136 @@
+'''
+Test the memory-mapped recarray files against RecarrayTools, which
+wrote (and reads) them originally.
+
+'''
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+RT = pytest.importorskip('RecarrayTools')
+
+from PlanetSpice import Body as B
+from PlanetSpice.Tools.MapRecarray import MapRecarray,Decimate
+from PlanetSpice.Tools.ListDates import ListDates
+from PlanetSpice.Tools.ContUT import ContUT
+
+
+def Positions(Date0,Date1):
+	'''
+	Hourly records between two dates.
+
+	'''
+	Dates = ListDates(Date0,Date1)
+	data = np.recarray(Dates.size*24,dtype=B.dtype)
+	data.fill(0)
+	data.Date = np.repeat(Dates,24)
+	data.ut = np.tile(np.arange(24,dtype='float32'),Dates.size)
+	data.utc = ContUT(data.Date,data.ut)
+	data.xHCI = np.arange(data.size)*0.5
+	data.LatHCI = np.arange(data.size) % 90
+	return data
+
+
+@pytest.fixture
+def fname(tmp_path):
+	fname = str(tmp_path/'Pos.bin')
+	RT.SaveRecarray(Positions(20111201,20120131),fname)
+	return fname
+
+
+def test_Read(fname):
+	rt = RT.ReadRecarray(fname,B.dtype)
+	m = MapRecarray(fname,B.dtype)
+	assert len(m) == rt.size
+	assert (m.Slice(0,m.size) == rt).all()
+	for name in rt.dtype.names:
+		assert (getattr(m,name) == rt[name]).all()
+
+
+def test_FindSlice(fname):
+	rt = RT.ReadRecarray(fname,B.dtype)
+	m = MapRecarray(fname,B.dtype)
+
+	for t0,t1 in [(rt.utc[0] - 100,rt.utc[10]),(rt.utc[100] + 0.5,rt.utc[500]),(rt.utc[-1],np.inf),(0.0,1.0)]:
+		i0,i1 = m.Find(t0,t1)
+		use = np.where((rt.utc >= t0) & (rt.utc < t1))[0]
+		assert i1 - i0 == use.size
+		if use.size > 0:
+			assert i0 == use[0]
+		assert (m.Range(t0,t1) == rt[use]).all()
+
+	#a subset of the fields, or read-only views
+	out = m.Slice(30,60,['utc','LatHCI'])
+	assert out.dtype.names == ('utc','LatHCI')
+	assert (out.LatHCI == rt.LatHCI[30:60]).all()
+	cols = m.Slice(30,60,Copy=False)
+	assert (cols['xHCI'] == rt.xHCI[30:60]).all()
+	with pytest.raises(ValueError):
+		cols['xHCI'][0] = 1.0
+
+
+def test_BadFile(tmp_path):
+	fname = str(tmp_path/'bad.bin')
+	RT.SaveRecarray(Positions(20110101,20110101),fname)
+	with pytest.raises(ValueError):
+		MapRecarray(fname,B.dtype[:-1])
+
+	#an empty file
+	fname = str(tmp_path/'empty.bin')
+	RT.SaveRecarray(np.recarray(0,dtype=B.dtype),fname)
+	m = MapRecarray(fname,B.dtype)
+	assert m.Slice(0,0).size == 0
+	assert m.Find(0.0,1e9) == (0,0)
+
+
+def test_ReadCombinedPos(monkeypatch,tmp_path):
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+	body = B.Body('Test')
+	data = Positions(20111201,20120131)
+	path = str(tmp_path/'Test')
+	os.makedirs(path)
+	RT.SaveRecarray(data,body._CombinedName(False))
+
+	out = body.ReadCombinedPos(False,20111231,20120101)
+	assert (out == data[(data.Date >= 20111231) & (data.Date <= 20120101)]).all()
+	assert (body.ReadCombinedPos(False) == data).all()
+	cols = body.ReadCombinedPos(False,20120131,None,Fields=['Date','utc'],Copy=False)
+	assert (cols['Date'] == 20120131).all()
+	assert cols['utc'].size == 24
+
+
+@pytest.mark.parametrize('Chunk',[7,1048576])
+def test_DecimateRows(fname,tmp_path,Chunk):
+	rt = RT.ReadRecarray(fname,B.dtype)
+	out = str(tmp_path/'out.bin')
+	Decimate(MapRecarray(fname,B.dtype),out,5,None,3,Chunk=Chunk)
+	assert (RT.ReadRecarray(out,B.dtype) == rt[3::5]).all()
+
+
+@pytest.mark.parametrize('Chunk',[7,1048576])
+def test_DecimateAligned(fname,tmp_path,Chunk):
+	rt = RT.ReadRecarray(fname,B.dtype)
+	out = str(tmp_path/'out.bin')
+	Decimate(MapRecarray(fname,B.dtype),out,24.0,'utc',6.0,Chunk=Chunk)
+	small = RT.ReadRecarray(out,B.dtype)
+	assert (small == rt[rt.ut == 6.0]).all()
+	assert (small.Date == ListDates(20111201,20120131)).all()
+
+	#nothing aligned
+	Decimate(MapRecarray(fname,B.dtype),out,24.0,'utc',6.5,Chunk=Chunk)
+	assert RT.ReadRecarray(out,B.dtype).size == 0
+
+
+def test_CombinePosSmall(monkeypatch,tmp_path):
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+	body = B.Body('Test')
+	data = Positions(20111201,20120131)
+	os.makedirs(str(tmp_path/'Test'))
+	RT.SaveRecarray(data,body._CombinedName(False))
+
+	body.CombinePosSmall([24.0,72.0])
+	assert (body.ReadCombinedPos(True) == data[data.ut == 0.0]).all()
+	small = body.ReadCombinedPos(72.0)
+	assert (small == data[(data.ut == 0.0) & (data.utc % 72.0 == 0.0)]).all()
+	assert (np.diff(small.utc) == 72.0).all()
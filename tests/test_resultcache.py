@@ -0,0 +1,128 @@
+'''
+Test saving and loading results in the on-disk result cache, which is
+kept in a temporary output directory.
+
+'''
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice import ResultCache as RC
+
+
+@pytest.fixture
+def cache(monkeypatch,tmp_path):
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+	monkeypatch.setattr(RC,'_total',None)
+	monkeypatch.setattr(RC,'MaxBytes',2*1024**3)
+	return str(tmp_path) + '/Cache/Results/'
+
+
+def Kernel(path,text):
+	f = open(str(path),'w')
+	f.write(text)
+	f.close()
+	return str(path)
+
+
+def test_SaveLoad(cache):
+	arr = np.random.rand(3,100)
+	RC.Save('abc',arr)
+	out = RC.Load('abc')
+	assert (out == arr).all()
+	assert not out.flags.writeable
+	assert RC.Load('def') is None
+
+	#no temporary files left behind
+	assert os.listdir(cache) == ['abc.npy']
+
+
+def test_CacheKey(cache,tmp_path):
+	k = Kernel(tmp_path/'a.tls','\\begindata\nA = 1\n')
+	et = np.arange(10.0)
+	key = RC.CacheKey('F','MERCURY','HCI',[k],et)
+	assert RC.CacheKey('F','MERCURY','HCI',[k],et.copy()) == key
+
+	#anything which changes the result changes the key
+	assert RC.CacheKey('G','MERCURY','HCI',[k],et) != key
+	assert RC.CacheKey('F','VENUS','HCI',[k],et) != key
+	assert RC.CacheKey('F','MERCURY','J2000',[k],et) != key
+	assert RC.CacheKey('F','MERCURY','HCI',[k],et + 1e-6) != key
+	assert RC.CacheKey('F','MERCURY','HCI',[k],et,{'Native':True}) != key
+
+	#including the contents of the kernels
+	Kernel(tmp_path/'a.tls','\\begindata\nA = 2\n')
+	os.utime(k,ns=(0,0))
+	assert RC.CacheKey('F','MERCURY','HCI',[k],et) != key
+
+
+def test_CachedPos(cache,tmp_path):
+	k = Kernel(tmp_path/'a.tls','\\begindata\nA = 1\n')
+	calls = []
+	def Func(Date,ut,Format=None,Scale=1.0):
+		calls.append(Date)
+		et = np.array(Date,dtype='float64')
+		return (et*Scale,2*et,3*et)
+
+	et = np.arange(5.0)
+	x,y,z = RC.CachedPos(Func,et,None,'MERCURY','HCI',[k],Format='et')
+	x1,y1,z1 = RC.CachedPos(Func,et,None,'MERCURY','HCI',[k],Format='et')
+	assert len(calls) == 1
+	assert (x1 == et).all() and (y1 == 2*et).all() and (z1 == 3*et).all()
+
+	#other options and kernels are stored separately
+	x,y,z = RC.CachedPos(Func,et,None,'MERCURY','HCI',[k],Format='et',Scale=2.0)
+	assert len(calls) == 2
+	assert (x == 2*et).all()
+	Kernel(tmp_path/'a.tls','\\begindata\nA = 3\n')
+	os.utime(k,ns=(0,0))
+	RC.CachedPos(Func,et,None,'MERCURY','HCI',[k],Format='et')
+	assert len(calls) == 3
+
+
+def test_Evict(cache):
+	arr = np.zeros(1000)
+	RC.Save('a',arr)
+	size = os.path.getsize(cache + 'a.npy')
+	RC.Save('b',arr)
+	RC.Save('c',arr)
+
+	#make them least recently used in the order b, a, c
+	for i,k in enumerate(['b','a','c']):
+		os.utime(cache + k + '.npy',ns=(10**18 + i*10**9,10**18 + i*10**9))
+
+	RC.SetBudget(2*size)
+	assert sorted(os.listdir(cache)) == ['a.npy','c.npy']
+
+	#loading marks a result as recently used
+	RC.Load('a')
+	RC.Save('d',arr)
+	assert sorted(os.listdir(cache)) == ['a.npy','d.npy']
+
+	RC.Clear()
+	assert os.listdir(cache) == []
+
+
+def test_RunningTotal(cache,monkeypatch):
+	#the directory is only scanned when the cache might be over budget
+	scans = []
+	listdir = os.listdir
+	def ListDir(path):
+		scans.append(path)
+		return listdir(path)
+	monkeypatch.setattr(RC.os,'listdir',ListDir)
+
+	arr = np.zeros(1000)
+	for i in range(0,10):
+		RC.Save('k{:d}'.format(i),arr)
+	assert len(scans) == 1
+
+	size = os.path.getsize(cache + 'k0.npy')
+	monkeypatch.setattr(RC,'MaxBytes',11*size)
+	RC.Save('k10',arr)
+	assert len(scans) == 1
+	RC.Save('k11',arr)
+	assert len(scans) == 2
+	assert len(listdir(cache)) == 11
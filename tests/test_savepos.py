@@ -0,0 +1,86 @@
+'''
+Test that SavePos writes identical files whatever the number of worker
+processes. The positions of a fake body (a subclass defined here, so
+that the workers can unpickle it) need no kernels; the real planets are
+also compared when the kernels are in $SPICE_KERNEL_PATH.
+
+'''
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice import Body as B
+from PlanetSpice.Tools.ContUT import ContUT
+from PlanetSpice.Tools.ListDates import ListDates
+
+
+class FakeBody(B.Body):
+	'''
+	Positions which depend only on the date and time.
+
+	'''
+	def PosRecarray(self,Date,ut):
+		Date,ut = np.broadcast_arrays(np.array(Date).flatten(),np.array(ut).flatten())
+		data = np.recarray(Date.size,dtype=B.dtype)
+		data.fill(0)
+		data.Date = Date
+		data.ut = ut
+		data.utc = ContUT(Date,ut)
+		data.xHCI = np.sin(data.utc)
+		data.LonIAU_SUN = data.utc % 360.0
+		return data
+
+
+def Files(path):
+	'''
+	Contents of every file in the archive except the manifest.
+
+	'''
+	out = {}
+	for root,dirs,files in os.walk(path):
+		for f in files:
+			if f != 'manifest.npz':
+				fname = os.path.join(root,f)
+				out[os.path.relpath(fname,path)] = open(fname,'rb').read()
+	return out
+
+
+def Compare(monkeypatch,tmp_path,body,Date0,Date1):
+	'''
+	Save the positions with one and with three workers.
+
+	'''
+	out = []
+	for w in [1,3]:
+		monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path/str(w)) + '/')
+		body.SavePos(Date0,Date1,Workers=w,ChunkDays=7)
+		out.append(Files(body._Archive().Path))
+	assert len(out[0]) > 0
+	assert out[0].keys() == out[1].keys()
+	for k in out[0]:
+		assert out[0][k] == out[1][k],k
+	return out
+
+
+def test_Workers(monkeypatch,tmp_path):
+	k = str(tmp_path/'k.tls')
+	f = open(k,'w')
+	f.write('\\begindata\nFAKE_BODY = 1\n\\begintext\n')
+	f.close()
+	body = FakeBody('Fake',Kernels=[k])
+	out = Compare(monkeypatch,tmp_path,body,20111215,20120120)
+	assert set([os.path.dirname(f) for f in out[0]]) == set(['2011','2012'])
+
+	#and the positions read back are complete
+	data = body.ReadPos(20111215,20120120)
+	assert data.size == 37*24
+	assert (data == body.PosRecarray(np.repeat(ListDates(20111215,20120120),24),np.tile(np.arange(24.0),37))).all()
+
+
+def test_WorkersSpice(monkeypatch,tmp_path):
+	for k in [B.lsk_path,B.spk_kernel,B.pck_kernel,B.hci_kernel]:
+		if not os.path.isfile(k):
+			pytest.skip('Kernel not found: '+k)
+	Compare(monkeypatch,tmp_path,B.Body('Mercury'),20111225,20120105)
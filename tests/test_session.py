@@ -0,0 +1,77 @@
+'''
+Test that sessions pin and unpin their kernel sets, with SPICE replaced
+by the fake fixture in conftest.py.
+
+'''
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice import KernelManager as KM
+from PlanetSpice.Session import Session
+
+
+def Kernels(tmp_path,names):
+	out = []
+	for n in names:
+		f = open(str(tmp_path/n),'w')
+		f.write('\\begindata\n{:s}_VAR = 1\n\\begintext\n'.format(n.replace('.','_').upper()))
+		f.close()
+		out.append(str(tmp_path/n))
+	return out
+
+
+@pytest.fixture
+def sets(monkeypatch,tmp_path):
+	a,b,c,d = Kernels(tmp_path,['a.tls','b.tpc','c.tf','d.tf'])
+	monkeypatch.setitem(KM.KernelSets,'TestA',[a,b])
+	monkeypatch.setitem(KM.KernelSets,'TestB',lambda Date: [b,c] if Date is None else [b,d])
+	return a,b,c,d
+
+
+def test_PinUnpin(fake,sets):
+	sp,m = fake
+	a,b,c,d = sets
+
+	with Session('TestA','TestB') as s:
+		assert s.Kernels == [a,b,c]
+		assert sp.order == [a,b,c]
+		assert all([m._pins[k] == 1 for k in s.Kernels])
+		m.Evict()
+		assert m.Loaded() == [a,b,c]
+
+	#unpinned, but left loaded until they are evicted
+	assert all([m._pins[k] == 0 for k in [a,b,c]])
+	assert list(m._unused.keys()) == [a,b,c]
+	m.Evict()
+	assert sp.order == []
+
+
+def test_StartClose(fake,sets):
+	sp,m = fake
+	a,b,c,d = sets
+
+	#the session starts when it is created, repeated calls to Start and
+	#Close have no effect
+	s = Session('TestB',a,Date=20110101)
+	assert s.Kernels == [b,d,a]
+	s.Start()
+	assert all([m._pins[k] == 1 for k in s.Kernels])
+	s.Close()
+	s.Close()
+	assert all([m._pins[k] == 0 for k in s.Kernels])
+
+	#it can be restarted
+	with s:
+		assert all([m._pins[k] == 1 for k in s.Kernels])
+	assert all([m._pins[k] == 0 for k in s.Kernels])
+
+
+def test_Exception(fake,sets):
+	sp,m = fake
+
+	with pytest.raises(RuntimeError):
+		with Session('TestA') as s:
+			raise RuntimeError('SPICE error')
+	assert not s.Open
+	assert all([m._pins[k] == 0 for k in s.Kernels])
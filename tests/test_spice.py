@@ -0,0 +1,89 @@
+'''
+Compare the NumPy implementations of the time conversions, the IAU_SUN
+rotation and the SPK reader against SPICE itself.
+
+These need spiceypy and the kernels in $SPICE_KERNEL_PATH (the LSK,
+de432s.bsp and pck00010.tpc), they are skipped if either is missing.
+
+'''
+import os
+import numpy as np
+import pytest
+
+sp = pytest.importorskip('spiceypy')
+
+if os.getenv('SPICE_KERNEL_PATH') is None or os.getenv('SPICE_OUTPUT_PATH') is None:
+	pytest.skip('SPICE_KERNEL_PATH and SPICE_OUTPUT_PATH must be set',allow_module_level=True)
+
+from PlanetSpice import Globals
+
+lsk_path = Globals.SpicePath + '/lsk/naif0010.tls'
+spk_kernel = Globals.SpicePath + '/bodies/de432s.bsp'
+pck_kernel = Globals.SpicePath + '/bodies/pck00010.tpc'
+
+for k in [lsk_path,spk_kernel,pck_kernel]:
+	if not os.path.isfile(k):
+		pytest.skip('Kernel not found: '+k,allow_module_level=True)
+
+from PlanetSpice.utc2et import utc2et
+from PlanetSpice.et2dateut import et2dateut
+from PlanetSpice import TimeScales
+from PlanetSpice.Sun.IAU_SUN import IAU_SUNMatrices
+from PlanetSpice.SPK import SPKPos
+
+#epochs either side of (and during) the leap second at the end of
+#2012-06-30, plus a few others
+Epochs = [	('1972-01-01T00:00:00',19720101,0.0),
+			('2000-01-01T12:00:00',20000101,12.0),
+			('2011-03-18T01:00:00.250',20110318,1.0 + 0.25/3600),
+			('2012-06-30T23:59:59',20120630,24.0 - 1.0/3600),
+			('2012-06-30T23:59:60.5',20120630,24.0 + 0.5/3600),
+			('2012-07-01T00:00:00',20120701,0.0),
+			('2012-07-01T00:00:01',20120701,1.0/3600)]
+
+#epochs covered by de432s.bsp
+SPKEpochs = ['2008-01-14T19:04:39','2011-03-18T01:00:00','2012-06-30T23:59:60.5','2015-04-30T19:26:00']
+
+
+@pytest.fixture(scope='module',autouse=True)
+def kernels():
+	sp.furnsh([lsk_path,spk_kernel,pck_kernel])
+	yield
+	sp.unload([lsk_path,spk_kernel,pck_kernel])
+
+
+def test_utc2et():
+	Date = np.array([e[1] for e in Epochs])
+	ut = np.array([e[2] for e in Epochs])
+	et = np.array([sp.str2et(e[0]) for e in Epochs])
+
+	assert np.abs(utc2et(Date,ut) - et).max() < 1e-6
+	assert np.abs(TimeScales.UTCtoET(Date,ut) - et).max() < 1e-6
+
+
+def test_et2dateut():
+	et = np.array([sp.str2et(e[0]) for e in Epochs])
+	Date,ut,utc = et2dateut(et)
+
+	for i in range(0,et.size):
+		#split the SPICE string into the date and seconds of the day
+		s = sp.et2utc(et[i],'ISOC',6)
+		d = int(s[:10].replace('-',''))
+		sec = int(s[11:13])*3600 + int(s[14:16])*60 + float(s[17:])
+		assert Date[i] == d
+		assert np.abs(ut[i]*3600.0 - sec) < 1e-5
+
+
+def test_IAU_SUNMatrices():
+	et = np.array([sp.str2et(s) for s in SPKEpochs])
+	rot = IAU_SUNMatrices(et,pck_kernel)
+	for i in range(0,et.size):
+		assert np.abs(rot[i] - sp.pxform('J2000','IAU_SUN',et[i])).max() < 1e-12
+
+
+def test_SPKPos():
+	et = np.array([sp.str2et(s) for s in SPKEpochs])
+	for target in ['MERCURY','VENUS','EARTH','MARS BARYCENTER']:
+		pos = SPKPos(target,et,'SUN',spk_kernel)
+		spos,lt = sp.spkpos(target,et,'J2000','NONE','SUN')
+		assert np.abs(pos - np.array(spos)).max() < 1e-6
@@ -0,0 +1,70 @@
+'''
+Test the Chebyshev trajectory surrogates. The fitting is tested on
+analytic functions, the positions against spkpos (which needs the
+kernels in $SPICE_KERNEL_PATH, otherwise that test is skipped).
+
+'''
+import os
+import numpy as np
+import pytest
+
+sp = pytest.importorskip('spiceypy')
+
+from PlanetSpice import Surrogate
+from PlanetSpice.Tools.Chebyshev import Clenshaw
+
+
+def Eval(t,t0,t1,coef):
+	i = np.clip(np.searchsorted(t0,t,side='right') - 1,0,t0.size-1)
+	mid = 0.5*(t0[i] + t1[i])
+	rad = 0.5*(t1[i] - t0[i])
+	return Clenshaw((t - mid)/rad,coef,i)
+
+
+def Func(t):
+	return np.array([np.sin(t),np.cos(2*t),np.abs(t - 0.3)]).T
+
+
+def test_FitSplit():
+	#the kink at t = 0.3 needs the interval containing it to be split
+	ta = np.linspace(-1.0,1.0,5)
+	t0,t1,coef = Surrogate._Fit(Func,ta[:-1],ta[1:],15,1e-4,20)
+	assert np.isfinite(coef).all()
+	assert t0.size > 4
+
+	t = np.linspace(-1.0,1.0,1001)
+	err = np.sqrt(np.sum((Eval(t,t0,t1,coef) - Func(t))**2,axis=1))
+	assert err.max() <= 1e-4
+
+
+def test_FitNotMet():
+	#intervals which can't meet Tol are marked with NaN coefficients
+	ta = np.linspace(-1.0,1.0,5)
+	t0,t1,coef = Surrogate._Fit(Func,ta[:-1],ta[1:],15,1e-4,0)
+	bad = np.isnan(coef).any(axis=(1,2))
+	assert (bad == ((t0 < 0.3) & (t1 > 0.3))).all()
+
+
+def test_SurrogatePos(monkeypatch,tmp_path):
+	if os.getenv('SPICE_KERNEL_PATH') is None:
+		pytest.skip('SPICE_KERNEL_PATH must be set')
+	spk_kernel = os.getenv('SPICE_KERNEL_PATH') + '/bodies/de432s.bsp'
+	if not os.path.isfile(spk_kernel):
+		pytest.skip('Kernel not found: '+spk_kernel)
+	monkeypatch.setenv('SPICE_OUTPUT_PATH',str(tmp_path))
+
+	et = np.linspace(3.5e8,3.5e8 + 10*86400.0,997)
+	sp.furnsh(spk_kernel)
+	try:
+		spos,lt = sp.spkpos('MERCURY',et,'J2000','NONE','SUN')
+	finally:
+		sp.unload(spk_kernel)
+	spos = np.array(spos)
+
+	Tol = 1e-3
+	pos = Surrogate.SurrogatePos('MERCURY',et,'J2000','SUN',[spk_kernel],Tol=Tol)
+	assert np.sqrt(np.sum((pos - spos)**2,axis=1)).max() <= Tol
+
+	#a tolerance which can't be met falls back to spkpos
+	pos = Surrogate.SurrogatePos('MERCURY',et,'J2000','SUN',[spk_kernel],Tol=1e-12,MaxSplit=0)
+	assert np.abs(pos - spos).max() < 1e-6
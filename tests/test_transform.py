@@ -0,0 +1,70 @@
+'''
+Test the batched frame rotations, with pxform replaced by a slowly
+rotating frame so that no kernels are needed.
+
+'''
+import numpy as np
+import pytest
+
+pytest.importorskip('spiceypy')
+
+from PlanetSpice.Sun import Transform
+
+#rotation rate (rad/s) of the fake frame, about one turn in 26000 years
+W = 2*np.pi/(26000*365.25*86400.0)
+
+
+class FakePxform(object):
+	def __init__(self):
+		self.calls = 0
+
+	def pxform(self,FromFrame,ToFrame,et):
+		self.calls += 1
+		c = np.cos(W*et)
+		s = np.sin(W*et)
+		return np.array([[c,s,0.0],[-s,c,0.0],[0.0,0.0,1.0]])
+
+
+@pytest.fixture
+def sp(monkeypatch):
+	sp = FakePxform()
+	monkeypatch.setattr(Transform,'sp',sp)
+	return sp
+
+
+def Exact(et):
+	return np.array([FakePxform().pxform('A','B',t) for t in et])
+
+
+def test_Exact(sp):
+	#one call per unique epoch by default
+	et = np.repeat(np.linspace(0.0,3e8,500),3)
+	rot = Transform.RotationMatrices('A','B',et)
+	assert sp.calls == 500
+	assert (rot == Exact(et)).all()
+
+	rot = Transform.RotationMatrices('A','B',np.zeros(10) + 5.0)
+	assert rot.shape == (10,3,3)
+	assert sp.calls == 501
+
+
+def test_Step(sp):
+	et = np.linspace(0.0,3e8,5000)
+	rot = Transform.RotationMatrices('A','B',et,Step=864000.0)
+	assert sp.calls < 500
+	assert np.abs(rot - Exact(et)).max() < 1e-10
+
+	#epochs further apart than the step are calculated exactly
+	sp.calls = 0
+	et = np.array([0.0,1e7,2e7])
+	rot = Transform.RotationMatrices('A','B',et,Step=864000.0)
+	assert sp.calls == 3
+	assert (rot == Exact(et)).all()
+
+
+def test_TransformFrame(sp):
+	et = np.linspace(0.0,3e8,50)
+	x,y,z = Transform.TransformFrame('A','B',et,np.ones(50),np.zeros(50),np.ones(50))
+	assert np.allclose(x,np.cos(W*et),rtol=0,atol=1e-14)
+	assert np.allclose(y,-np.sin(W*et),rtol=0,atol=1e-14)
+	assert (z == 1.0).all()